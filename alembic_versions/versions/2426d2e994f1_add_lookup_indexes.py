@@ -0,0 +1,47 @@
+"""add lookup indexes
+
+Revision ID: 2426d2e994f1
+Revises: f1b5a7ea9a00
+Create Date: 2026-10-19 10:31:04.156239
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2426d2e994f1'
+down_revision: Union[str, None] = 'f1b5a7ea9a00'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns) of each index
+INDEXES = [
+    ('ix_games_user_id_created_at', 'games', ['user_id', 'created_at']),
+    ('ix_player_projections_game_id_team_id', 'player_projections', ['game_id', 'team_id']),
+    ('ix_player_stats_player_id', 'player_stats', ['player_id']),
+    ('ix_players_team_id', 'players', ['team_id']),
+    ('ix_reports_game_id_report_type', 'reports', ['game_id', 'report_type']),
+    ('ix_team_analysis_team_id_id', 'team_analysis', ['team_id', 'id']),
+    ('ix_team_stats_team_id_id', 'team_stats', ['team_id', 'id']),
+    ('ix_users_email', 'users', ['email']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction; building the
+    # indexes this way doesn't block writes to the tables
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,75 @@
+"""add processing task parent
+
+Revision ID: 34e43fcfe9ca
+Revises: 6401f4a17499
+Create Date: 2026-10-19 11:09:41.429489
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '34e43fcfe9ca'
+down_revision: Union[str, None] = '6401f4a17499'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Same as in 5860736cb1bd, plus the UUID of the batch task a task belongs to,
+# so a batch's event stream also hears about its children
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_processing_task_progress() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('processing_task_events', json_build_object(
+        'task_uuid', NEW.task_uuid,
+        'status', NEW.status,
+        'step', NEW.step,
+        'total_steps', NEW.total_steps,
+        'game_uuid', (SELECT uuid FROM games WHERE id = NEW.game_id),
+        'parent_uuid', (SELECT task_uuid FROM processing_tasks WHERE id = NEW.parent_id)
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+PREVIOUS_NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_processing_task_progress() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('processing_task_events', json_build_object(
+        'task_uuid', NEW.task_uuid,
+        'status', NEW.status,
+        'step', NEW.step,
+        'total_steps', NEW.total_steps,
+        'game_uuid', (SELECT uuid FROM games WHERE id = NEW.game_id)
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('processing_tasks', sa.Column('parent_id', sa.Integer(), nullable=True))
+    op.alter_column('processing_tasks', 'opponent_file_path',
+               existing_type=sa.VARCHAR(length=255),
+               nullable=True)
+    op.create_index(op.f('ix_processing_tasks_parent_id'), 'processing_tasks', ['parent_id'], unique=False)
+    op.create_foreign_key('processing_tasks_parent_id_fkey', 'processing_tasks', 'processing_tasks', ['parent_id'], ['id'])
+    op.execute(NOTIFY_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(PREVIOUS_NOTIFY_FUNCTION)
+    op.drop_constraint('processing_tasks_parent_id_fkey', 'processing_tasks', type_='foreignkey')
+    op.drop_index(op.f('ix_processing_tasks_parent_id'), table_name='processing_tasks')
+    op.execute("DELETE FROM processing_tasks WHERE opponent_file_path IS NULL")
+    op.alter_column('processing_tasks', 'opponent_file_path',
+               existing_type=sa.VARCHAR(length=255),
+               nullable=False)
+    op.drop_column('processing_tasks', 'parent_id')
@@ -0,0 +1,61 @@
+"""add processing task notify trigger
+
+Revision ID: 5860736cb1bd
+Revises: 95bcf0f126a8
+Create Date: 2026-10-19 10:58:29.982354
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5860736cb1bd'
+down_revision: Union[str, None] = '95bcf0f126a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Notifies processing_task_events whenever a task's progress changes. NOTIFY is
+# only delivered when the updating transaction commits, so listeners never see
+# a step the pipeline rolled back.
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_processing_task_progress() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('processing_task_events', json_build_object(
+        'task_uuid', NEW.task_uuid,
+        'status', NEW.status,
+        'step', NEW.step,
+        'total_steps', NEW.total_steps,
+        'game_uuid', (SELECT uuid FROM games WHERE id = NEW.game_id)
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+NOTIFY_TRIGGER = """
+CREATE TRIGGER processing_tasks_notify_progress
+AFTER UPDATE ON processing_tasks
+FOR EACH ROW
+WHEN (
+    OLD.status IS DISTINCT FROM NEW.status
+    OR OLD.step IS DISTINCT FROM NEW.step
+    OR OLD.game_id IS DISTINCT FROM NEW.game_id
+)
+EXECUTE FUNCTION notify_processing_task_progress()
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(NOTIFY_FUNCTION)
+    op.execute("DROP TRIGGER IF EXISTS processing_tasks_notify_progress ON processing_tasks")
+    op.execute(NOTIFY_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS processing_tasks_notify_progress ON processing_tasks")
+    op.execute("DROP FUNCTION IF EXISTS notify_processing_task_progress()")
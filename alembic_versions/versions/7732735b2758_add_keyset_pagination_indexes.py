@@ -0,0 +1,39 @@
+"""add keyset pagination indexes
+
+Revision ID: 7732735b2758
+Revises: e8cce7b974d2
+Create Date: 2026-10-19 10:43:55.310788
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7732735b2758'
+down_revision: Union[str, None] = 'e8cce7b974d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build the new indexes before dropping the one (user_id, created_at, id)
+    # replaces, concurrently so writes to the tables aren't blocked
+    with op.get_context().autocommit_block():
+        op.create_index('ix_games_user_id_created_at_id', 'games', ['user_id', 'created_at', 'id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_game_simulations_game_id', 'game_simulations', ['game_id'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_games_user_id_created_at', table_name='games', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_games_user_id_created_at', 'games', ['user_id', 'created_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_game_simulations_game_id', table_name='game_simulations', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_games_user_id_created_at_id', table_name='games', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,33 @@
+"""add report snapshots user index
+
+Revision ID: 95bcf0f126a8
+Revises: 7732735b2758
+Create Date: 2026-10-19 10:54:38.304078
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '95bcf0f126a8'
+down_revision: Union[str, None] = '7732735b2758'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so writes to report_snapshots aren't blocked
+    with op.get_context().autocommit_block():
+        op.create_index('ix_report_snapshots_user_id_updated_at', 'report_snapshots', ['user_id', 'updated_at'], unique=False,
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_report_snapshots_user_id_updated_at', table_name='report_snapshots',
+                      postgresql_concurrently=True, if_exists=True)
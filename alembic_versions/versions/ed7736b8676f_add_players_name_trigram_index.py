@@ -0,0 +1,54 @@
+"""add players name trigram index
+
+Revision ID: ed7736b8676f
+Revises: 2426d2e994f1
+Create Date: 2026-10-19 10:33:43.578641
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ed7736b8676f'
+down_revision: Union[str, None] = '2426d2e994f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def trigram_available() -> bool:
+    """Whether the pg_trgm extension can be created on this server"""
+    return op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).scalar() is not None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not trigram_available():
+        logger.warning("pg_trgm is not available on this server, skipping ix_players_name_trgm")
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_players_name_trgm',
+            'players',
+            ['name'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_players_name_trgm', table_name='players', postgresql_concurrently=True, if_exists=True)
@@ -105,6 +105,9 @@ class Config:
         self._load_api_keys()
         self._load_session_config()
         self._load_email_config()
+        self._load_simulation_config()
+        self._load_cache_config()
+        self._load_upload_config()
         
         # Validate required configuration
         self._validate_config()
@@ -119,6 +122,16 @@ class Config:
         self._values["db_name"] = os.getenv("DB_NAME", "anova")
         self._values["db_user"] = os.getenv("DB_USER", "anova_user")
         self._values["db_password"] = os.getenv("DB_PASSWORD", "")
+        # Server-side timeout of read-only raw SQL queries, in milliseconds
+        self._values["db_statement_timeout_ms"] = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+        # Optional read replica; it shares the primary's credentials, and its
+        # port and database name default to the primary's
+        self._values["db_replica_host"] = os.getenv("DB_REPLICA_HOST", "")
+        self._values["db_replica_port"] = os.getenv("DB_REPLICA_PORT", self._values["db_port"])
+        self._values["db_replica_name"] = os.getenv("DB_REPLICA_NAME", self._values["db_name"])
+        # Reads about games completed this recently go to the primary, since
+        # the replica may not have caught up with them yet
+        self._values["db_replica_lag_guard_seconds"] = int(os.getenv("DB_REPLICA_LAG_GUARD_SECONDS", "30"))
     
     def _load_aws_config(self):
         """Load AWS configuration"""
@@ -153,6 +166,30 @@ class Config:
         print(f"DEBUG: Email SMTP port: {self._values['email_smtp_port']}")
         print(f"DEBUG: Email noreply password: {self._values['email_noreply_password']}")
     
+    def _load_simulation_config(self):
+        """Load local simulation configuration"""
+        self._values["simulation_block_size"] = int(os.getenv("SIMULATION_BLOCK_SIZE", "500"))
+        self._values["simulation_max_games"] = int(os.getenv("SIMULATION_MAX_GAMES", "20000"))
+        # Maximum 95% CI half-widths: win probability in percentage points, mean margin in points
+        self._values["simulation_win_pct_tolerance"] = float(os.getenv("SIMULATION_WIN_PCT_TOLERANCE", "1.0"))
+        self._values["simulation_margin_tolerance"] = float(os.getenv("SIMULATION_MARGIN_TOLERANCE", "1.0"))
+        # Game format used by the live win-probability simulation (high school defaults)
+        self._values["game_periods"] = int(os.getenv("GAME_PERIODS", "4"))
+        self._values["period_minutes"] = float(os.getenv("PERIOD_MINUTES", "8"))
+        self._values["overtime_minutes"] = float(os.getenv("OVERTIME_MINUTES", "4"))
+    
+    def _load_cache_config(self):
+        """Load in-process cache configuration"""
+        # Memory budget of the completed-report cache, in bytes of serialized JSON
+        self._values["report_cache_max_bytes"] = int(os.getenv("REPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    
+    def _load_upload_config(self):
+        """Load uploaded PDF limits"""
+        # PDFs are sent base64-encoded to the Claude API, which caps requests
+        # at 32 MB and documents at 100 pages
+        self._values["max_upload_bytes"] = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+        self._values["max_upload_pages"] = int(os.getenv("MAX_UPLOAD_PAGES", "100"))
+    
     def _validate_config(self):
         """Validate required configuration values"""
         required_vars = [
@@ -172,12 +209,20 @@ class Config:
         """Log a summary of the configuration (without sensitive values)"""
         logger.info(f"Configuration loaded for environment: {self.environment}")
         logger.info(f"Database: {self.db_user}@{self.db_host}:{self.db_port}/{self.db_name}")
+        if self.db_replica_host:
+            logger.info(f"Read replica: {self.db_replica_host}:{self.db_replica_port}/{self.db_replica_name}")
         logger.info(f"AWS Region: {self.aws_region}")
     
     def get_database_url(self) -> str:
         """Get the database URL for SQLAlchemy"""
         return f"postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}"
     
+    def get_replica_database_url(self) -> Optional[str]:
+        """Get the read replica's database URL for SQLAlchemy, None if no replica is configured"""
+        if not self.db_replica_host:
+            return None
+        return f"postgresql://{self.db_user}:{self.db_password}@{self.db_replica_host}:{self.db_replica_port}/{self.db_replica_name}"
+    
     def is_production(self) -> bool:
         """Check if the environment is production"""
         return self.environment.lower() == "production"
@@ -207,6 +252,26 @@ class Config:
     def db_password(self) -> str:
         return self._values.get("db_password", "")
     
+    @property
+    def db_statement_timeout_ms(self) -> int:
+        return self._values.get("db_statement_timeout_ms", 5000)
+    
+    @property
+    def db_replica_host(self) -> str:
+        return self._values.get("db_replica_host", "")
+    
+    @property
+    def db_replica_port(self) -> int:
+        return self._values.get("db_replica_port", "5432")
+    
+    @property
+    def db_replica_name(self) -> str:
+        return self._values.get("db_replica_name", "")
+    
+    @property
+    def db_replica_lag_guard_seconds(self) -> int:
+        return self._values.get("db_replica_lag_guard_seconds", 30)
+    
     @property
     def aws_region(self) -> str:
         return self._values.get("aws_region", "")
@@ -262,3 +327,43 @@ class Config:
     @property
     def email_smtp_port(self) -> int:
         return self._values.get("email_smtp_port", 0)
+    
+    @property
+    def simulation_block_size(self) -> int:
+        return self._values.get("simulation_block_size", 500)
+    
+    @property
+    def simulation_max_games(self) -> int:
+        return self._values.get("simulation_max_games", 20000)
+    
+    @property
+    def simulation_win_pct_tolerance(self) -> float:
+        return self._values.get("simulation_win_pct_tolerance", 1.0)
+    
+    @property
+    def simulation_margin_tolerance(self) -> float:
+        return self._values.get("simulation_margin_tolerance", 1.0)
+    
+    @property
+    def game_periods(self) -> int:
+        return self._values.get("game_periods", 4)
+    
+    @property
+    def period_minutes(self) -> float:
+        return self._values.get("period_minutes", 8.0)
+    
+    @property
+    def overtime_minutes(self) -> float:
+        return self._values.get("overtime_minutes", 4.0)
+    
+    @property
+    def report_cache_max_bytes(self) -> int:
+        return self._values.get("report_cache_max_bytes", 64 * 1024 * 1024)
+    
+    @property
+    def max_upload_bytes(self) -> int:
+        return self._values.get("max_upload_bytes", 20 * 1024 * 1024)
+    
+    @property
+    def max_upload_pages(self) -> int:
+        return self._values.get("max_upload_pages", 100)
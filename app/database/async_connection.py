@@ -0,0 +1,180 @@
+import logging
+import uuid
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.connection import (
+    AnalysisPage,
+    ReportSummaryPage,
+    analysis_page,
+    child_task_progress_statement,
+    public_user_statement,
+    recent_analyses_statement,
+    recent_report_statement,
+    report_snapshot_statement,
+    report_summaries_statement,
+    report_summary_page,
+    task_progress_statement,
+)
+from app.database.models import GameDB, UserDB
+from app.database.pagination import DEFAULT_PAGE_SIZE, async_estimate_count, async_keyset_page, clamp_page_size
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[UserDB]:
+    """
+    Get a user by email
+
+    Args:
+        db: Async SQLAlchemy database session
+        email: User email
+
+    Returns:
+        User data if found, None otherwise
+    """
+    return (await db.execute(select(UserDB).where(UserDB.email == email).limit(1))).scalar()
+
+
+async def get_public_user_by_email(db: AsyncSession, email: str):
+    """
+    Get only public user information by email, no id or password hash
+
+    Args:
+        db: Async SQLAlchemy database session
+        email: User email
+
+    Returns:
+        Row of (email, name, phone_number, school, role) if found, None
+        otherwise
+    """
+    return (await db.execute(public_user_statement(email))).first()
+
+
+async def get_report_snapshot(
+    db: AsyncSession, game_uuid: str, user_email: str, settled_seconds: Optional[int] = None
+) -> Optional[str]:
+    """
+    Get the current-version report snapshot of a game owned by the user
+
+    Args:
+        db: Async SQLAlchemy database session
+        game_uuid: Game UUID
+        user_email: Email of the user requesting the report
+        settled_seconds: Ignore a snapshot written less than this many seconds
+            ago (optional)
+
+    Returns:
+        Serialized OverallReport JSON, or None if there is no current snapshot
+        or the UUID is malformed
+    """
+    try:
+        game_uuid = uuid.UUID(str(game_uuid))
+    except ValueError:
+        return None
+    return (await db.execute(report_snapshot_statement(game_uuid, user_email, settled_seconds))).scalar()
+
+
+async def has_recent_report(db: AsyncSession, user_email: str, seconds: int) -> bool:
+    """
+    Whether a game of the user was completed, or its report rewritten, in the last seconds
+
+    Args:
+        db: Async SQLAlchemy database session
+        user_email: User email
+        seconds: Length of the window
+
+    Returns:
+        True if a report snapshot of the user was written within the window
+    """
+    return (await db.execute(recent_report_statement(user_email, seconds))).first() is not None
+
+
+async def get_report_summaries_by_user_id(
+    db: AsyncSession, user_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None
+) -> ReportSummaryPage:
+    """
+    Get a page of report summaries for a user, newest game first
+
+    Args:
+        db: Async SQLAlchemy database session
+        user_id: User ID to get report summaries for
+        limit: Maximum number of summaries to return, capped at MAX_PAGE_SIZE
+        cursor: next_cursor of the previous page (optional)
+
+    Returns:
+        Page of report summaries; total_estimate is only filled in on the
+        first page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    statement = report_summaries_statement(user_id)
+    rows, next_cursor = await async_keyset_page(db, statement, GameDB.created_at, GameDB.id, clamp_page_size(limit), cursor)
+    total_estimate = await async_estimate_count(db, statement) if cursor is None else None
+    return report_summary_page(rows, next_cursor, total_estimate)
+
+
+async def get_recent_analyses(
+    db: AsyncSession, limit: int = DEFAULT_PAGE_SIZE, user_id: int = None, cursor: Optional[str] = None
+) -> AnalysisPage:
+    """
+    Get a page of recent analyses from the database, newest game first
+
+    Args:
+        db: Async SQLAlchemy database session
+        limit: Maximum number of analyses to return, capped at MAX_PAGE_SIZE
+        user_id: User ID to filter by (optional)
+        cursor: next_cursor of the previous page (optional)
+
+    Returns:
+        Page of analyses; total_estimate is only filled in on the first page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    statement = recent_analyses_statement(user_id)
+    rows, next_cursor = await async_keyset_page(db, statement, GameDB.created_at, GameDB.id, clamp_page_size(limit), cursor)
+    total_estimate = await async_estimate_count(db, statement) if cursor is None else None
+    return analysis_page(rows, next_cursor, total_estimate)
+
+
+async def get_task_progress(db: AsyncSession, task_uuid: str):
+    """
+    Get the progress of a processing task in a single query
+
+    Args:
+        db: Async SQLAlchemy database session
+        task_uuid: Task UUID
+
+    Returns:
+        Row of (status, step, total_steps, game_uuid), or None if there is no
+        such task or the UUID is malformed
+    """
+    try:
+        task_uuid = uuid.UUID(str(task_uuid))
+    except ValueError:
+        return None
+    return (await db.execute(task_progress_statement(task_uuid))).first()
+
+
+async def get_child_task_progress(db: AsyncSession, task_uuid: str) -> list:
+    """
+    Get the progress of every child task of a batch task in a single query
+
+    Args:
+        db: Async SQLAlchemy database session
+        task_uuid: Task UUID of the batch task
+
+    Returns:
+        Rows of (task_uuid, status, step, total_steps, game_uuid), empty if
+        the task has no children or the UUID is malformed
+    """
+    try:
+        task_uuid = uuid.UUID(str(task_uuid))
+    except ValueError:
+        return []
+    return (await db.execute(child_task_progress_statement(task_uuid))).all()
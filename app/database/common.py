@@ -1,4 +1,5 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
@@ -11,6 +12,12 @@ CONFIG = None
 ENGINE = None
 SESSION_FACTORY = None
 SQLALCHEMY_DATABASE_URL = None
+ASYNC_ENGINE = None
+ASYNC_SESSION_FACTORY = None
+READ_ENGINE = None
+READ_SESSION_FACTORY = None
+ASYNC_READ_ENGINE = None
+ASYNC_READ_SESSION_FACTORY = None
 
 def get_sqlalchemy_database_url():
     global CONFIG
@@ -21,6 +28,10 @@ def get_sqlalchemy_database_url():
         SQLALCHEMY_DATABASE_URL = f"postgresql://{CONFIG.db_user}:{CONFIG.db_password}@{CONFIG.db_host}:{CONFIG.db_port}/{CONFIG.db_name}"
     return SQLALCHEMY_DATABASE_URL
 
+def get_async_database_url():
+    """Database URL for the asyncpg driver"""
+    return get_sqlalchemy_database_url().replace("postgresql://", "postgresql+asyncpg://", 1)
+
 def get_engine():
     global ENGINE
     if ENGINE is None:
@@ -42,6 +53,134 @@ def get_session_factory():
     return SESSION_FACTORY
 
 
+def get_async_engine():
+    """
+    Engine for async sessions, with the same pool settings as get_engine
+
+    Its connections belong to the event loop that opened them, so it is only
+    used from the application's event loop.
+    """
+    global ASYNC_ENGINE
+    if ASYNC_ENGINE is None:
+        ASYNC_ENGINE = create_async_engine(
+            get_async_database_url(),
+            pool_size=10,
+            max_overflow=10,
+            pool_timeout=30,
+            pool_recycle=1800,
+        )
+    return ASYNC_ENGINE
+
+
+def get_async_session_factory():
+    global ASYNC_SESSION_FACTORY
+    if ASYNC_SESSION_FACTORY is None:
+        # Loaded attributes stay usable after commit; lazy loads can't run
+        # on an async session anyway
+        ASYNC_SESSION_FACTORY = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return ASYNC_SESSION_FACTORY
+
+
+def get_replica_database_url():
+    """Read replica's database URL, None if no replica is configured"""
+    global CONFIG
+    if CONFIG is None:
+        CONFIG = Config()
+    return CONFIG.get_replica_database_url()
+
+
+def replica_configured():
+    return get_replica_database_url() is not None
+
+
+def get_read_engine():
+    """Engine of the read replica, or the primary's engine if there is none"""
+    global READ_ENGINE
+    if READ_ENGINE is None:
+        replica_url = get_replica_database_url()
+        if replica_url is None:
+            READ_ENGINE = get_engine()
+        else:
+            READ_ENGINE = create_engine(
+                replica_url,
+                poolclass=QueuePool,
+                pool_size=10,
+                max_overflow=10,
+                pool_timeout=30,
+                pool_recycle=1800,
+            )
+    return READ_ENGINE
+
+
+def get_read_session_factory():
+    global READ_SESSION_FACTORY
+    if READ_SESSION_FACTORY is None:
+        READ_SESSION_FACTORY = sessionmaker(autocommit=False, autoflush=False, bind=get_read_engine())
+    return READ_SESSION_FACTORY
+
+
+def get_async_read_engine():
+    """Async engine of the read replica, or the primary's async engine if there is none"""
+    global ASYNC_READ_ENGINE
+    if ASYNC_READ_ENGINE is None:
+        replica_url = get_replica_database_url()
+        if replica_url is None:
+            ASYNC_READ_ENGINE = get_async_engine()
+        else:
+            ASYNC_READ_ENGINE = create_async_engine(
+                replica_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+                pool_size=10,
+                max_overflow=10,
+                pool_timeout=30,
+                pool_recycle=1800,
+            )
+    return ASYNC_READ_ENGINE
+
+
+def get_async_read_session_factory():
+    global ASYNC_READ_SESSION_FACTORY
+    if ASYNC_READ_SESSION_FACTORY is None:
+        ASYNC_READ_SESSION_FACTORY = async_sessionmaker(get_async_read_engine(), autoflush=False, expire_on_commit=False)
+    return ASYNC_READ_SESSION_FACTORY
+
+
+async def dispose_async_engine():
+    """Close the async engines' pooled connections, e.g. on shutdown"""
+    global ASYNC_ENGINE, ASYNC_SESSION_FACTORY, ASYNC_READ_ENGINE, ASYNC_READ_SESSION_FACTORY
+    for engine in {engine for engine in (ASYNC_ENGINE, ASYNC_READ_ENGINE) if engine is not None}:
+        await engine.dispose()
+    ASYNC_ENGINE = ASYNC_READ_ENGINE = None
+    ASYNC_SESSION_FACTORY = ASYNC_READ_SESSION_FACTORY = None
+
+
+@contextmanager
+def read_only_connection(statement_timeout_ms=None):
+    """
+    Pooled connection inside a read-only transaction
+
+    The transaction is rolled back when the block ends, so the connection goes
+    back to the pool clean. Statements running longer than the timeout are
+    cancelled by the server.
+
+    Args:
+        statement_timeout_ms: Statement timeout in milliseconds (defaults to
+            the configured DB_STATEMENT_TIMEOUT_MS)
+    """
+    if statement_timeout_ms is None:
+        statement_timeout_ms = Config().db_statement_timeout_ms
+    with get_engine().connect() as connection:
+        transaction = connection.begin()
+        try:
+            connection.execute(text("SET TRANSACTION READ ONLY"))
+            connection.execute(
+                text("SELECT set_config('statement_timeout', :timeout, true)"),
+                {"timeout": str(int(statement_timeout_ms))},
+            )
+            yield connection
+        finally:
+            transaction.rollback()
+
+
 @contextmanager
 def database_context():
     with get_session_factory()() as session:
@@ -52,3 +191,21 @@ def database_context():
 def get_db():
     with get_session_factory()() as session:
         yield session
+
+
+# Dependency for async routes; queries don't block the event loop
+async def get_async_db():
+    async with get_async_session_factory()() as session:
+        yield session
+
+
+# Dependencies for read-only routes; sessions are bound to the read replica
+# if one is configured. See app.database.replica for the lag guard.
+def get_read_db():
+    with get_read_session_factory()() as session:
+        yield session
+
+
+async def get_async_read_db():
+    async with get_async_read_session_factory()() as session:
+        yield session
@@ -1,21 +1,27 @@
 import datetime
 import json
 import os
-from typing import List, Optional, Tuple
+import uuid
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import Select, and_, func, insert, literal, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session, aliased
 import logging
 
 from pydantic import BaseModel
-from app.config import Config
+from app.database.common import read_only_connection
+from app.database.pagination import DEFAULT_PAGE_SIZE, clamp_page_size, estimate_count, keyset_page
 from app.llmmodels import (
     GameSimulation,
     PlaybookPlay,
     Player,
+    PlayerGameLine,
     PlayerStats,
     SituationalAdjustment,
     TeamAnalysis,
     TeamDetails,
     TeamStats,
+    TeamWrapper,
 )
 from app.database.models import (
     UserDB,
@@ -31,81 +37,66 @@ from app.database.models import (
     SimulationDetailsDB,
     ReportDB,
     OneTimePasswordDB,
+    LeagueMatrixDB,
+    ReportSnapshotDB,
+    ScheduleGameDB,
+    SimulationWeightsDB,
+    ProcessingTaskDB,
+)
+from app.models import (
+    GameSimulationResponse,
+    PlayerProjectionResponse,
+    TeamAnalysisResponse,
+    TeamResponse,
+    TeamStatsResponse,
 )
-from app.models import PlayerProjectionResponse
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
-def get_db_connection():
+def execute_query(query: str, params: Optional[dict] = None, statement_timeout_ms: Optional[int] = None) -> List[dict]:
     """
-    Get a connection to the PostgreSQL database
+    Run a read-only raw SQL query on a pooled connection
+
+    Args:
+        query: SQL query string with :name placeholders
+        params: Parameters for the query
+        statement_timeout_ms: Statement timeout in milliseconds (optional)
 
     Returns:
-        Connection object
+        List of rows as dictionaries
     """
-    try:
-        config = Config()
-        logger.info(
-            f"Connecting to database: {config.db_host}:{config.db_port}/{config.db_name}"
-        )
+    with read_only_connection(statement_timeout_ms) as connection:
+        return [dict(row) for row in connection.execute(text(query), params or {}).mappings()]
 
-        conn = psycopg2.connect(
-            host=config.db_host,
-            port=config.db_port,
-            database=config.db_name,
-            user=config.db_user,
-            password=config.db_password,
-            cursor_factory=RealDictCursor,
-        )
-        return conn
-    except Exception as e:
-        print(f"Error connecting to database: {e}")
-        return None
 
-
-def execute_query(query, params=None, fetch=True):
+def stream_query(
+    query: str,
+    params: Optional[dict] = None,
+    batch_size: int = 1000,
+    statement_timeout_ms: Optional[int] = None,
+) -> Iterator[dict]:
     """
-    Execute a SQL query
+    Stream the rows of a read-only raw SQL query
+
+    Rows are fetched from a server-side cursor batch_size at a time, so large
+    results are never held in memory at once. The pooled connection is held
+    until the generator is exhausted or closed.
 
     Args:
-        query: SQL query string
+        query: SQL query string with :name placeholders
         params: Parameters for the query
-        fetch: Whether to fetch results
+        batch_size: Rows fetched per round trip
+        statement_timeout_ms: Statement timeout in milliseconds (optional)
 
-    Returns:
-        Query results if fetch is True, otherwise None
+    Yields:
+        Rows as dictionaries
     """
-    conn = get_db_connection()
-    if not conn:
-        print("ERROR: Could not get database connection")
-        return None
-
-    try:
-        with conn.cursor() as cur:
-            # print(f"DEBUG - Executing query: {query[:10]}")
-            # print(f"DEBUG - With params: {params}")
-            cur.execute(query, params)
-
-            # Always commit changes, regardless of fetch
-            conn.commit()
-            print("DEBUG - Changes committed to database")
-
-            if fetch:
-                results = cur.fetchall()
-                # print(f"DEBUG - Query results: {results}")
-                return results
-            else:
-                print("DEBUG - Query executed successfully")
-                return None
-    except Exception as e:
-        print(f"Error executing query: {e}")
-        conn.rollback()  # Rollback in case of error
-        print("DEBUG - Transaction rolled back due to error")
-        return None
-    finally:
-        conn.close()
+    with read_only_connection(statement_timeout_ms) as connection:
+        result = connection.execution_options(yield_per=batch_size).execute(text(query), params or {})
+        for row in result.mappings():
+            yield dict(row)
 
 
 def get_or_create_user(
@@ -149,23 +140,12 @@ def get_or_create_user(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    db.flush()
     return new_user.id
 
 
-def insert_team(db: Session, team_details: TeamDetails):
-    """
-    Insert a team into the database
-
-    Args:
-        db: SQLAlchemy database session
-        team_details: TeamDetails object containing team data
-        team_analysis: TeamAnalysis object containing team analysis
-
-    Returns:
-        Team ID if successful, None otherwise
-    """
+def _team_values(team_details: TeamDetails) -> dict:
+    """Column values of a TeamDB row"""
     # Parse record_date if it exists, otherwise use current date
     record_date = None
     try:
@@ -175,16 +155,30 @@ def insert_team(db: Session, team_details: TeamDetails):
     except:
         record_date = datetime.datetime.now().date()
 
-    new_team = TeamDB(
+    return dict(
         name=team_details.team_name,
         record=team_details.record,
         ranking=team_details.team_ranking,
         record_date=record_date,
     )
 
+
+def insert_team(db: Session, team_details: TeamDetails):
+    """
+    Insert a team into the database
+
+    Args:
+        db: SQLAlchemy database session
+        team_details: TeamDetails object containing team data
+        team_analysis: TeamAnalysis object containing team analysis
+
+    Returns:
+        Team ID if successful, None otherwise
+    """
+    new_team = TeamDB(**_team_values(team_details))
+
     db.add(new_team)
-    db.commit()
-    db.refresh(new_team)
+    db.flush()
     return new_team.id
 
 
@@ -208,6 +202,15 @@ def insert_team_stats(
     Returns:
         Stats ID if successful, None otherwise
     """
+    new_team_stats = TeamStatsDB(**_team_stats_values(team_id, stats_data, game_id, is_season_average))
+
+    db.add(new_team_stats)
+    db.flush()
+    return new_team_stats.id
+
+
+def _team_stats_values(team_id: int, stats_data: TeamStats, game_id: int = None, is_season_average: bool = True) -> dict:
+    """Column values of a TeamStatsDB row"""
     # Calculate assist to turnover ratio
     assist_to_turnover = 0
     if stats_data.TO > 0:
@@ -215,7 +218,7 @@ def insert_team_stats(
     else:
         assist_to_turnover = stats_data.A_TO
 
-    new_team_stats = TeamStatsDB(
+    return dict(
         team_id=team_id,
         game_id=game_id,
         is_season_average=is_season_average,
@@ -239,11 +242,6 @@ def insert_team_stats(
         assist_to_turnover=assist_to_turnover,
     )
 
-    db.add(new_team_stats)
-    db.commit()
-    db.refresh(new_team_stats)
-    return new_team_stats.id
-
 
 def update_team_stats_game_id(db: Session, team_stats_id: int, game_id: int):
     """
@@ -257,7 +255,46 @@ def update_team_stats_game_id(db: Session, team_stats_id: int, game_id: int):
     team_stats = db.query(TeamStatsDB).filter(TeamStatsDB.id == team_stats_id).first()
     if team_stats:
         team_stats.game_id = game_id
-        db.commit()
+        db.flush()
+
+
+def link_team_stats_to_game(db: Session, team_stats_id: int, game_id: int) -> int:
+    """
+    Link a team stats record to a game, copying it if another game already uses it
+
+    A team analyzed once can play several games, e.g. every game of a batch
+    upload, and each game keeps its own stats record. The link is a
+    conditional update, so concurrent games can't take the same record.
+
+    Args:
+        db: SQLAlchemy database session
+        team_stats_id: Team stats ID
+        game_id: Game ID to link
+
+    Returns:
+        ID of the team stats record linked to the game
+    """
+    linked_id = db.execute(
+        update(TeamStatsDB)
+        .where(TeamStatsDB.id == team_stats_id, TeamStatsDB.game_id.is_(None))
+        .values(game_id=game_id)
+        .returning(TeamStatsDB.id)
+    ).scalar()
+    if linked_id is not None:
+        return linked_id
+
+    columns = [
+        column for column in TeamStatsDB.__table__.columns
+        if column.name not in ("id", "game_id", "created_at", "updated_at")
+    ]
+    return db.execute(
+        insert(TeamStatsDB)
+        .from_select(
+            [column.name for column in columns] + ["game_id"],
+            select(*columns, literal(game_id)).where(TeamStatsDB.id == team_stats_id),
+        )
+        .returning(TeamStatsDB.id)
+    ).scalar()
 
 
 def insert_player(db: Session, team_id: int, player_data: Player):
@@ -272,7 +309,16 @@ def insert_player(db: Session, team_id: int, player_data: Player):
     Returns:
         Player ID if successful, None otherwise
     """
-    new_player = PlayerDB(
+    new_player = PlayerDB(**_player_values(team_id, player_data))
+
+    db.add(new_player)
+    db.flush()
+    return new_player.id
+
+
+def _player_values(team_id: int, player_data: Player) -> dict:
+    """Column values of a PlayerDB row"""
+    return dict(
         team_id=team_id,
         name=player_data.name,
         number=player_data.number,
@@ -284,11 +330,6 @@ def insert_player(db: Session, team_id: int, player_data: Player):
         weaknesses=player_data.weaknesses,
     )
 
-    db.add(new_player)
-    db.commit()
-    db.refresh(new_player)
-    return new_player.id
-
 
 def insert_player_stats(
     db: Session,
@@ -313,6 +354,23 @@ def insert_player_stats(
         Stats ID if successful, None otherwise
     """
     new_player_stats = PlayerStatsDB(
+        **_player_stats_values(player_id, stats_data, game_id, is_season_average, player_raw_stats_id)
+    )
+
+    db.add(new_player_stats)
+    db.flush()
+    return new_player_stats.id
+
+
+def _player_stats_values(
+    player_id: int,
+    stats_data: PlayerStats,
+    game_id: int = None,
+    is_season_average: bool = True,
+    player_raw_stats_id: int = None,
+) -> dict:
+    """Column values of a PlayerStatsDB row"""
+    return dict(
         player_id=player_id,
         player_raw_stats_id=player_raw_stats_id,
         game_id=game_id,
@@ -330,11 +388,6 @@ def insert_player_stats(
         is_season_average=is_season_average,
     )
 
-    db.add(new_player_stats)
-    db.commit()
-    db.refresh(new_player_stats)
-    return new_player_stats.id
-
 
 def insert_team_analysis(db: Session, team_id: int, analysis_data: TeamAnalysis):
     """
@@ -348,7 +401,16 @@ def insert_team_analysis(db: Session, team_id: int, analysis_data: TeamAnalysis)
     Returns:
         Analysis ID if successful, None otherwise
     """
-    new_team_analysis = TeamAnalysisDB(
+    new_team_analysis = TeamAnalysisDB(**_team_analysis_values(team_id, analysis_data))
+
+    db.add(new_team_analysis)
+    db.flush()
+    return new_team_analysis.id
+
+
+def _team_analysis_values(team_id: int, analysis_data: TeamAnalysis) -> dict:
+    """Column values of a TeamAnalysisDB row"""
+    return dict(
         team_id=team_id,
         playing_style=analysis_data.playing_style,
         strengths=analysis_data.team_strengths,
@@ -362,10 +424,61 @@ def insert_team_analysis(db: Session, team_id: int, analysis_data: TeamAnalysis)
         game_keys=analysis_data.game_keys,
     )
 
-    db.add(new_team_analysis)
-    db.commit()
-    db.refresh(new_team_analysis)
-    return new_team_analysis.id
+
+def _insert_returning_ids(db: Session, model, rows: List[dict]) -> List[int]:
+    """Insert many rows in one multi-row INSERT ... RETURNING, IDs in row order"""
+    if not rows:
+        return []
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list(db.scalars(statement, rows))
+
+
+def insert_team_wrapper(db: Session, team_wrapper: TeamWrapper) -> Tuple[int, int, int]:
+    """
+    Insert a whole team analysis result
+
+    Team, team stats, players, raw stats (season totals and per-game lines),
+    processed player stats and team analysis are written with one multi-row
+    INSERT ... RETURNING per table. Like the other helpers it does not commit,
+    so the caller's transaction decides whether all of it is kept.
+
+    Args:
+        db: SQLAlchemy database session
+        team_wrapper: TeamWrapper object returned by the team analysis
+
+    Returns:
+        (team ID, team stats ID, team analysis ID)
+    """
+    players = team_wrapper.team_details.players
+    (team_id,) = _insert_returning_ids(db, TeamDB, [_team_values(team_wrapper.team_details)])
+    (team_stats_id,) = _insert_returning_ids(
+        db, TeamStatsDB, [_team_stats_values(team_id, team_wrapper.team_stats)]
+    )
+    player_ids = _insert_returning_ids(db, PlayerDB, [_player_values(team_id, player) for player in players])
+
+    # Season totals first, one per player, followed by every per-game line
+    raw_stats_rows = [
+        dict(player_id=player_id, game_id=None, game_number=None, game_date=None, opponent_name=None,
+             **_raw_stats_values(player.stats))
+        for player_id, player in zip(player_ids, players)
+    ]
+    raw_stats_rows += [
+        dict(player_id=player_id, game_id=None, game_number=game_number, game_date=game_line.game_date,
+             opponent_name=game_line.opponent, **_raw_stats_values(game_line))
+        for player_id, player in zip(player_ids, players)
+        for game_number, game_line in enumerate(player.game_lines, start=1)
+    ]
+    raw_stats_ids = _insert_returning_ids(db, PlayerRawStatsDB, raw_stats_rows)
+
+    _insert_returning_ids(db, PlayerStatsDB, [
+        _player_stats_values(player_id, player.stats, player_raw_stats_id=raw_stats_id)
+        for player_id, player, raw_stats_id in zip(player_ids, players, raw_stats_ids)
+    ])
+    (team_analysis_id,) = _insert_returning_ids(
+        db, TeamAnalysisDB, [_team_analysis_values(team_id, team_wrapper.team_analysis)]
+    )
+
+    return team_id, team_stats_id, team_analysis_id
 
 
 def insert_game(
@@ -399,12 +512,17 @@ def insert_game(
     )
 
     db.add(new_game)
-    db.commit()
-    db.refresh(new_game)
+    db.flush()
     return new_game.id, str(new_game.uuid)
 
 
-def insert_game_simulation(db: Session, game_id: int, simulation_data: GameSimulation):
+def insert_game_simulation(
+    db: Session,
+    game_id: int,
+    simulation_data: GameSimulation,
+    model_name: Optional[str] = None,
+    prompt_version: Optional[str] = None,
+):
     """
     Insert game simulation into the database
 
@@ -412,6 +530,8 @@ def insert_game_simulation(db: Session, game_id: int, simulation_data: GameSimul
         db: SQLAlchemy database session
         game_id: Game ID
         simulation_data: GameSimulation object containing simulation data
+        model_name: Model that produced the simulation
+        prompt_version: Version of the simulation prompt
 
     Returns:
         Simulation ID if successful, None otherwise
@@ -432,11 +552,12 @@ def insert_game_simulation(db: Session, game_id: int, simulation_data: GameSimul
         playbook_special_situations=simulation_data.playbook_special_situations,
         playbook_inbound_plays=simulation_data.playbook_inbound_plays,
         playbook_after_timeout_special_plays=simulation_data.playbook_after_timeout_special_plays,
+        model_name=model_name,
+        prompt_version=prompt_version,
     )
 
     db.add(new_simulation)
-    db.commit()
-    db.refresh(new_simulation)
+    db.flush()
     return new_simulation.id
 
 
@@ -456,8 +577,7 @@ def insert_report(db: Session, game_id: int, report_type: str, file_path: str):
     new_report = ReportDB(game_id=game_id, report_type=report_type, file_path=file_path)
 
     db.add(new_report)
-    db.commit()
-    db.refresh(new_report)
+    db.flush()
     return new_report.id, new_report.uuid
 
 
@@ -509,9 +629,16 @@ def insert_player_raw_stats(
     Returns:
         Raw stats ID if successful, None otherwise
     """
-    new_raw_stats = PlayerRawStatsDB(
-        player_id=player_id,
-        game_id=game_id,
+    new_raw_stats = PlayerRawStatsDB(player_id=player_id, game_id=game_id, **_raw_stats_values(stats_data))
+
+    db.add(new_raw_stats)
+    db.flush()
+    return new_raw_stats.id
+
+
+def _raw_stats_values(stats_data: PlayerStats | PlayerGameLine) -> dict:
+    """Shooting and counting columns of a PlayerRawStatsDB row"""
+    return dict(
         fgm=stats_data.FGM,
         fga=stats_data.FGA,
         fg2m=stats_data.FGM2,
@@ -529,10 +656,56 @@ def insert_player_raw_stats(
         total_turnovers=stats_data.TO,
     )
 
-    db.add(new_raw_stats)
-    db.commit()
-    db.refresh(new_raw_stats)
-    return new_raw_stats.id
+
+def insert_player_game_lines(
+    db: Session, player_id: int, game_lines: List[PlayerGameLine], game_id: int = None
+) -> List[int]:
+    """
+    Insert one raw stats row per game line of a player
+
+    Args:
+        db: SQLAlchemy database session
+        player_id: Player ID
+        game_lines: PlayerGameLine objects, in the order they appear in the PDF
+        game_id: Game ID (optional)
+
+    Returns:
+        List of raw stats IDs
+    """
+    new_rows = [
+        PlayerRawStatsDB(
+            player_id=player_id,
+            game_id=game_id,
+            game_number=game_number,
+            game_date=game_line.game_date,
+            opponent_name=game_line.opponent,
+            **_raw_stats_values(game_line),
+        )
+        for game_number, game_line in enumerate(game_lines, start=1)
+    ]
+
+    db.add_all(new_rows)
+    db.flush()
+    return [row.id for row in new_rows]
+
+
+def get_player_game_lines(db: Session, player_ids: List[int]) -> List[PlayerRawStatsDB]:
+    """
+    Get the per-game raw stats rows of several players
+
+    Args:
+        db: SQLAlchemy database session
+        player_ids: Player IDs
+
+    Returns:
+        List of PlayerRawStatsDB rows with a game_number, ordered by player and game
+    """
+    return (
+        db.query(PlayerRawStatsDB)
+        .filter(PlayerRawStatsDB.player_id.in_(player_ids), PlayerRawStatsDB.game_number.isnot(None))
+        .order_by(PlayerRawStatsDB.player_id, PlayerRawStatsDB.game_number)
+        .all()
+    )
 
 
 def insert_player_projections(
@@ -574,8 +747,7 @@ def insert_player_projections(
     )
 
     db.add(new_projection)
-    db.commit()
-    db.refresh(new_projection)
+    db.flush()
     return new_projection.id
 
 
@@ -617,73 +789,188 @@ def insert_simulation_details(
         blowout_game_margin=simulation_data.get("blowoutGame", {}).get("margin", 0),
         margin_distribution=simulation_data.get("marginDistribution", {}),
         avg_effects=simulation_data.get("avgEffects", {}),
+        score_distribution=simulation_data.get("scoreDistribution", {}),
+        margin_stats=simulation_data.get("marginStats", {}),
+        margin_histogram=simulation_data.get("marginHistogram", {}),
+        effect_stats=simulation_data.get("effectStats", {}),
+        home_win_pct_ci_lower=simulation_data.get("winPctCI", {}).get("lower"),
+        home_win_pct_ci_upper=simulation_data.get("winPctCI", {}).get("upper"),
+        margin_ci_lower=simulation_data.get("marginCI", {}).get("lower"),
+        margin_ci_upper=simulation_data.get("marginCI", {}).get("upper"),
     )
 
     db.add(new_simulation_details)
-    db.commit()
-    db.refresh(new_simulation_details)
+    db.flush()
     return new_simulation_details.id
 
 
-def find_player_by_name(db: Session, player_name: str, team_id: int) -> PlayerDB | None:
+def get_team_rosters(db: Session, team_ids: List[int]) -> dict[int, List[PlayerDB]]:
     """
-    Find a player by name in a specific team
+    Get the players of several teams in one query
 
     Args:
         db: SQLAlchemy database session
-        player_name: Player name
-        team_id: Team ID
+        team_ids: Team IDs
 
     Returns:
-        Player ID if found, None otherwise
+        Mapping from team ID to its players; teams without players are left out
     """
-    # Remove jersey number if present
-    name_only = player_name.split("#")[0].strip()
+    rosters: dict[int, List[PlayerDB]] = {}
+    for player in db.query(PlayerDB).filter(PlayerDB.team_id.in_(team_ids)).order_by(PlayerDB.id):
+        rosters.setdefault(player.team_id, []).append(player)
+    return rosters
 
-    player = (
-        db.query(PlayerDB)
-        .filter(PlayerDB.team_id == team_id, PlayerDB.name.ilike(f"%{name_only}%"))
-        .first()
-    )
 
-    return player
+def trigram_search_available(db: Session) -> bool:
+    """Whether the pg_trgm extension is installed, so find_similar_player can run"""
+    return db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first() is not None
 
 
-def get_recent_analyses(db: Session, limit: int = 5, user_id: int = None):
+def find_similar_player(db: Session, team_id: int, name: str) -> Optional[int]:
     """
-    Get recent analyses from the database
+    Find the player of a team whose name is most similar to a name
+
+    Served by the pg_trgm index on players.name, so check
+    trigram_search_available first. Two players equally similar to the name
+    are ambiguous and give no match.
 
     Args:
         db: SQLAlchemy database session
-        limit: Maximum number of analyses to return
-        user_id: User ID to filter by (optional)
+        team_id: Team ID
+        name: Player name, e.g. normalized with
+            app.services.player_names.normalize_name
 
     Returns:
-        List of analyses
+        Player ID, or None if no name is similar enough or the best match is
+        ambiguous
+    """
+    similarity = func.similarity(PlayerDB.name, name)
+    rows = db.execute(
+        select(PlayerDB.id, similarity.label("similarity"))
+        .where(PlayerDB.team_id == team_id, PlayerDB.name.op("%")(name))
+        .order_by(similarity.desc(), PlayerDB.id)
+        .limit(2)
+    ).all()
+    if not rows or (len(rows) > 1 and rows[1].similarity == rows[0].similarity):
+        return None
+    return rows[0].id
+
+
+class AnalysisSummary(BaseModel):
+    game_id: int
+    game_uuid: str
+    home_team: str
+    away_team: str
+    projected_score: Optional[str] = None
+    win_probability: Optional[str] = None
+    report_id: Optional[int] = None
+    report_path: Optional[str] = None
+    team_report_path: Optional[str] = None
+    opponent_report_path: Optional[str] = None
+    created_at: datetime.datetime
+
+
+class AnalysisPage(BaseModel):
+    items: List[AnalysisSummary]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+_HomeTeam = aliased(TeamDB)
+_AwayTeam = aliased(TeamDB)
+_GameReport = aliased(ReportDB)
+_TeamReport = aliased(ReportDB)
+_OpponentReport = aliased(ReportDB)
+_LatestReport = aliased(ReportDB)
+_LatestGameSimulation = aliased(GameSimulationDB)
+
+
+def _latest_game_report_id(report_type: str):
+    """Correlated subquery: ID of the game's most recent report of a type"""
+    return (
+        select(func.max(_LatestReport.id))
+        .where(_LatestReport.game_id == GameDB.id, _LatestReport.report_type == report_type)
+        .scalar_subquery()
+    )
+
+
+def recent_analyses_statement(user_id: Optional[int] = None) -> Select:
+    """
+    Recent analyses of a user or of every user
+
+    Each game is joined to its latest simulation and latest report of each
+    type, so there is one row per game and (created_at, id) is a unique key.
     """
-    query = (
-        db.query(
-            GameDB.id.label("game_id"),
-            TeamDB.name.label("home_team"),
-            TeamDB.name.label("away_team"),
+    statement = (
+        select(
+            GameDB.id,
+            GameDB.uuid,
+            _HomeTeam.name.label("home_team"),
+            _AwayTeam.name.label("away_team"),
             GameSimulationDB.projected_score,
             GameSimulationDB.win_probability,
-            ReportDB.id.label("report_id"),
-            ReportDB.file_path.label("report_path"),
-            ReportDB.file_path.label("team_report_path"),
-            ReportDB.file_path.label("opponent_report_path"),
+            _GameReport.id.label("report_id"),
+            _GameReport.file_path.label("report_path"),
+            _TeamReport.file_path.label("team_report_path"),
+            _OpponentReport.file_path.label("opponent_report_path"),
             GameDB.created_at,
         )
-        .join(TeamDB, GameDB.home_team_id == TeamDB.id)
-        .join(TeamDB, GameDB.away_team_id == TeamDB.id)
-        .outerjoin(GameSimulationDB, GameDB.id == GameSimulationDB.game_id)
-        .outerjoin(ReportDB, GameDB.id == ReportDB.game_id)
+        .join(_HomeTeam, GameDB.home_team_id == _HomeTeam.id)
+        .join(_AwayTeam, GameDB.away_team_id == _AwayTeam.id)
+        .outerjoin(GameSimulationDB, GameSimulationDB.id == _latest_id(_LatestGameSimulation, _LatestGameSimulation.game_id, GameDB.id))
+        .outerjoin(_GameReport, _GameReport.id == _latest_game_report_id("game_analysis"))
+        .outerjoin(_TeamReport, _TeamReport.id == _latest_game_report_id("team_analysis"))
+        .outerjoin(_OpponentReport, _OpponentReport.id == _latest_game_report_id("opponent_analysis"))
     )
-
     if user_id:
-        query = query.filter(GameDB.user_id == user_id)
+        statement = statement.where(GameDB.user_id == user_id)
+    return statement
+
+
+def analysis_page(rows: list, next_cursor: Optional[str], total_estimate: Optional[int]) -> AnalysisPage:
+    """AnalysisPage from rows of recent_analyses_statement"""
+    return AnalysisPage(
+        items=[
+            AnalysisSummary(
+                game_id=row.id,
+                game_uuid=str(row.uuid),
+                home_team=row.home_team,
+                away_team=row.away_team,
+                projected_score=row.projected_score,
+                win_probability=row.win_probability,
+                report_id=row.report_id,
+                report_path=row.report_path,
+                team_report_path=row.team_report_path,
+                opponent_report_path=row.opponent_report_path,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+        total_estimate=total_estimate,
+    )
 
-    return query.order_by(GameDB.created_at.desc()).limit(limit).all()
+
+def get_recent_analyses(db: Session, limit: int = DEFAULT_PAGE_SIZE, user_id: int = None, cursor: Optional[str] = None) -> AnalysisPage:
+    """
+    Get a page of recent analyses from the database, newest game first
+
+    Args:
+        db: SQLAlchemy database session
+        limit: Maximum number of analyses to return, capped at MAX_PAGE_SIZE
+        user_id: User ID to filter by (optional)
+        cursor: next_cursor of the previous page (optional)
+
+    Returns:
+        Page of analyses; total_estimate is only filled in on the first page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    statement = recent_analyses_statement(user_id)
+    rows, next_cursor = keyset_page(db, statement, GameDB.created_at, GameDB.id, clamp_page_size(limit), cursor)
+    total_estimate = estimate_count(db, statement) if cursor is None else None
+    return analysis_page(rows, next_cursor, total_estimate)
 
 
 def create_user(
@@ -720,8 +1007,7 @@ def create_user(
     )
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    db.flush()
     return new_user.id
 
 
@@ -739,7 +1025,16 @@ def get_user_by_email(db: Session, email: str) -> Optional[UserDB]:
     return db.query(UserDB).filter(UserDB.email == email).first()
 
 
-def get_public_user_by_email(db: Session, email: str) -> Optional[UserDB]:
+def public_user_statement(email: str) -> Select:
+    """Public columns of a user, without the id or password hash"""
+    return (
+        select(UserDB.email, UserDB.name, UserDB.phone_number, UserDB.school, UserDB.role)
+        .where(UserDB.email == email)
+        .limit(1)
+    )
+
+
+def get_public_user_by_email(db: Session, email: str):
     """
     Get only public user information by email, no id or password hash
 
@@ -748,13 +1043,10 @@ def get_public_user_by_email(db: Session, email: str) -> Optional[UserDB]:
         email: User email
 
     Returns:
-        Public user data if found, None otherwise
+        Row of (email, name, phone_number, school, role) if found, None
+        otherwise
     """
-    return (
-        db.query(UserDB)
-        .filter(UserDB.email == email)
-        .first()
-    )
+    return db.execute(public_user_statement(email)).first()
 
 
 def update_user_password(db: Session, user_id: int, password_hash: str):
@@ -773,7 +1065,7 @@ def update_user_password(db: Session, user_id: int, password_hash: str):
     if user:
         user.password_hash = password_hash
         user.confirmed = True
-        db.commit()
+        db.flush()
         return True
     return False
 
@@ -792,7 +1084,7 @@ def confirm_user(db: Session, user_id: int):
     user = db.query(UserDB).filter(UserDB.id == user_id).first()
     if user:
         user.confirmed = True
-        db.commit()
+        db.flush()
         return True
     return False
 
@@ -809,7 +1101,7 @@ def create_otp(db: Session, user_id: int, otp: str):
     new_otp = OneTimePasswordDB(user_id=user_id, otp=otp)
 
     db.add(new_otp)
-    db.commit()
+    db.flush()
 
 
 def verify_otp(db: Session, user_id: int, otp: str):
@@ -844,7 +1136,7 @@ def delete_otp(db: Session, user_id: int, otp: str):
     db.query(OneTimePasswordDB).filter(
         OneTimePasswordDB.user_id == user_id, OneTimePasswordDB.otp == otp
     ).delete()
-    db.commit()
+    db.flush()
 
 
 def get_team_by_id(db: Session, team_id: int) -> Optional[TeamDB]:
@@ -884,6 +1176,181 @@ def get_team_stats_from_game(
     return stats
 
 
+def get_latest_team_stats_for_teams(db: Session, team_ids: List[int]) -> dict[int, TeamStatsDB]:
+    """
+    Get the most recent team statistics for several teams in one query
+
+    Args:
+        db: SQLAlchemy database session
+        team_ids: Team IDs
+
+    Returns:
+        Dictionary mapping team ID to its latest TeamStatsDB row
+    """
+    stats = (
+        db.query(TeamStatsDB)
+        .filter(TeamStatsDB.team_id.in_(team_ids))
+        .distinct(TeamStatsDB.team_id)
+        .order_by(TeamStatsDB.team_id, TeamStatsDB.id.desc())
+        .all()
+    )
+
+    return {team_stats.team_id: team_stats for team_stats in stats}
+
+
+def get_latest_player_stats_for_team(db: Session, team_id: int) -> List[Tuple[PlayerDB, PlayerStatsDB]]:
+    """
+    Get every player of a team with their most recent season-average stats
+
+    Args:
+        db: SQLAlchemy database session
+        team_id: Team ID
+
+    Returns:
+        List of (PlayerDB, PlayerStatsDB) tuples, players without stats left out
+    """
+    return (
+        db.query(PlayerDB, PlayerStatsDB)
+        .join(PlayerStatsDB, PlayerStatsDB.player_id == PlayerDB.id)
+        .filter(PlayerDB.team_id == team_id, PlayerStatsDB.is_season_average.is_(True))
+        .distinct(PlayerDB.id)
+        .order_by(PlayerDB.id, PlayerStatsDB.id.desc())
+        .all()
+    )
+
+
+def get_user_team_ids(db: Session, user_id: int, team_uuids: List[str]) -> dict[str, int]:
+    """
+    Resolve team UUIDs to IDs, for the teams that play in one of the user's games
+
+    Teams have no owner of their own, so a user may only use the teams of
+    their games.
+
+    Args:
+        db: SQLAlchemy database session
+        user_id: User ID
+        team_uuids: Team UUIDs
+
+    Returns:
+        Dictionary mapping each team UUID, as given, to its team ID; UUIDs that
+        are malformed, unknown or not in the user's games are left out
+    """
+    requested = {}
+    for team_uuid in team_uuids:
+        try:
+            requested[uuid.UUID(str(team_uuid))] = team_uuid
+        except ValueError:
+            continue
+    if not requested:
+        return {}
+
+    in_user_game = (
+        select(GameDB.id)
+        .where(GameDB.user_id == user_id, or_(GameDB.home_team_id == TeamDB.id, GameDB.away_team_id == TeamDB.id))
+        .exists()
+    )
+    rows = db.query(TeamDB.uuid, TeamDB.id).filter(TeamDB.uuid.in_(list(requested)), in_user_game).all()
+    return {requested[uuid.UUID(str(team_uuid))]: team_id for team_uuid, team_id in rows}
+
+
+def get_league_matrix(db: Session, user_id: int, team_ids: List[int]) -> Optional[LeagueMatrixDB]:
+    """
+    Get the most recent league matrix a user built for a set of teams
+
+    Args:
+        db: SQLAlchemy database session
+        user_id: User ID
+        team_ids: Team IDs, sorted ascending
+
+    Returns:
+        LeagueMatrixDB object if found, None otherwise
+    """
+    return (
+        db.query(LeagueMatrixDB)
+        .filter(LeagueMatrixDB.user_id == user_id, LeagueMatrixDB.team_ids == team_ids)
+        .order_by(LeagueMatrixDB.id.desc())
+        .first()
+    )
+
+
+def insert_schedule_games(db: Session, user_id: int, games: List[dict]) -> List[ScheduleGameDB]:
+    """
+    Insert games into a user's schedule
+
+    Args:
+        db: SQLAlchemy database session
+        user_id: User ID the schedule belongs to
+        games: Dictionaries with home_team_id, away_team_id and optionally
+            game_date, home_score and away_score
+
+    Returns:
+        List of the new ScheduleGameDB objects
+    """
+    new_games = [ScheduleGameDB(user_id=user_id, **game) for game in games]
+    db.add_all(new_games)
+    db.flush()
+    return new_games
+
+
+def get_schedule_games(db: Session, user_id: int) -> List[ScheduleGameDB]:
+    """
+    Get every game of a user's schedule, played or not
+
+    Args:
+        db: SQLAlchemy database session
+        user_id: User ID
+
+    Returns:
+        List of ScheduleGameDB objects ordered by date
+    """
+    return (
+        db.query(ScheduleGameDB)
+        .filter(ScheduleGameDB.user_id == user_id)
+        .order_by(ScheduleGameDB.game_date, ScheduleGameDB.id)
+        .all()
+    )
+
+
+def get_active_simulation_weights(db: Session) -> Optional[SimulationWeightsDB]:
+    """
+    Get the active version of the fitted simulation effect weights
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        SimulationWeightsDB object if a version is active, None otherwise
+    """
+    return (
+        db.query(SimulationWeightsDB)
+        .filter(SimulationWeightsDB.is_active.is_(True))
+        .order_by(SimulationWeightsDB.version.desc())
+        .first()
+    )
+
+
+def get_completed_game_team_stats(db: Session) -> List[Tuple[GameDB, TeamStatsDB, TeamStatsDB]]:
+    """
+    Get every game with a recorded result together with both teams' stats for that game
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        List of (GameDB, home TeamStatsDB, away TeamStatsDB) tuples
+    """
+    home_stats = aliased(TeamStatsDB)
+    away_stats = aliased(TeamStatsDB)
+    return (
+        db.query(GameDB, home_stats, away_stats)
+        .join(home_stats, and_(home_stats.game_id == GameDB.id, home_stats.team_id == GameDB.home_team_id))
+        .join(away_stats, and_(away_stats.game_id == GameDB.id, away_stats.team_id == GameDB.away_team_id))
+        .filter(GameDB.home_score.isnot(None), GameDB.away_score.isnot(None))
+        .order_by(GameDB.id)
+        .all()
+    )
+
+
 def get_team_analysis_by_team_id(db: Session, team_id: int) -> Optional[TeamAnalysisDB]:
     """
     Get team analysis by team ID
@@ -937,6 +1404,63 @@ def get_game_simulation(db: Session, game_id: int) -> Optional[GameSimulationDB]
 
     return simulation
 
+# Aliases used in the report subqueries; built once so the compiled
+# statements are cached between calls
+_Simulation = aliased(GameSimulationDB)
+_Analysis = aliased(TeamAnalysisDB)
+_SeasonStats = aliased(PlayerStatsDB)
+
+
+def _latest_id(model, key_column, value):
+    """Correlated subquery: highest ID of model with key_column equal to value"""
+    return select(func.max(model.id)).where(key_column == value).scalar_subquery()
+
+
+def _latest_season_stats_id(player_id_column):
+    """Correlated subquery: ID of a player's most recent season-average stats"""
+    return (
+        select(func.max(_SeasonStats.id))
+        .where(_SeasonStats.player_id == player_id_column, _SeasonStats.is_season_average.is_(True))
+        .scalar_subquery()
+    )
+
+
+def _player_projection_response(
+    player_projection: PlayerProjectionDB, player: PlayerDB, player_stats: Optional[PlayerStatsDB]
+) -> PlayerProjectionResponse:
+    """Projection of a player next to their actual season averages"""
+    return PlayerProjectionResponse(
+        name=player.name,
+        number=player.number,
+        is_home_team=player_projection.is_home_team,
+        ppg=player_projection.ppg,
+        rpg=player_projection.rpg,
+        apg=player_projection.apg,
+        fg_pct=player_projection.fg_pct,
+        fg3_pct=player_projection.fg3_pct,
+        role=player_projection.role,
+        strengths=player.strengths,
+        weaknesses=player.weaknesses,
+        actual_ppg=player_stats.ppg if player_stats else None,
+        actual_rpg=player_stats.rpg if player_stats else None,
+        actual_apg=player_stats.apg if player_stats else None,
+        actual_fg_pct=player_stats.fg_pct if player_stats else None,
+        actual_fg3_pct=player_stats.fg3_pct if player_stats else None,
+        actual_ft_pct=player_stats.ft_pct if player_stats else None,
+        actual_spg=player_stats.spg if player_stats else None,
+        actual_bpg=player_stats.bpg if player_stats else None,
+        actual_topg=player_stats.topg if player_stats else None,
+        actual_minutes=player_stats.minutes if player_stats else None,
+        bootstrap_games=player_projection.bootstrap_games,
+        ppg_lower=player_projection.ppg_lower,
+        ppg_upper=player_projection.ppg_upper,
+        rpg_lower=player_projection.rpg_lower,
+        rpg_upper=player_projection.rpg_upper,
+        apg_lower=player_projection.apg_lower,
+        apg_upper=player_projection.apg_upper,
+    )
+
+
 def get_projected_player_for_game(
     db: Session, game_id: int, team_id: int
 ) -> Optional[List[PlayerProjectionResponse]]:
@@ -955,44 +1479,301 @@ def get_projected_player_for_game(
         db.query(PlayerProjectionDB, PlayerDB, PlayerStatsDB)
         .join(PlayerDB, PlayerProjectionDB.player_id == PlayerDB.id)
         .outerjoin(
-            PlayerStatsDB, PlayerProjectionDB.player_id == PlayerStatsDB.player_id
+            PlayerStatsDB, PlayerStatsDB.id == _latest_season_stats_id(PlayerProjectionDB.player_id)
         )
         .filter(
             PlayerProjectionDB.game_id == game_id, PlayerProjectionDB.team_id == team_id
         )
+        .order_by(PlayerProjectionDB.id)
         .all()
     )
 
     if response:
         return [
-            PlayerProjectionResponse(
-                name=player.name,
-                number=player.number,
-                is_home_team=player_projection.is_home_team,
-                ppg=player_projection.ppg,
-                rpg=player_projection.rpg,
-                apg=player_projection.apg,
-                fg_pct=player_projection.fg_pct,
-                fg3_pct=player_projection.fg3_pct,
-                role=player_projection.role,
-                strengths=player.strengths,
-                weaknesses=player.weaknesses,
-                actual_ppg=player_stats.ppg if player_stats else None,
-                actual_rpg=player_stats.rpg if player_stats else None,
-                actual_apg=player_stats.apg if player_stats else None,
-                actual_fg_pct=player_stats.fg_pct if player_stats else None,
-                actual_fg3_pct=player_stats.fg3_pct if player_stats else None,
-                actual_ft_pct=player_stats.ft_pct if player_stats else None,
-                actual_spg=player_stats.spg if player_stats else None,
-                actual_bpg=player_stats.bpg if player_stats else None,
-                actual_topg=player_stats.topg if player_stats else None,
-                actual_minutes=player_stats.minutes if player_stats else None,
-            )
+            _player_projection_response(player_projection, player, player_stats)
             for (player_projection, player, player_stats) in response
         ]
     return None
 
 
+class OverallReport(BaseModel):
+    created_at: datetime.datetime
+    
+    game_uuid: str    
+    game_simulation: GameSimulationResponse
+    
+    team: TeamResponse
+    team_stats: TeamStatsResponse
+    team_analysis: TeamAnalysisResponse
+    team_player_analysis: List[PlayerProjectionResponse]
+
+    opponent: TeamResponse
+    opponent_stats: TeamStatsResponse
+    opponent_analysis: TeamAnalysisResponse
+    opponent_player_analysis: List[PlayerProjectionResponse]
+
+
+class ScoutingReport(BaseModel):
+    created_at: datetime.datetime
+
+    game_uuid: str
+
+    team: TeamResponse
+    team_stats: TeamStatsResponse
+    team_analysis: TeamAnalysisResponse
+
+    opponent: TeamResponse
+    opponent_stats: TeamStatsResponse
+    opponent_analysis: TeamAnalysisResponse
+
+
+def _find_game_sides(db: Session, *criteria):
+    """
+    Load a game, its latest simulation, and both teams with their stats for the game and latest analysis
+
+    Args:
+        db: SQLAlchemy database session
+        criteria: Filters selecting the game, on GameDB and UserDB (its owner)
+
+    Returns:
+        (GameDB, GameSimulationDB or None, (team, stats, analysis) of the home
+        team, (team, stats, analysis) of the away team), or None if no game
+        matches
+    """
+    # One row per team; joining the teams with IN keeps the plan small, where
+    # separate home and away joins made planning dominate the query time
+    rows = (
+        db.query(GameDB, GameSimulationDB, TeamDB, TeamStatsDB, TeamAnalysisDB)
+        .join(UserDB, UserDB.id == GameDB.user_id)
+        .outerjoin(GameSimulationDB, GameSimulationDB.id == _latest_id(_Simulation, _Simulation.game_id, GameDB.id))
+        .join(TeamDB, TeamDB.id.in_([GameDB.home_team_id, GameDB.away_team_id]))
+        .outerjoin(TeamStatsDB, and_(TeamStatsDB.game_id == GameDB.id, TeamStatsDB.team_id == TeamDB.id))
+        .outerjoin(TeamAnalysisDB, TeamAnalysisDB.id == _latest_id(_Analysis, _Analysis.team_id, TeamDB.id))
+        .filter(*criteria)
+        .order_by(TeamStatsDB.id)
+        .all()
+    )
+    if not rows:
+        return None
+    game, game_simulation = rows[0][0], rows[0][1]
+    sides = {}
+    for _, _, team_db, stats_db, analysis_db in rows:
+        sides.setdefault(team_db.id, (team_db, stats_db, analysis_db))
+    return game, game_simulation, sides[game.home_team_id], sides[game.away_team_id]
+
+
+def find_overall_report(db: Session, *criteria) -> Optional[Tuple[GameDB, OverallReport]]:
+    """
+    Load everything shown on a game's report page in two queries
+
+    The first query joins the game, its latest simulation, and both teams
+    with their stats for the game and latest analysis. The second loads the
+    player projections of both teams with each player's latest season-average
+    stats.
+
+    Args:
+        db: SQLAlchemy database session
+        criteria: Filters selecting the game, on GameDB and UserDB (its owner)
+
+    Returns:
+        (GameDB, OverallReport), or None if no game matches or the game's
+        simulation isn't stored yet
+    """
+    found = _find_game_sides(db, *criteria)
+    if not found:
+        return None
+    game, game_simulation, (team, team_stats, team_analysis), (opponent, opponent_stats, opponent_analysis) = found
+    if game_simulation is None:
+        # Still processing: the simulation and the projections are stored together
+        return None
+
+    projections: dict[int, List[PlayerProjectionResponse]] = {game.home_team_id: [], game.away_team_id: []}
+    for player_projection, player, player_stats in (
+        db.query(PlayerProjectionDB, PlayerDB, PlayerStatsDB)
+        .join(PlayerDB, PlayerProjectionDB.player_id == PlayerDB.id)
+        .outerjoin(PlayerStatsDB, PlayerStatsDB.id == _latest_season_stats_id(PlayerProjectionDB.player_id))
+        .filter(PlayerProjectionDB.game_id == game.id)
+        .order_by(PlayerProjectionDB.id)
+    ):
+        projections.setdefault(player_projection.team_id, []).append(
+            _player_projection_response(player_projection, player, player_stats)
+        )
+
+    report = OverallReport(
+        game_uuid=str(game.uuid),
+        created_at=game.created_at,
+        game_simulation=GameSimulationResponse.model_validate(game_simulation, from_attributes=True),
+
+        team=TeamResponse.model_validate(team, from_attributes=True),
+        team_stats=TeamStatsResponse.model_validate(team_stats, from_attributes=True),
+        team_analysis=TeamAnalysisResponse.model_validate(team_analysis, from_attributes=True),
+        team_player_analysis=projections[game.home_team_id],
+
+        opponent=TeamResponse.model_validate(opponent, from_attributes=True),
+        opponent_stats=TeamStatsResponse.model_validate(opponent_stats, from_attributes=True),
+        opponent_analysis=TeamAnalysisResponse.model_validate(opponent_analysis, from_attributes=True),
+        opponent_player_analysis=projections[game.away_team_id],
+    )
+    return game, report
+
+
+def get_overall_report(db: Session, game_uuid: str, user_email: str) -> Optional[OverallReport]:
+    """
+    Build the report of a game owned by the user from the source tables
+
+    Args:
+        db: SQLAlchemy database session
+        game_uuid: Game UUID
+        user_email: Email of the user requesting the report
+
+    Returns:
+        OverallReport, or None if the user has no game with this UUID
+    """
+    found = find_overall_report(db, GameDB.uuid == game_uuid, UserDB.email == user_email)
+    return found[1] if found else None
+
+
+def get_scouting_report(db: Session, game_uuid: str, user_email: str) -> Optional[ScoutingReport]:
+    """
+    Get the team and opponent analysis and stats of a game owned by the user
+
+    These are stored as soon as the game is, so the scouting report can be
+    read while the game is still being simulated.
+
+    Args:
+        db: SQLAlchemy database session
+        game_uuid: Game UUID
+        user_email: Email of the user requesting the report
+
+    Returns:
+        ScoutingReport, or None if the user has no game with this UUID, its
+        analyses and stats aren't stored yet, or the UUID is malformed
+    """
+    try:
+        game_uuid = uuid.UUID(str(game_uuid))
+    except ValueError:
+        return None
+    found = _find_game_sides(db, GameDB.uuid == game_uuid, UserDB.email == user_email)
+    if not found:
+        return None
+    game, _, (team, team_stats, team_analysis), (opponent, opponent_stats, opponent_analysis) = found
+    if None in (team_stats, team_analysis, opponent_stats, opponent_analysis):
+        return None
+    return ScoutingReport(
+        game_uuid=str(game.uuid),
+        created_at=game.created_at,
+        team=TeamResponse.model_validate(team, from_attributes=True),
+        team_stats=TeamStatsResponse.model_validate(team_stats, from_attributes=True),
+        team_analysis=TeamAnalysisResponse.model_validate(team_analysis, from_attributes=True),
+        opponent=TeamResponse.model_validate(opponent, from_attributes=True),
+        opponent_stats=TeamStatsResponse.model_validate(opponent_stats, from_attributes=True),
+        opponent_analysis=TeamAnalysisResponse.model_validate(opponent_analysis, from_attributes=True),
+    )
+
+
+# Bump when OverallReport changes shape; older snapshots are then rebuilt
+REPORT_SNAPSHOT_VERSION = 1
+
+
+def get_report_snapshot(db: Session, game_uuid: str, user_email: str) -> Optional[str]:
+    """
+    Get the current-version report snapshot of a game owned by the user
+
+    Args:
+        db: SQLAlchemy database session
+        game_uuid: Game UUID
+        user_email: Email of the user requesting the report
+
+    Returns:
+        Serialized OverallReport JSON, or None if there is no current snapshot
+    """
+    return db.execute(report_snapshot_statement(game_uuid, user_email)).scalar()
+
+
+def report_snapshot_statement(game_uuid: str, user_email: str, settled_seconds: Optional[int] = None) -> Select:
+    """
+    Current-version report snapshot of a game owned by the user
+
+    With settled_seconds, only a snapshot last written at least that many
+    seconds ago is selected.
+    """
+    statement = (
+        select(ReportSnapshotDB.report)
+        .join(UserDB, UserDB.id == ReportSnapshotDB.user_id)
+        .where(
+            ReportSnapshotDB.game_uuid == game_uuid,
+            ReportSnapshotDB.version == REPORT_SNAPSHOT_VERSION,
+            UserDB.email == user_email,
+        )
+    )
+    if settled_seconds is not None:
+        statement = statement.where(ReportSnapshotDB.updated_at <= func.timezone("utc", func.now()) - datetime.timedelta(seconds=settled_seconds))
+    return statement
+
+
+def recent_report_statement(user_email: str, seconds: int) -> Select:
+    """Any report snapshot of the user's games written in the last seconds"""
+    return (
+        select(ReportSnapshotDB.game_id)
+        .join(UserDB, UserDB.id == ReportSnapshotDB.user_id)
+        .where(
+            UserDB.email == user_email,
+            ReportSnapshotDB.updated_at > func.timezone("utc", func.now()) - datetime.timedelta(seconds=seconds),
+        )
+        .limit(1)
+    )
+
+
+def has_recent_report(db: Session, user_email: str, seconds: int) -> bool:
+    """
+    Whether a game of the user was completed, or its report rewritten, in the last seconds
+
+    Args:
+        db: SQLAlchemy database session
+        user_email: User email
+        seconds: Length of the window
+
+    Returns:
+        True if a report snapshot of the user was written within the window
+    """
+    return db.execute(recent_report_statement(user_email, seconds)).first() is not None
+
+
+def upsert_report_snapshot(db: Session, game: GameDB, report: OverallReport) -> str:
+    """
+    Store the snapshot of a game's report, replacing any older one
+
+    Args:
+        db: SQLAlchemy database session
+        game: Game the report belongs to
+        report: Report to store
+
+    Returns:
+        Serialized OverallReport JSON
+    """
+    report_json = report.model_dump_json()
+    values = {
+        "game_uuid": game.uuid,
+        "game_id": game.id,
+        "user_id": game.user_id,
+        "version": REPORT_SNAPSHOT_VERSION,
+        "report": report_json,
+    }
+    statement = pg_insert(ReportSnapshotDB).values(**values)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[ReportSnapshotDB.game_uuid],
+            set_={
+                "version": statement.excluded.version,
+                "report": statement.excluded.report,
+                "updated_at": func.timezone("utc", func.now()),
+            },
+        )
+    )
+    db.flush()
+    return report_json
+
+
 class ReportSummary(BaseModel):
     game_uuid: str
     home_team_id: int
@@ -1002,38 +1783,134 @@ class ReportSummary(BaseModel):
     created_at: datetime.datetime
 
 
-def get_report_summaries_by_user_id(db: Session, user_id: int) -> List[ReportSummary]:
+class ReportSummaryPage(BaseModel):
+    items: List[ReportSummary]
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+def report_summaries_statement(user_id: int) -> Select:
+    """Report summaries of a user, one row per game with a game analysis report"""
+    return (
+        select(
+            GameDB.id,
+            GameDB.uuid,
+            GameDB.home_team_id,
+            GameDB.away_team_id,
+            _HomeTeam.name.label("home_team"),
+            _AwayTeam.name.label("away_team"),
+            GameDB.created_at,
+            ReportDB.created_at.label("report_created_at"),
+        )
+        .join(ReportDB, and_(ReportDB.game_id == GameDB.id, ReportDB.report_type == "game_analysis"))
+        .join(_HomeTeam, GameDB.home_team_id == _HomeTeam.id)
+        .join(_AwayTeam, GameDB.away_team_id == _AwayTeam.id)
+        .where(GameDB.user_id == user_id)
+    )
+
+
+def report_summary_page(rows: list, next_cursor: Optional[str], total_estimate: Optional[int]) -> ReportSummaryPage:
+    """ReportSummaryPage from rows of report_summaries_statement"""
+    return ReportSummaryPage(
+        items=[
+            ReportSummary(
+                game_uuid=str(row.uuid),
+                home_team_id=row.home_team_id,
+                away_team_id=row.away_team_id,
+                home_team=row.home_team,
+                away_team=row.away_team,
+                created_at=row.report_created_at,
+            )
+            for row in rows
+        ],
+        next_cursor=next_cursor,
+        total_estimate=total_estimate,
+    )
+
+
+def get_report_summaries_by_user_id(db: Session, user_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor: Optional[str] = None) -> ReportSummaryPage:
     """
-    Get report summaries for a user
+    Get a page of report summaries for a user, newest game first
 
     Args:
         db: SQLAlchemy database session
         user_id: User ID to get report summaries for
+        limit: Maximum number of summaries to return, capped at MAX_PAGE_SIZE
+        cursor: next_cursor of the previous page (optional)
 
     Returns:
-        List of ReportSummary objects containing report metadata
+        Page of report summaries; total_estimate is only filled in on the
+        first page
+
+    Raises:
+        ValueError: If the cursor is malformed
     """
-    HomeTeam = aliased(TeamDB)
-    AwayTeam = aliased(TeamDB)
-    
-    response: List[Tuple[ReportDB, GameDB, TeamDB, TeamDB]] = (
-        db.query(ReportDB, GameDB, HomeTeam, AwayTeam)
-        .join(GameDB, ReportDB.game_id == GameDB.id)
-        .join(HomeTeam, GameDB.home_team_id == HomeTeam.id)
-        .join(AwayTeam, GameDB.away_team_id == AwayTeam.id)
-        .filter(GameDB.user_id == user_id, ReportDB.report_type == "game_analysis")
-        .order_by(ReportDB.created_at.desc())
-        .all()
+    statement = report_summaries_statement(user_id)
+    rows, next_cursor = keyset_page(db, statement, GameDB.created_at, GameDB.id, clamp_page_size(limit), cursor)
+    total_estimate = estimate_count(db, statement) if cursor is None else None
+    return report_summary_page(rows, next_cursor, total_estimate)
+
+
+def task_progress_statement(task_uuid: str) -> Select:
+    """Progress of a processing task, with the UUID of its game once there is one"""
+    return (
+        select(ProcessingTaskDB.status, ProcessingTaskDB.step, ProcessingTaskDB.total_steps, GameDB.uuid.label("game_uuid"))
+        .outerjoin(GameDB, GameDB.id == ProcessingTaskDB.game_id)
+        .where(ProcessingTaskDB.task_uuid == task_uuid)
     )
 
-    return [
-        ReportSummary(
-            game_uuid=str(game.uuid),
-            home_team_id=game.home_team_id,
-            away_team_id=game.away_team_id,
-            home_team=home_team.name,
-            away_team=away_team.name,
-            created_at=report.created_at,
+
+def get_task_progress(db: Session, task_uuid: str):
+    """
+    Get the progress of a processing task in a single query
+
+    Args:
+        db: SQLAlchemy database session
+        task_uuid: Task UUID
+
+    Returns:
+        Row of (status, step, total_steps, game_uuid), or None if there is no
+        such task or the UUID is malformed
+    """
+    try:
+        task_uuid = uuid.UUID(str(task_uuid))
+    except ValueError:
+        return None
+    return db.execute(task_progress_statement(task_uuid)).first()
+
+
+def child_task_progress_statement(task_uuid: str) -> Select:
+    """Progress of the child tasks of a batch task, in the order they were created"""
+    parent = aliased(ProcessingTaskDB)
+    return (
+        select(
+            ProcessingTaskDB.task_uuid,
+            ProcessingTaskDB.status,
+            ProcessingTaskDB.step,
+            ProcessingTaskDB.total_steps,
+            GameDB.uuid.label("game_uuid"),
         )
-        for (report, game, home_team, away_team) in response
-    ]
+        .join(parent, parent.id == ProcessingTaskDB.parent_id)
+        .outerjoin(GameDB, GameDB.id == ProcessingTaskDB.game_id)
+        .where(parent.task_uuid == task_uuid)
+        .order_by(ProcessingTaskDB.id)
+    )
+
+
+def get_child_task_progress(db: Session, task_uuid: str) -> list:
+    """
+    Get the progress of every child task of a batch task in a single query
+
+    Args:
+        db: SQLAlchemy database session
+        task_uuid: Task UUID of the batch task
+
+    Returns:
+        Rows of (task_uuid, status, step, total_steps, game_uuid), empty if
+        the task has no children or the UUID is malformed
+    """
+    try:
+        task_uuid = uuid.UUID(str(task_uuid))
+    except ValueError:
+        return []
+    return db.execute(child_task_progress_statement(task_uuid)).all()
@@ -1,7 +1,7 @@
 import datetime
 from typing import Any, List, override
 from pydantic import BaseModel, TypeAdapter
-from sqlalchemy import Column, Dialect, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Date, ARRAY, Text, JSON, TypeDecorator, text, DateTime as SQLDateTime
+from sqlalchemy import Column, Dialect, Integer, String, Boolean, DateTime, ForeignKey, Numeric, Date, ARRAY, Text, JSON, TypeDecorator, UniqueConstraint, Index, text, DateTime as SQLDateTime
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship, declarative_base
 import uuid
@@ -106,7 +106,7 @@ class UserDB(Base):
     __tablename__ = 'users'
     
     id = Column(Integer, primary_key=True)
-    email = Column(String(255), nullable=False)
+    email = Column(String(255), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     phone_number = Column(String(20))
     school = Column(String(100))
@@ -142,9 +142,13 @@ class TeamDB(Base):
 
 class PlayerDB(Base):
     __tablename__ = 'players'
+    # Trigram index for substring and fuzzy name lookups (needs pg_trgm)
+    __table_args__ = (
+        Index('ix_players_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
     
     id = Column(Integer, primary_key=True)
-    team_id = Column(Integer, ForeignKey('teams.id'))
+    team_id = Column(Integer, ForeignKey('teams.id'), index=True)
     name = Column(String(100), nullable=False)
     number = Column(String(10))
     position = Column(String(20))
@@ -177,6 +181,7 @@ class CoachDB(Base):
 
 class GameDB(Base):
     __tablename__ = 'games'
+    __table_args__ = (Index('ix_games_user_id_created_at_id', 'user_id', 'created_at', 'id'),)
     
     id = Column(Integer, primary_key=True)
     uuid = Column(UUID, unique=True, default=uuid.uuid4)
@@ -222,6 +227,10 @@ class PlayerRawStatsDB(Base):
     total_steals = Column(Integer)
     total_blocks = Column(Integer)
     total_turnovers = Column(Integer)
+    # Set for per-game lines (e.g. "Last 5 games"), NULL for season totals
+    game_number = Column(Integer)
+    game_date = Column(String(50))
+    opponent_name = Column(String(100))
     created_at = Column(UTCDateTime, server_default=SERVER_TS)
     updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
     
@@ -232,6 +241,8 @@ class PlayerRawStatsDB(Base):
 
 class TeamStatsDB(Base):
     __tablename__ = 'team_stats'
+    # Also serves "latest row of a team" (ORDER BY id DESC) from the index
+    __table_args__ = (Index('ix_team_stats_team_id_id', 'team_id', 'id'),)
     
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.id'))
@@ -267,7 +278,7 @@ class PlayerStatsDB(Base):
     
     id = Column(Integer, primary_key=True)
     player_raw_stats_id = Column(Integer, ForeignKey('player_raw_stats.id'))
-    player_id = Column(Integer, ForeignKey('players.id'))
+    player_id = Column(Integer, ForeignKey('players.id'), index=True)
     game_id = Column(Integer, ForeignKey('games.id'))
     games_played = Column(Integer)
     ppg = Column(Numeric(5, 1))
@@ -291,6 +302,8 @@ class PlayerStatsDB(Base):
 
 class TeamAnalysisDB(Base):
     __tablename__ = 'team_analysis'
+    # Also serves "latest row of a team" (ORDER BY id DESC) from the index
+    __table_args__ = (Index('ix_team_analysis_team_id_id', 'team_id', 'id'),)
     
     id = Column(Integer, primary_key=True)
     team_id = Column(Integer, ForeignKey('teams.id'))
@@ -314,7 +327,7 @@ class GameSimulationDB(Base):
     __tablename__ = 'game_simulations'
     
     id = Column(Integer, primary_key=True)
-    game_id = Column(Integer, ForeignKey('games.id'))
+    game_id = Column(Integer, ForeignKey('games.id'), index=True)
     win_probability = Column(String(100))
     projected_score = Column(String(100))
     sim_overall_summary = Column(Text)
@@ -329,6 +342,8 @@ class GameSimulationDB(Base):
     playbook_special_situations: list[PlaybookPlay] = Column(PydanticType(PlaybookPlay, is_list=True))
     playbook_inbound_plays: list[PlaybookPlay] = Column(PydanticType(PlaybookPlay, is_list=True))
     playbook_after_timeout_special_plays: list[PlaybookPlay] = Column(PydanticType(PlaybookPlay, is_list=True))
+    model_name = Column(String(100))
+    prompt_version = Column(String(20))
     created_at = Column(UTCDateTime, server_default=SERVER_TS)
     updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
     
@@ -339,6 +354,7 @@ class GameSimulationDB(Base):
 
 class PlayerProjectionDB(Base):
     __tablename__ = 'player_projections'
+    __table_args__ = (Index('ix_player_projections_game_id_team_id', 'game_id', 'team_id'),)
     
     id = Column(Integer, primary_key=True)
     game_simulation_id = Column(Integer, ForeignKey('game_simulations.id'))
@@ -352,6 +368,14 @@ class PlayerProjectionDB(Base):
     fg_pct = Column(String(10))
     fg3_pct = Column(String(10))
     role = Column(String(100))
+    # Bootstrap 90% bands from the player's per-game lines
+    bootstrap_games = Column(Integer)
+    ppg_lower = Column(Numeric(5, 1))
+    ppg_upper = Column(Numeric(5, 1))
+    rpg_lower = Column(Numeric(5, 1))
+    rpg_upper = Column(Numeric(5, 1))
+    apg_lower = Column(Numeric(5, 1))
+    apg_upper = Column(Numeric(5, 1))
     created_at = Column(UTCDateTime, server_default=SERVER_TS)
     updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
     
@@ -378,6 +402,15 @@ class SimulationDetailsDB(Base):
     blowout_game_margin = Column(Integer)
     margin_distribution = Column(JSONB)
     avg_effects = Column(JSONB)
+    score_distribution = Column(JSONB)
+    margin_stats = Column(JSONB)
+    margin_histogram = Column(JSONB)
+    effect_stats = Column(JSONB)
+    # 95% confidence intervals reached by the adaptive simulation
+    home_win_pct_ci_lower = Column(Numeric(5, 1))
+    home_win_pct_ci_upper = Column(Numeric(5, 1))
+    margin_ci_lower = Column(Numeric(5, 1))
+    margin_ci_upper = Column(Numeric(5, 1))
     created_at = Column(UTCDateTime, server_default=SERVER_TS)
     updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
     
@@ -386,6 +419,7 @@ class SimulationDetailsDB(Base):
 
 class ReportDB(Base):
     __tablename__ = 'reports'
+    __table_args__ = (Index('ix_reports_game_id_report_type', 'game_id', 'report_type'),)
     
     id = Column(Integer, primary_key=True)
     uuid = Column(UUID, unique=True, default=uuid.uuid4)
@@ -417,11 +451,89 @@ class ProcessingTaskDB(Base):
     
     game_id = Column(Integer, ForeignKey('games.id'), nullable=True)
     team_id = Column(Integer, ForeignKey('teams.id'), nullable=True)
+    # Batch task the task is one opponent of; a batch task has no opponent file
+    parent_id = Column(Integer, ForeignKey('processing_tasks.id'), nullable=True, index=True)
     
     status = Column(String(50), nullable=False)
     team_file_path = Column(String(255), nullable=True)
-    opponent_file_path = Column(String(255), nullable=False)
+    opponent_file_path = Column(String(255), nullable=True)
+    team_file_sha256 = Column(String(64), nullable=True)
+    opponent_file_sha256 = Column(String(64), nullable=True)
     step = Column(Integer, nullable=False, default=0)
     total_steps = Column(Integer, nullable=False, default=8)
+    commit_count = Column(Integer)
+    created_at = Column(UTCDateTime, server_default=SERVER_TS)
+    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
+
+class LeagueMatrixDB(Base):
+    __tablename__ = 'league_matrices'
+
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUID, unique=True, default=uuid.uuid4)
+    user_id = Column(Integer, ForeignKey('users.id'))
+    name = Column(String(100))
+    team_ids = Column(ARRAY(Integer), nullable=False)
+    team_vectors = Column(JSONB)
+    num_simulations = Column(Integer)
+    win_probabilities = Column(JSONB)
+    rankings = Column(JSONB)
+    created_at = Column(UTCDateTime, server_default=SERVER_TS)
+    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
+
+class BacktestResultDB(Base):
+    __tablename__ = 'backtest_results'
+    __table_args__ = (UniqueConstraint('model_name', 'prompt_version'),)
+
+    id = Column(Integer, primary_key=True)
+    model_name = Column(String(100), nullable=False)
+    prompt_version = Column(String(20), nullable=False)
+    num_games = Column(Integer)
+    results_fingerprint = Column(String(32))
+    brier_score = Column(Numeric(6, 4))
+    win_accuracy = Column(Numeric(5, 1))
+    margin_mae = Column(Numeric(6, 2))
+    margin_rmse = Column(Numeric(6, 2))
+    margin_bias = Column(Numeric(6, 2))
+    calibration = Column(JSONB)
+    created_at = Column(UTCDateTime, server_default=SERVER_TS)
+    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
+
+class ScheduleGameDB(Base):
+    __tablename__ = 'schedule_games'
+
+    id = Column(Integer, primary_key=True)
+    uuid = Column(UUID, unique=True, default=uuid.uuid4)
+    user_id = Column(Integer, ForeignKey('users.id'), index=True)
+    home_team_id = Column(Integer, ForeignKey('teams.id'), nullable=False)
+    away_team_id = Column(Integer, ForeignKey('teams.id'), nullable=False)
+    game_date = Column(Date)
+    home_score = Column(Integer)
+    away_score = Column(Integer)
     created_at = Column(UTCDateTime, server_default=SERVER_TS)
-    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
\ No newline at end of file
+    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
+
+class SimulationWeightsDB(Base):
+    __tablename__ = 'simulation_weights'
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, unique=True, nullable=False)
+    weights = Column(JSONB, nullable=False)
+    regularization = Column(Numeric(8, 3))
+    num_games = Column(Integer)
+    rmse = Column(Numeric(6, 2))
+    is_active = Column(Boolean, default=False)
+    created_at = Column(UTCDateTime, server_default=SERVER_TS)
+    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
+
+class ReportSnapshotDB(Base):
+    __tablename__ = 'report_snapshots'
+    __table_args__ = (Index('ix_report_snapshots_user_id_updated_at', 'user_id', 'updated_at'),)
+
+    # Serialized OverallReport of a finished game, served as is
+    game_uuid = Column(UUID, primary_key=True)
+    game_id = Column(Integer, ForeignKey('games.id'), unique=True, nullable=False)
+    user_id = Column(Integer, ForeignKey('users.id'), nullable=False)
+    version = Column(Integer, nullable=False)
+    report = Column(Text, nullable=False)
+    created_at = Column(UTCDateTime, server_default=SERVER_TS)
+    updated_at = Column(UTCDateTime, server_default=SERVER_TS, server_onupdate=SERVER_TS)
@@ -0,0 +1,149 @@
+import base64
+import datetime
+import json
+from typing import Optional, Tuple
+
+from sqlalchemy import Select, func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Totals up to this many rows are counted exactly, larger ones are estimated
+EXACT_COUNT_LIMIT = 1000
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """Page size within 1..MAX_PAGE_SIZE, DEFAULT_PAGE_SIZE if not given"""
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(created_at: datetime.datetime, row_id: int) -> str:
+    """
+    Opaque cursor pointing after a row of a (created_at, id) ordered listing
+
+    Args:
+        created_at: Creation time of the last row of the page
+        row_id: ID of the last row of the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, int]:
+    """
+    Position encoded by encode_cursor
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (created_at, id) of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(payload)
+        return datetime.datetime.fromisoformat(created_at), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _keyset_statement(statement: Select, created_at_column, id_column, limit: int, cursor: Optional[str]) -> Select:
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        statement = statement.where(tuple_(created_at_column, id_column) < tuple_(created_at, row_id))
+    # One extra row tells whether there is a next page
+    return statement.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def _page(rows: list, created_at_column, id_column, limit: int) -> Tuple[list, Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last._mapping[created_at_column], last._mapping[id_column])
+
+
+def keyset_page(db: Session, statement: Select, created_at_column, id_column, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """
+    One page of a select, newest first, using keyset pagination on (created_at, id)
+
+    The page starts right after the cursor's row, so the cost of a page does
+    not depend on how deep into the listing it is.
+
+    Args:
+        db: SQLAlchemy database session
+        statement: Select to paginate, without ORDER BY or LIMIT, selecting
+            both ordering columns
+        created_at_column: Creation time column of the ordering
+        id_column: ID column breaking ties between equal creation times
+        limit: Page size, already clamped
+        cursor: Cursor of the previous page, None for the first page
+
+    Returns:
+        (rows, cursor of the next page or None on the last page)
+    """
+    rows = db.execute(_keyset_statement(statement, created_at_column, id_column, limit, cursor)).all()
+    return _page(rows, created_at_column, id_column, limit)
+
+
+async def async_keyset_page(db: AsyncSession, statement: Select, created_at_column, id_column, limit: int, cursor: Optional[str] = None) -> Tuple[list, Optional[str]]:
+    """keyset_page on an async session"""
+    rows = (await db.execute(_keyset_statement(statement, created_at_column, id_column, limit, cursor))).all()
+    return _page(rows, created_at_column, id_column, limit)
+
+
+def _count_statement(statement: Select, exact_limit: int) -> Select:
+    return select(func.count()).select_from(statement.limit(exact_limit + 1).subquery())
+
+
+def _explain_statement(statement: Select):
+    # Parameters are rendered inline so the same text runs on either driver
+    compiled = statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    return text(f"EXPLAIN (FORMAT JSON) {compiled}")
+
+
+def _plan_rows(plan, exact_limit: int) -> int:
+    # psycopg2 decodes the JSON plan, asyncpg returns it as text
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return max(exact_limit + 1, int(plan[0]["Plan"]["Plan Rows"]))
+
+
+def estimate_count(db: Session, statement: Select, exact_limit: int = EXACT_COUNT_LIMIT) -> int:
+    """
+    Number of rows of a select, exact for small results and estimated for large ones
+
+    Up to exact_limit rows are counted; past that, the planner's row estimate
+    is used so the cost stays flat however many rows match.
+
+    Args:
+        db: SQLAlchemy database session
+        statement: Select to count
+        exact_limit: Largest total counted exactly
+
+    Returns:
+        Row count, or an estimate of at least exact_limit + 1
+    """
+    counted = db.execute(_count_statement(statement, exact_limit)).scalar()
+    if counted <= exact_limit:
+        return counted
+    return _plan_rows(db.execute(_explain_statement(statement)).scalar(), exact_limit)
+
+
+async def async_estimate_count(db: AsyncSession, statement: Select, exact_limit: int = EXACT_COUNT_LIMIT) -> int:
+    """estimate_count on an async session"""
+    counted = (await db.execute(_count_statement(statement, exact_limit))).scalar()
+    if counted <= exact_limit:
+        return counted
+    return _plan_rows((await db.execute(_explain_statement(statement))).scalar(), exact_limit)
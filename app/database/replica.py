@@ -0,0 +1,47 @@
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import Config
+from app.database import async_connection
+from app.database.common import replica_configured
+from app.database.connection import has_recent_report
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+def read_session_for_user(db: Session, read_db: Session, user_email: str) -> Session:
+    """
+    Session to run a user's dashboard reads on
+
+    Reads go to the replica, except for users with a game completed within
+    the lag guard (DB_REPLICA_LAG_GUARD_SECONDS): the replica may not have
+    caught up with it yet, so their reads stay on the primary. Without a
+    replica, the primary session is used.
+
+    Args:
+        db: Session on the primary
+        read_db: Session on the read replica
+        user_email: Email of the user the reads are for
+
+    Returns:
+        db or read_db
+    """
+    if not replica_configured():
+        return db
+    if has_recent_report(db, user_email, Config().db_replica_lag_guard_seconds):
+        logger.debug(f"Recently completed game, reading from the primary for {user_email}")
+        return db
+    return read_db
+
+
+async def async_read_session_for_user(db: AsyncSession, read_db: AsyncSession, user_email: str) -> AsyncSession:
+    """read_session_for_user for async sessions"""
+    if not replica_configured():
+        return db
+    if await async_connection.has_recent_report(db, user_email, Config().db_replica_lag_guard_seconds):
+        logger.debug(f"Recently completed game, reading from the primary for {user_email}")
+        return db
+    return read_db
@@ -0,0 +1,107 @@
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Commits made so far by every unit of work of a task, keyed by task UUID.
+# A task can use several sessions (e.g. one per team analysis thread).
+_task_commits: Counter = Counter()
+_task_commits_lock = threading.Lock()
+
+
+class UnitOfWork:
+    """
+    Transaction boundaries for a multi-step job on a single session
+
+    The insert and update helpers in app.database.connection only flush; a job
+    wraps each logical step in step() so the step's writes are committed
+    together, or not at all. Parts of a step that may fail without spoiling
+    the rest run inside savepoint(). Every commit made on the session is
+    counted, including ones made by services the job calls, both per unit of
+    work and per task.
+    """
+
+    def __init__(self, db: Session, task_uuid: Optional[str] = None):
+        self.db = db
+        self.task_uuid = task_uuid
+        self.commit_count = 0
+        event.listen(db, "after_commit", self._count_commit)
+
+    def _count_commit(self, session: Session):
+        # Releasing a savepoint fires after_commit too, but is not a commit
+        if session.in_nested_transaction():
+            return
+        self.commit_count += 1
+        if self.task_uuid is not None:
+            with _task_commits_lock:
+                _task_commits[self.task_uuid] += 1
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def task_commit_count(self) -> int:
+        """Commits made so far by every unit of work of this task"""
+        with _task_commits_lock:
+            return _task_commits[self.task_uuid]
+
+    @contextmanager
+    def step(self, name: str):
+        """
+        Run one logical step and commit it
+
+        Args:
+            name: Step name, used in logs
+
+        Raises:
+            Whatever the step raised, after rolling back everything it wrote
+        """
+        try:
+            yield self.db
+            self.db.commit()
+        except Exception:
+            logger.error(f"Step '{name}' failed, rolling back")
+            self.db.rollback()
+            raise
+
+    @contextmanager
+    def savepoint(self, name: str):
+        """
+        Run part of a step inside a savepoint
+
+        An error inside the block is logged and only the writes made since the
+        savepoint are rolled back; the step carries on.
+
+        Args:
+            name: Name of the part, used in logs
+        """
+        savepoint = self.db.begin_nested()
+        try:
+            yield self.db
+            savepoint.commit()
+        except Exception as e:
+            logger.warning(f"Rolled back '{name}': {e}")
+            savepoint.rollback()
+
+    def close(self, finished: bool = False):
+        """
+        Stop counting commits on the session
+
+        Args:
+            finished: The task is over, so its shared commit count is dropped
+        """
+        if event.contains(self.db, "after_commit", self._count_commit):
+            event.remove(self.db, "after_commit", self._count_commit)
+        if finished and self.task_uuid is not None:
+            with _task_commits_lock:
+                _task_commits.pop(self.task_uuid, None)
@@ -15,8 +15,8 @@ export default function ReportSummaries() {
 
     return (
         <Stack>
-            {reportSummaries.data?.map((summary) => (
-                <Card key={summary.id}>
+            {reportSummaries.data?.pages.flatMap((page) => page.items).map((summary) => (
+                <Card key={summary.game_uuid}>
                     <Group justify="space-between" align="start">
                         <Stack gap={4}>
                             <Text fw={600} fz={22}>{summary.home_team} vs {summary.away_team}</Text>
@@ -29,6 +29,9 @@ export default function ReportSummaries() {
                     </Group>
                 </Card>
             ))}
+            {reportSummaries.hasNextPage && (
+                <Button {...outlineButtonProps} size='sm' onClick={() => reportSummaries.fetchNextPage()} loading={reportSummaries.isFetchingNextPage}>Load more</Button>
+            )}
         </Stack>
     )
 }
\ No newline at end of file
@@ -1,5 +1,14 @@
 // This file is auto-generated by @hey-api/openapi-ts
 
+export type BodyUploadBatchApiTaskUploadBatchPost = {
+    team_uuid?: string | null;
+    team_files?: (Blob | File) | null;
+    team_name?: string | null;
+    opponent_files: Array<Blob | File>;
+    opponent_names: Array<string>;
+    use_local_simulation?: boolean | null;
+};
+
 export type BodyUploadFilesApiTaskUploadPost = {
     team_uuid?: string | null;
     team_files?: (Blob | File) | null;
@@ -98,6 +107,8 @@ export type ProcessingTaskResponse = {
     current_step: number;
     total_steps: number;
     game_uuid?: string | null;
+    ready_sections?: Array<'scouting' | 'simulation' | 'report'>;
+    children?: Array<ProcessingTaskResponse>;
 };
 
 export type ReportSummary = {
@@ -109,6 +120,12 @@ export type ReportSummary = {
     created_at: string;
 };
 
+export type ReportSummaryPage = {
+    items: Array<ReportSummary>;
+    next_cursor?: string | null;
+    total_estimate?: number | null;
+};
+
 export type ResetPasswordRequest = {
     email: string;
     otp: string;
@@ -116,6 +133,17 @@ export type ResetPasswordRequest = {
     confirm_password: string;
 };
 
+export type ScoutingReport = {
+    created_at: string;
+    game_uuid: string;
+    team: TeamResponse;
+    team_stats: TeamStatsResponse;
+    team_analysis: TeamAnalysisResponse;
+    opponent: TeamResponse;
+    opponent_stats: TeamStatsResponse;
+    opponent_analysis: TeamAnalysisResponse;
+};
+
 export type SituationalAdjustment = {
     scenario: string;
     adjustment: string;
@@ -169,6 +197,12 @@ export type TokenResponse = {
     expires_at: string;
 };
 
+export type UploadBatchResponse = {
+    task_id: string;
+    child_task_ids: Array<string>;
+    status: 'processing' | 'completed' | 'failed';
+};
+
 export type UploadProcessResponse = {
     task_id: string;
     status: 'processing' | 'completed' | 'failed';
@@ -264,6 +298,35 @@ export type UploadFilesApiTaskUploadPostResponses = {
 
 export type UploadFilesApiTaskUploadPostResponse = UploadFilesApiTaskUploadPostResponses[keyof UploadFilesApiTaskUploadPostResponses];
 
+export type UploadBatchApiTaskUploadBatchPostData = {
+    body: BodyUploadBatchApiTaskUploadBatchPost;
+    path?: never;
+    query?: never;
+    url: '/api/task/upload-batch';
+};
+
+export type UploadBatchApiTaskUploadBatchPostErrors = {
+    /**
+     * Not found
+     */
+    404: unknown;
+    /**
+     * Validation Error
+     */
+    422: HttpValidationError;
+};
+
+export type UploadBatchApiTaskUploadBatchPostError = UploadBatchApiTaskUploadBatchPostErrors[keyof UploadBatchApiTaskUploadBatchPostErrors];
+
+export type UploadBatchApiTaskUploadBatchPostResponses = {
+    /**
+     * Successful Response
+     */
+    200: UploadBatchResponse;
+};
+
+export type UploadBatchApiTaskUploadBatchPostResponse = UploadBatchApiTaskUploadBatchPostResponses[keyof UploadBatchApiTaskUploadBatchPostResponses];
+
 export type GetStatusApiTaskStatusTaskIdGetData = {
     body?: never;
     path: {
@@ -630,7 +693,7 @@ export type GetReportSummariesApiReportSummariesGetResponses = {
     /**
      * Successful Response
      */
-    200: Array<ReportSummary>;
+    200: ReportSummaryPage;
 };
 
 export type GetReportSummariesApiReportSummariesGetResponse = GetReportSummariesApiReportSummariesGetResponses[keyof GetReportSummariesApiReportSummariesGetResponses];
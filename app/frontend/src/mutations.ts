@@ -1,7 +1,7 @@
-import { QueryClient, useMutation, useQuery } from '@tanstack/react-query';
-import { BodyUploadFilesApiTaskUploadPost, LatestTeamAnalysis, OverallReport, ProcessingTaskResponse, ReportSummary, ResetPasswordRequest, UploadProcessResponse, UserBase, UserConfirm, UserCreate, UserLogin } from './generated/client';
+import { QueryClient, useInfiniteQuery, useMutation, useQuery } from '@tanstack/react-query';
+import { BodyUploadBatchApiTaskUploadBatchPost, BodyUploadFilesApiTaskUploadPost, LatestTeamAnalysis, OverallReport, ProcessingTaskResponse, ReportSummaryPage, ResetPasswordRequest, ScoutingReport, UploadBatchResponse, UploadProcessResponse, UserBase, UserConfirm, UserCreate, UserLogin } from './generated/client';
 import { errorNotification } from './common/notifications';
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
 
 export const queryClient = new QueryClient();
 
@@ -130,27 +130,78 @@ export const useUpload = () => {
     return { upload };
 };
 
+export const useBatchUpload = () => {
+    const uploadBatch = useMutation({
+        mutationFn: async (data: BodyUploadBatchApiTaskUploadBatchPost) => {
+            const formData = new FormData();
+            if (data.team_files) formData.append('team_files', data.team_files);
+            data.opponent_files.forEach((file) => formData.append('opponent_files', file));
+            data.opponent_names.forEach((name) => formData.append('opponent_names', name));
+            if (data.team_uuid) formData.append('team_uuid', data.team_uuid);
+            if (data.team_name) formData.append('team_name', data.team_name);
+            if (data.use_local_simulation !== undefined) {
+                formData.append('use_local_simulation', data.use_local_simulation.toString());
+            }
+
+            return await processedFetch<UploadBatchResponse>("/task/upload-batch", {
+                method: "POST",
+                body: formData,
+            });
+        },
+    });
+    return { uploadBatch };
+};
+
 export const useAnalysis = ({ task_id }: { task_id: string }) => {
-    const [analysis, setAnalysis] = useState<ProcessingTaskResponse | null>(null);
+    // Progress is pushed over server-sent events; polling is only the fallback
+    // for when the stream can't be opened
+    const [streaming, setStreaming] = useState(false);
+    useEffect(() => {
+        if (!task_id) {
+            return;
+        }
+        const events = new EventSource("/api/task/events/" + task_id);
+        events.onopen = () => setStreaming(true);
+        events.onmessage = (message) => {
+            const progress: ProcessingTaskResponse = JSON.parse(message.data);
+            queryClient.setQueryData(["analysis", task_id], progress);
+            if (progress.status !== "processing") {
+                events.close();
+            }
+        };
+        events.onerror = () => {
+            if (events.readyState === EventSource.CLOSED) {
+                setStreaming(false);
+            }
+        };
+        return () => events.close();
+    }, [task_id]);
+
     const status = useQuery({
         queryKey: ["analysis", task_id],
-        queryFn: async () => {
-            const response = await processedFetch<ProcessingTaskResponse>("/task/status/" + task_id);
-            setAnalysis(response);
-            return response;
-        },
+        queryFn: async () => await processedFetch<ProcessingTaskResponse>("/task/status/" + task_id),
         enabled: !!task_id,
-        refetchInterval: (data) => {
-            if(data.state?.error?.cause === 404) {
+        refetchInterval: (query) => {
+            if (query.state?.error?.cause === 404 || streaming) {
                 return false
             }
-            return analysis == null || analysis.status == "processing" ? 2000 : false;
+            return query.state.data == null || query.state.data.status == "processing" ? 2000 : false;
         },
         retryDelay: 2000
     });
     return { status };
 };
 
+export const useScoutingReport = ({ game_uuid, enabled }: { game_uuid?: string | null, enabled: boolean }) => {
+    const scoutingReport = useQuery({
+        queryKey: ["scouting", game_uuid],
+        queryFn: async () => await processedFetch<ScoutingReport>("/report/" + game_uuid + "/scouting"),
+        enabled: enabled && !!game_uuid,
+    });
+
+    return { scoutingReport };
+};
+
 export const useReport = ({ game_uuid }: { game_uuid: string }) => {
     const overallReport = useQuery({
         queryKey: ["report", game_uuid],
@@ -184,9 +235,13 @@ export const useDownloadReport = () => {
 };
 
 export const useReportSummaries = () => {
-    const reportSummaries = useQuery({
+    const reportSummaries = useInfiniteQuery({
         queryKey: ["report-summaries"],
-        queryFn: async () => await processedFetch<ReportSummary[]>("/report/summaries"),
+        queryFn: async ({ pageParam }) => await processedFetch<ReportSummaryPage>(
+            pageParam ? `/report/summaries?cursor=${encodeURIComponent(pageParam)}` : "/report/summaries"
+        ),
+        initialPageParam: null as string | null,
+        getNextPageParam: (lastPage) => lastPage.next_cursor ?? null,
     });
     return { reportSummaries };
 };
@@ -1,7 +1,8 @@
 import { useParams } from "react-router-dom";
-import { useAnalysis } from "../../mutations";
-import { Container, Loader, Stack, Text, Title } from "@mantine/core";
+import { useAnalysis, useScoutingReport } from "../../mutations";
+import { Container, Divider, Loader, Stack, Text, Title } from "@mantine/core";
 import Header from "../../components/dashboard/Header";
+import TeamAnalysis from "../../components/dashboard/game/TeamAnalysis";
 import { useEffect } from "react";
 import { Head } from "vite-react-ssg";
 
@@ -9,6 +10,11 @@ export default function Task() {
     const searchParams = new URLSearchParams(window.location.search);
     const task_id = searchParams.get('task_id');
     const { status } = useAnalysis({ task_id: task_id as string })
+    // The scouting material can be read while the game is still being simulated
+    const { scoutingReport } = useScoutingReport({
+        game_uuid: status.data?.game_uuid,
+        enabled: !!status.data?.ready_sections?.includes("scouting"),
+    });
 
     useEffect(() => {
         if (status.data?.status === "completed" && status.data?.game_uuid) {
@@ -31,6 +37,11 @@ export default function Task() {
                     <Text>{status.data?.step_description}</Text>
                 </Stack>
             </Stack>
+
+            {scoutingReport.data && <>
+                <Divider my='lg' />
+                <TeamAnalysis isScouting={true} team={scoutingReport.data.opponent} teamAnalysis={scoutingReport.data.opponent_analysis} teamStats={scoutingReport.data.opponent_stats} playerStats={[]} />
+            </>}
         </Container>
     </>;
 }
\ No newline at end of file
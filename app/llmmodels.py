@@ -31,6 +31,26 @@ class PlayerStats(BaseModel):
     OREB: int
     DREB: int
 
+class PlayerGameLine(BaseModel):
+    game_date: Optional[str] = None
+    opponent: Optional[str] = None
+    MINS: Optional[float] = None
+    FGM: int = 0
+    FGA: int = 0
+    FGM2: int = 0
+    FGA2: int = 0
+    FGM3: int = 0
+    FGA3: int = 0
+    FTM: int = 0
+    FTA: int = 0
+    AST: int = 0
+    TO: int = 0
+    STL: int = 0
+    BLK: int = 0
+    REB: int = 0
+    OREB: int = 0
+    DREB: int = 0
+
 class Player(BaseModel):
     name: str
     number: str
@@ -39,6 +59,7 @@ class Player(BaseModel):
     weight: Optional[str] = None
     year: Optional[str] = None
     stats: PlayerStats
+    game_lines: List[PlayerGameLine] = Field(default_factory=list, description="One entry per game when the PDF has per-game lines (e.g. 'Last 5 games')")
     strengths: List[str]
     weaknesses: List[str]
 
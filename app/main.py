@@ -6,8 +6,11 @@ from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, Redirect
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from app.routers import auth, report, upload, team
+from app.routers import auth, report, upload, team, simulation, backtest
 from app.config import Config
+from app.database.common import database_context, dispose_async_engine
+from app.services.effect_weights import load_active_effect_weights
+from app.services.task_events import task_event_hub
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -47,6 +50,22 @@ async def startup_event():
     logger.info(f"Base directory: {root}")
     logger.info(f"Static directory: {static_dir}")
     logger.info(f"Static directory exists: {static_dir.exists()}")
+
+    # Use the active fitted weights in the local simulation engine
+    try:
+        with database_context() as db:
+            load_active_effect_weights(db)
+    except Exception as e:
+        logger.error(f"Could not load simulation weights, using defaults: {e}")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Close the async database connections when the application stops
+    """
+    await task_event_hub.close()
+    await dispose_async_engine()
     
 # Mount static files with absolute path
 
@@ -84,6 +103,8 @@ app.include_router(upload.router, prefix="/api")
 app.include_router(auth.router, prefix="/api")
 app.include_router(report.router, prefix="/api")
 app.include_router(team.router, prefix="/api")
+app.include_router(simulation.router, prefix="/api")
+app.include_router(backtest.router, prefix="/api")
 
 def get_version_date():
     """
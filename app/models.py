@@ -83,3 +83,10 @@ class PlayerProjectionResponse(BaseModel):
     actual_bpg: float
     actual_topg: float
     actual_minutes: float
+    bootstrap_games: Optional[int] = None
+    ppg_lower: Optional[float] = None
+    ppg_upper: Optional[float] = None
+    rpg_lower: Optional[float] = None
+    rpg_upper: Optional[float] = None
+    apg_lower: Optional[float] = None
+    apg_upper: Optional[float] = None
@@ -5,15 +5,17 @@ import bcrypt
 import datetime
 from pydantic import BaseModel, EmailStr, constr
 from jose import jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database.common import get_db
+from app.database import async_connection
+from app.database.common import get_async_db, get_db
 from app.routers.util import get_verified_user_email
 from app.services.email import send_reset_password_email, send_verify_email
 from app.config import Config
 
 
 from app.database.connection import (
-    confirm_user, create_user, delete_otp, get_public_user_by_email, get_user_by_email, update_user_password,
+    confirm_user, create_user, delete_otp, get_user_by_email, update_user_password,
     create_otp, verify_otp
 )
 
@@ -171,6 +173,7 @@ async def confirm_email(data: UserConfirm, db: Session = Depends(get_db)):
     
     confirm_user(db, user.id)
     delete_otp(db, user.id, data.code)
+    db.commit()
 
     token = jwt.encode(
         {"sub": data.email, "exp": datetime.datetime.now() + datetime.timedelta(days=7)},
@@ -254,6 +257,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     # Generate unique token for email confirmation
     unique_token = ''.join(random.choices('0123456789', k=6))
     create_otp(db, user_id, unique_token)
+    db.commit()
 
     # Send email with unique token
     send_verify_email(user_data.email, unique_token, config)
@@ -274,6 +278,7 @@ async def forgot_password(payload:ForgotPasswordRequest, db: Session = Depends(g
     # Generate reset token
     reset_token = ''.join(random.choices('0123456789', k=6))
     create_otp(db, user.id, reset_token)
+    db.commit()
     
     # Store reset token in database
     send_reset_password_email(payload.email, reset_token, config)
@@ -325,16 +330,17 @@ async def reset_password(
     update_user_password(db, user.id, password_hash)
 
     delete_otp(db, user.id, reset_password_request.otp)
+    db.commit()
     
     return MessageResponse(
         detail="Password reset successful! You can now log in with your new password."
     )
 
 @router.get("/me", response_model=UserBase)
-async def get_me(user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+async def get_me(user_email: str = Depends(get_verified_user_email), db: AsyncSession = Depends(get_async_db)):
     """Get the current user"""
-    user = get_public_user_by_email(db, user_email)
+    user = await async_connection.get_public_user_by_email(db, user_email)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
-    return UserBase.model_validate(user.__dict__)
+    return UserBase.model_validate(user._asdict())
 
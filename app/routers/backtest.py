@@ -0,0 +1,112 @@
+import datetime
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+from app.config import Config
+from app.database.common import get_db
+from app.database.connection import get_game_by_uuid, get_user_by_email
+from app.database.models import BacktestResultDB
+from app.routers.util import get_verified_user_email
+from app.services.backtest import run_backtest_job
+
+
+config = Config()
+
+router = APIRouter(
+    prefix="/backtest",
+    tags=["backtest"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+class GameResultRequest(BaseModel):
+    home_score: int = Field(..., ge=0)
+    away_score: int = Field(..., ge=0)
+
+
+class GameResultResponse(BaseModel):
+    game_uuid: str
+    home_score: int
+    away_score: int
+    status: str
+
+
+class CalibrationBin(BaseModel):
+    bin_lower: float
+    bin_upper: float
+    count: int
+    predicted: float
+    observed: float
+
+
+class BacktestResult(BaseModel):
+    model_name: str
+    prompt_version: str
+    num_games: int
+    brier_score: Optional[float]
+    win_accuracy: Optional[float]
+    margin_mae: Optional[float]
+    margin_rmse: Optional[float]
+    margin_bias: Optional[float]
+    calibration: List[CalibrationBin]
+    updated_at: Optional[datetime.datetime]
+
+
+class BacktestJobResponse(BaseModel):
+    detail: str
+
+
+@router.put("/games/{game_uuid}/result", response_model=GameResultResponse)
+def record_game_result(game_uuid: str, result: GameResultRequest, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Record the final score of a game so its projection can be backtested
+    """
+    user = get_user_by_email(db, user_email)
+    game = get_game_by_uuid(db, game_uuid)
+    if not game or game.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    game.home_score = result.home_score
+    game.away_score = result.away_score
+    game.status = "completed"
+    db.commit()
+
+    return GameResultResponse(
+        game_uuid=str(game.uuid),
+        home_score=game.home_score,
+        away_score=game.away_score,
+        status=game.status,
+    )
+
+
+@router.post("/run", response_model=BacktestJobResponse, status_code=202)
+def run_backtest(background_tasks: BackgroundTasks, user_email: str = Depends(get_verified_user_email)):
+    """
+    Start a backtest of every stored projection against recorded results
+    """
+    background_tasks.add_task(run_backtest_job)
+    return BacktestJobResponse(detail="Backtest started")
+
+
+@router.get("", response_model=List[BacktestResult])
+def get_backtest_results(user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Latest backtest metrics per model and prompt version
+    """
+    results = db.query(BacktestResultDB).order_by(BacktestResultDB.model_name, BacktestResultDB.prompt_version).all()
+    return [
+        BacktestResult(
+            model_name=result.model_name,
+            prompt_version=result.prompt_version,
+            num_games=result.num_games or 0,
+            brier_score=result.brier_score,
+            win_accuracy=result.win_accuracy,
+            margin_mae=result.margin_mae,
+            margin_rmse=result.margin_rmse,
+            margin_bias=result.margin_bias,
+            calibration=result.calibration or [],
+            updated_at=result.updated_at,
+        )
+        for result in results
+    ]
@@ -1,14 +1,25 @@
-import datetime
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, Field
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.config import Config
-from app.database.common import get_db
-from app.database.connection import ReportSummary, get_game_by_uuid, get_game_simulation, get_projected_player_for_game, get_report_by_game_id, get_report_summaries_by_user_id, get_team_analysis_by_team_id, get_team_by_id, get_team_stats_from_game, get_user_by_email
-from app.models import GameSimulationResponse, PlayerProjectionResponse, TeamResponse, TeamStatsResponse, TeamAnalysisResponse
+from app.database import async_connection
+from app.database.common import get_async_db, get_async_read_db, get_db
+from app.database.connection import (
+    OverallReport,
+    ReportSummaryPage,
+    ScoutingReport,
+    get_game_by_uuid,
+    get_report_by_game_id,
+    get_scouting_report,
+    get_user_by_email,
+)
+from app.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.database.replica import async_read_session_for_user
 from app.routers.util import get_verified_user_email
+from app.services.report_cache import report_cache
+from app.services.report_snapshots import read_report_async
 
 
 config = Config()
@@ -19,76 +30,60 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-class OverallReport(BaseModel):
-    created_at: datetime.datetime
-    
-    game_uuid: str    
-    game_simulation: GameSimulationResponse
-    
-    team: TeamResponse
-    team_stats: TeamStatsResponse
-    team_analysis: TeamAnalysisResponse
-    team_player_analysis: List[PlayerProjectionResponse]
-
-    opponent: TeamResponse
-    opponent_stats: TeamStatsResponse
-    opponent_analysis: TeamAnalysisResponse
-    opponent_player_analysis: List[PlayerProjectionResponse]
+@router.get("/summaries", response_model=ReportSummaryPage)
+async def get_report_summaries(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    user_email: str = Depends(get_verified_user_email),
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+):
+    read_db = await async_read_session_for_user(db, read_db, user_email)
 
-
-@router.get("/summaries", response_model=List[ReportSummary])
-async def get_report_summaries(user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
-    # Get user ID from email
-    user = get_user_by_email(db, user_email)
+    # Get user ID from email; a user who just signed up may not be on the replica yet
+    user = await async_connection.get_user_by_email(read_db, user_email)
+    if not user and read_db is not db:
+        read_db = db
+        user = await async_connection.get_user_by_email(db, user_email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get report summaries
-    summaries = get_report_summaries_by_user_id(db, user.id)
-    
-    return summaries
+    # Get a page of report summaries
+    try:
+        return await async_connection.get_report_summaries_by_user_id(read_db, user.id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/cache-stats")
+async def get_report_cache_stats(user_email: str = Depends(get_verified_user_email)):
+    """Counters of the in-process completed-report cache"""
+    return report_cache.stats()
 
 @router.get("/{game_uuid}", response_model=OverallReport)
-async def get_full_game_report(game_uuid: str, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
-    # get game
-    user = get_user_by_email(db, user_email)
-    game = get_game_by_uuid(db, game_uuid)
-    if not game or game.user_id != user.id:
+async def get_full_game_report(
+    game_uuid: str,
+    user_email: str = Depends(get_verified_user_email),
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db),
+):
+    report = await read_report_async(db, game_uuid, user_email, read_db=read_db)
+    if report is None:
         raise HTTPException(status_code=404, detail="Game not found")
-    
-    # get game report
-    game_simulation_db = get_game_simulation(db, game.id)
-    game_simulation = GameSimulationResponse(**game_simulation_db.__dict__)
 
-    # get team analysis
-    team_db = get_team_by_id(db, game.home_team_id)
-    team = TeamResponse.model_validate(team_db.__dict__)
-    team_stats = TeamStatsResponse.model_validate(get_team_stats_from_game(db, game.id, team_db.id).__dict__)
-    team_analysis = TeamAnalysisResponse.model_validate(get_team_analysis_by_team_id(db, team_db.id).__dict__)
-    team_player_analysis = [PlayerProjectionResponse.model_validate(player.__dict__) for player in get_projected_player_for_game(db, game.id, team_db.id)]
-    
-    # get opponent analysis
-    opponent_db = get_team_by_id(db, game.away_team_id)
-    opponent = TeamResponse.model_validate(opponent_db.__dict__)
-    opponent_stats = TeamStatsResponse.model_validate(get_team_stats_from_game(db, game.id, opponent_db.id).__dict__)
-    opponent_analysis = TeamAnalysisResponse.model_validate(get_team_analysis_by_team_id(db, opponent_db.id).__dict__)
-    opponent_player_analysis = [PlayerProjectionResponse.model_validate(player.__dict__) for player in get_projected_player_for_game(db, game.id, opponent_db.id)]
-
-    return OverallReport(
-        game_uuid=str(game.uuid),
-        created_at=game.created_at,
-        game_simulation=game_simulation,
+    # Already a serialized OverallReport
+    return Response(content=report, media_type="application/json")
 
-        team=team,
-        team_stats=team_stats,
-        team_player_analysis=team_player_analysis,
-        team_analysis=team_analysis,
+@router.get("/{game_uuid}/scouting", response_model=ScoutingReport)
+def get_game_scouting_report(game_uuid: str, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Team and opponent analysis and stats of a game, readable while it is still being simulated
 
-        opponent=opponent,
-        opponent_stats=opponent_stats,
-        opponent_player_analysis=opponent_player_analysis,
-        opponent_analysis=opponent_analysis
-    )
+    Read from the primary, since the game was usually stored moments ago.
+    """
+    report = get_scouting_report(db, game_uuid, user_email)
+    if report is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    return report
 
 @router.get("/{game_uuid}/download")
 async def download_game_report(game_uuid: str, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
@@ -98,5 +93,7 @@ async def download_game_report(game_uuid: str, user_email: str = Depends(get_ver
         raise HTTPException(status_code=404, detail="Game not found")
     
     game_report = get_report_by_game_id(db, game.id, "game_analysis")
+    if game_report is None:
+        raise HTTPException(status_code=404, detail="Report not ready yet")
 
     return FileResponse(game_report.file_path, media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
@@ -0,0 +1,467 @@
+import datetime
+import math
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+from app.config import Config
+from app.database.common import get_db
+from app.database.connection import (
+    get_game_by_uuid,
+    get_latest_player_stats_for_team,
+    get_team_stats_from_game,
+    get_user_by_email,
+    get_user_team_ids,
+    insert_schedule_games,
+)
+from app.routers.util import get_verified_user_email
+from app.services.lineups import LINEUP_SIZE, player_rates, rank_lineups, rotation
+from app.services.live_simulation import build_rate_table, cache_rate_table, get_cached_rate_table, simulate_remaining
+from app.services.league import DEFAULT_LEAGUE_SIMULATIONS, build_league_matrix
+from app.services.season import DEFAULT_SEASON_SIMULATIONS, project_season
+from app.services.simulation_engine import build_scenarios, simulate_matchups, team_vector
+
+
+config = Config()
+
+router = APIRouter(
+    prefix="/simulation",
+    tags=["simulation"],
+    responses={404: {"description": "Not found"}},
+)
+
+MAX_WHAT_IF_SCENARIOS = 100
+MAX_LEAGUE_TEAMS = 64
+MAX_SCHEDULE_GAMES = 1000
+
+StatName = Literal["ppg", "rebounds", "fg_pct", "fg3_pct", "turnovers", "assists", "steals", "blocks"]
+
+
+class StatPerturbation(BaseModel):
+    team: Literal["team", "opponent"]
+    stat: StatName
+    delta: float = Field(description="Change to apply, in percentage points for fg_pct/fg3_pct")
+
+
+class WhatIfScenario(BaseModel):
+    name: Optional[str] = None
+    perturbations: List[StatPerturbation]
+
+
+class WhatIfRequest(BaseModel):
+    scenarios: List[WhatIfScenario] = Field(..., min_length=1, max_length=MAX_WHAT_IF_SCENARIOS)
+    num_simulations: int = Field(10000, ge=100, le=100000)
+
+
+class WhatIfScenarioResult(BaseModel):
+    name: Optional[str]
+    perturbations: List[StatPerturbation]
+    win_probability: float
+    win_probability_delta: float
+    avg_team_score: float
+    avg_opponent_score: float
+
+
+class WhatIfResponse(BaseModel):
+    game_uuid: str
+    num_simulations: int
+    baseline_win_probability: float
+    baseline_team_score: float
+    baseline_opponent_score: float
+    scenarios: List[WhatIfScenarioResult]
+
+
+class LeagueRequest(BaseModel):
+    team_uuids: List[str] = Field(..., min_length=2, max_length=MAX_LEAGUE_TEAMS, description="Teams from the user's games")
+    name: Optional[str] = None
+    num_simulations: int = Field(DEFAULT_LEAGUE_SIMULATIONS, ge=100, le=20000)
+
+
+class LeagueRanking(BaseModel):
+    rank: int
+    team_uuid: str
+    team_name: Optional[str]
+    avg_win_probability: Optional[float]
+
+
+class LeagueResponse(BaseModel):
+    uuid: str
+    name: Optional[str]
+    team_uuids: List[str]
+    num_simulations: int
+    win_probabilities: List[List[Optional[float]]] = Field(
+        description="win_probabilities[i][j] is the chance team_uuids[i] beats team_uuids[j], in percent"
+    )
+    rankings: List[LeagueRanking]
+    recomputed_team_uuids: List[str]
+
+
+def resolve_user_teams(db: Session, user_id: int, team_uuids: List[str]) -> dict[str, int]:
+    """
+    Team IDs of the given team UUIDs, which must all come from the user's games
+
+    Raises:
+        HTTPException: 404 listing the UUIDs that aren't teams of the user's games
+    """
+    team_ids = get_user_team_ids(db, user_id, team_uuids)
+    missing = [team_uuid for team_uuid in team_uuids if team_uuid not in team_ids]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Teams not found: {missing}")
+    return team_ids
+
+
+@router.post("/league", response_model=LeagueResponse)
+def league(league_request: LeagueRequest, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Simulate every pairing of a set of teams and rank them by average win probability.
+    The matrix is stored per user and team set; on later calls only the rows and
+    columns of teams whose latest stats changed are simulated again.
+    """
+    user = get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    team_ids = resolve_user_teams(db, user.id, league_request.team_uuids)
+    team_uuids = {team_id: team_uuid for team_uuid, team_id in team_ids.items()}
+    try:
+        league_matrix, recomputed = build_league_matrix(
+            db, user.id, list(team_ids.values()), league_request.num_simulations, league_request.name
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return LeagueResponse(
+        uuid=str(league_matrix.uuid),
+        name=league_matrix.name,
+        team_uuids=[team_uuids[team_id] for team_id in league_matrix.team_ids],
+        num_simulations=league_matrix.num_simulations,
+        win_probabilities=league_matrix.win_probabilities,
+        rankings=[
+            LeagueRanking(team_uuid=team_uuids[ranking["team_id"]], **ranking)
+            for ranking in league_matrix.rankings
+        ],
+        recomputed_team_uuids=[team_uuids[team_id] for team_id in recomputed],
+    )
+
+
+class ScheduleGame(BaseModel):
+    home_team_uuid: str = Field(description="Team from the user's games")
+    away_team_uuid: str = Field(description="Team from the user's games")
+    game_date: Optional[datetime.date] = None
+    home_score: Optional[int] = Field(None, ge=0)
+    away_score: Optional[int] = Field(None, ge=0)
+
+
+class ScheduleRequest(BaseModel):
+    games: List[ScheduleGame] = Field(..., min_length=1, max_length=MAX_SCHEDULE_GAMES)
+
+
+class ScheduleGameResponse(ScheduleGame):
+    uuid: str
+
+
+class ScheduleResponse(BaseModel):
+    games: List[ScheduleGameResponse]
+
+
+class SeasonRequest(BaseModel):
+    team_uuid: str = Field(description="Team from the user's games")
+    num_simulations: int = Field(DEFAULT_SEASON_SIMULATIONS, ge=100, le=50000)
+    playoff_spots: Optional[int] = Field(None, ge=1)
+
+
+class RecordProbability(BaseModel):
+    wins: int
+    losses: int
+    probability: float
+
+
+class SeedProbability(BaseModel):
+    seed: int
+    probability: float
+
+
+class SeasonStanding(BaseModel):
+    team_uuid: str
+    team_name: Optional[str]
+    expected_wins: float
+    average_seed: float
+
+
+class SeasonResponse(BaseModel):
+    team_uuid: str
+    team_name: Optional[str]
+    current_wins: int
+    current_losses: int
+    remaining_games: int
+    num_simulations: int
+    expected_wins: float
+    records: List[RecordProbability]
+    seeds: List[SeedProbability]
+    playoff_probability: Optional[float]
+    standings: List[SeasonStanding]
+
+
+@router.post("/schedule", response_model=ScheduleResponse)
+def add_schedule_games(schedule_request: ScheduleRequest, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Add games to the user's schedule. Games with both scores count as played;
+    the others are simulated by the season projection.
+    """
+    user = get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    games = schedule_request.games
+    if any((game.home_score is None) != (game.away_score is None) for game in games):
+        raise HTTPException(status_code=400, detail="Both scores are required for a played game")
+    if any(game.home_score is not None and game.home_score == game.away_score for game in games):
+        raise HTTPException(status_code=400, detail="A played game cannot end in a tie")
+
+    team_uuids = list(dict.fromkeys(team_uuid for game in games for team_uuid in (game.home_team_uuid, game.away_team_uuid)))
+    team_ids = resolve_user_teams(db, user.id, team_uuids)
+    if any(team_ids[game.home_team_uuid] == team_ids[game.away_team_uuid] for game in games):
+        raise HTTPException(status_code=400, detail="A team cannot play itself")
+
+    schedule_games = insert_schedule_games(db, user.id, [
+        {
+            "home_team_id": team_ids[game.home_team_uuid],
+            "away_team_id": team_ids[game.away_team_uuid],
+            "game_date": game.game_date,
+            "home_score": game.home_score,
+            "away_score": game.away_score,
+        }
+        for game in games
+    ])
+    db.commit()
+    return ScheduleResponse(games=[
+        ScheduleGameResponse(uuid=str(schedule_game.uuid), **game.model_dump())
+        for schedule_game, game in zip(schedule_games, games)
+    ])
+
+
+@router.post("/season", response_model=SeasonResponse)
+def season_projection(season_request: SeasonRequest, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Project a team's final record and seeding by simulating the rest of the
+    user's schedule. Each distinct matchup is simulated once and its win
+    probability reused for every repeat of that pairing.
+    """
+    user = get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    team_id = resolve_user_teams(db, user.id, [season_request.team_uuid])[season_request.team_uuid]
+    try:
+        projection = project_season(
+            db, user.id, team_id, season_request.num_simulations, season_request.playoff_spots
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return SeasonResponse(**projection)
+
+
+class LineupRequest(BaseModel):
+    excluded_player_ids: List[int] = Field(default_factory=list, description="Players unavailable for the game")
+    top_k: int = Field(20, ge=0, le=200, description="Best lineups to refine with the simulator, 0 to skip")
+    num_simulations: int = Field(5000, ge=100, le=20000)
+    num_results: int = Field(10, ge=1, le=100)
+
+
+class LineupPlayer(BaseModel):
+    player_id: int
+    name: str
+    position: Optional[str]
+
+
+class RankedLineup(BaseModel):
+    rank: int
+    players: List[LineupPlayer]
+    net_rating: float = Field(description="Projected full-game point margin against the opponent")
+    projected_points: float
+    win_probability: Optional[float] = Field(None, description="Simulated win probability, for refined lineups")
+    simulated_margin: Optional[float] = None
+
+
+class RotationPlayer(LineupPlayer):
+    lineup_share: float = Field(description="Percentage of the returned lineups the player appears in")
+
+
+class LineupResponse(BaseModel):
+    game_uuid: str
+    num_players: int
+    num_lineups: int
+    lineups: List[RankedLineup]
+    rotation: List[RotationPlayer]
+
+
+class LiveGameState(BaseModel):
+    team_score: int = Field(..., ge=0)
+    opponent_score: int = Field(..., ge=0)
+    period: int = Field(..., ge=1, description="Current period; periods after regulation are overtimes")
+    minutes_remaining: float = Field(..., ge=0, description="Minutes left in the current period")
+    num_simulations: int = Field(5000, ge=100, le=20000)
+
+
+class LiveWinProbabilityResponse(BaseModel):
+    game_uuid: str
+    win_probability: float
+    overtime_probability: float
+    projected_team_score: float
+    projected_opponent_score: float
+    minutes_remaining: float
+
+
+@router.post("/{game_uuid}/lineups", response_model=LineupResponse)
+def lineups(game_uuid: str, lineup_request: LineupRequest, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Rank every 5-man lineup of the team against the game's opponent.
+    All combinations are scored in one vectorized pass by projected net rating;
+    the best top_k are then refined with the local simulator.
+    """
+    user = get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    game = get_game_by_uuid(db, game_uuid)
+    if not game or game.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    opponent_stats = get_team_stats_from_game(db, game.id, game.away_team_id)
+    if opponent_stats is None:
+        raise HTTPException(status_code=404, detail="Team stats not found for this game")
+
+    excluded = set(lineup_request.excluded_player_ids)
+    roster = [
+        (player, stats) for player, stats in get_latest_player_stats_for_team(db, game.home_team_id)
+        if player.id not in excluded
+    ]
+    if len(roster) < LINEUP_SIZE:
+        raise HTTPException(status_code=400, detail=f"At least {LINEUP_SIZE} players with stats are required")
+
+    rates = player_rates([stats for _, stats in roster], config.game_periods * config.period_minutes)
+    ranked = rank_lineups(
+        rates,
+        team_vector(opponent_stats),
+        top_k=lineup_request.top_k,
+        num_simulations=lineup_request.num_simulations,
+        num_results=lineup_request.num_results,
+    )
+
+    def lineup_player(index: int) -> dict:
+        player = roster[index][0]
+        return {"player_id": player.id, "name": player.name, "position": player.position}
+
+    return LineupResponse(
+        game_uuid=str(game.uuid),
+        num_players=len(roster),
+        num_lineups=math.comb(len(roster), LINEUP_SIZE),
+        lineups=[
+            RankedLineup(rank=rank, **{**lineup, "players": [lineup_player(index) for index in lineup["players"]]})
+            for rank, lineup in enumerate(ranked, start=1)
+        ],
+        rotation=[
+            RotationPlayer(**lineup_player(entry["player"]), lineup_share=entry["lineup_share"])
+            for entry in rotation(ranked)
+        ],
+    )
+
+
+@router.post("/{game_uuid}/live", response_model=LiveWinProbabilityResponse)
+def live_win_probability(game_uuid: str, game_state: LiveGameState, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Win probability from the current score and clock.
+    Per-minute scoring rates are computed from the game's team stats on the first
+    call and kept in memory, so later calls for the same game skip the database.
+    """
+    cached = get_cached_rate_table(game_uuid)
+    if cached is not None and cached["user_email"] == user_email:
+        rates = cached["rates"]
+    else:
+        user = get_user_by_email(db, user_email)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        game = get_game_by_uuid(db, game_uuid)
+        if not game or game.user_id != user.id:
+            raise HTTPException(status_code=404, detail="Game not found")
+
+        team_stats = get_team_stats_from_game(db, game.id, game.home_team_id)
+        opponent_stats = get_team_stats_from_game(db, game.id, game.away_team_id)
+        if team_stats is None or opponent_stats is None:
+            raise HTTPException(status_code=404, detail="Team stats not found for this game")
+
+        rates = build_rate_table(team_stats, opponent_stats, config.game_periods * config.period_minutes)
+        cache_rate_table(game_uuid, user_email, rates)
+
+    if game_state.period <= config.game_periods:
+        period_minutes = config.period_minutes
+        later_periods = (config.game_periods - game_state.period) * config.period_minutes
+    else:
+        period_minutes = config.overtime_minutes
+        later_periods = 0
+    if game_state.minutes_remaining > period_minutes:
+        raise HTTPException(status_code=400, detail=f"minutes_remaining cannot exceed {period_minutes} in this period")
+    minutes_remaining = game_state.minutes_remaining + later_periods
+
+    results = simulate_remaining(
+        rates,
+        game_state.team_score,
+        game_state.opponent_score,
+        minutes_remaining,
+        config.overtime_minutes,
+        game_state.num_simulations,
+    )
+    return LiveWinProbabilityResponse(
+        game_uuid=game_uuid,
+        win_probability=round(results["win_prob"] * 100, 1),
+        overtime_probability=round(results["overtime_prob"] * 100, 1),
+        projected_team_score=round(results["avg_team_score"], 1),
+        projected_opponent_score=round(results["avg_opponent_score"], 1),
+        minutes_remaining=minutes_remaining,
+    )
+
+
+@router.post("/{game_uuid}/what-if", response_model=WhatIfResponse)
+def what_if(game_uuid: str, what_if_request: WhatIfRequest, user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+    """
+    Evaluate a batch of stat perturbations against a game's stored team stats.
+    All scenarios run in a single vectorized pass using the same random draws,
+    so the deltas reflect the perturbations rather than simulation noise.
+    """
+    user = get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    game = get_game_by_uuid(db, game_uuid)
+    if not game or game.user_id != user.id:
+        raise HTTPException(status_code=404, detail="Game not found")
+
+    team_stats = get_team_stats_from_game(db, game.id, game.home_team_id)
+    opponent_stats = get_team_stats_from_game(db, game.id, game.away_team_id)
+    if team_stats is None or opponent_stats is None:
+        raise HTTPException(status_code=404, detail="Team stats not found for this game")
+
+    team_matrix, opponent_matrix = build_scenarios(
+        team_vector(team_stats),
+        team_vector(opponent_stats),
+        [[p.model_dump() for p in scenario.perturbations] for scenario in what_if_request.scenarios],
+    )
+    results = simulate_matchups(
+        team_matrix, opponent_matrix, what_if_request.num_simulations, common_random_numbers=True
+    )
+
+    win_prob = results["win_prob"] * 100
+    return WhatIfResponse(
+        game_uuid=str(game.uuid),
+        num_simulations=what_if_request.num_simulations,
+        baseline_win_probability=round(float(win_prob[0]), 1),
+        baseline_team_score=round(float(results["avg_score_a"][0]), 1),
+        baseline_opponent_score=round(float(results["avg_score_b"][0]), 1),
+        scenarios=[
+            WhatIfScenarioResult(
+                name=scenario.name,
+                perturbations=scenario.perturbations,
+                win_probability=round(float(win_prob[i]), 1),
+                win_probability_delta=round(float(win_prob[i] - win_prob[0]), 1),
+                avg_team_score=round(float(results["avg_score_a"][i]), 1),
+                avg_opponent_score=round(float(results["avg_score_b"][i]), 1),
+            )
+            for i, scenario in enumerate(what_if_request.scenarios, start=1)
+        ],
+    )
@@ -4,8 +4,9 @@ from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends
 from app.config import Config
-from app.database.common import get_db
+from app.database.common import get_db, get_read_db
 from app.database.models import GameDB, TeamAnalysisDB, TeamDB, TeamStatsDB, UserDB
+from app.database.replica import read_session_for_user
 from app.routers.util import get_verified_user_email
 
 
@@ -23,9 +24,14 @@ class LatestTeamAnalysis(BaseModel):
     team_uuid: str
 
 @router.get("/latest-home-team-analysis", response_model=LatestTeamAnalysis)
-def get_latest_home_team_analysis(user_email: str = Depends(get_verified_user_email), db: Session = Depends(get_db)):
+def get_latest_home_team_analysis(
+    user_email: str = Depends(get_verified_user_email),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db),
+):
+    read_db = read_session_for_user(db, read_db, user_email)
     # We're doing the join just to make sure we have a full analysis for the team
-    result = db.query(GameDB, TeamDB, TeamAnalysisDB).join(TeamDB, GameDB.home_team_id == TeamDB.id).join(TeamAnalysisDB).join(UserDB).where(UserDB.email == user_email).order_by(GameDB.id.desc()).limit(1).first()
+    result = read_db.query(GameDB, TeamDB, TeamAnalysisDB).join(TeamDB, GameDB.home_team_id == TeamDB.id).join(TeamAnalysisDB).join(UserDB).where(UserDB.email == user_email).order_by(GameDB.id.desc()).limit(1).first()
     if result is None:
         return None
     
@@ -14,11 +14,12 @@ from fastapi import (
     HTTPException,
     BackgroundTasks,
     Form,
+    Query,
     Request,
 )
-from fastapi.responses import FileResponse, HTMLResponse, JSONResponse
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
-from typing import List, Literal, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any, Tuple
 from pathlib import Path
 from datetime import datetime
 from docx import Document
@@ -26,12 +27,15 @@ from docx.shared import Pt, Inches
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from pydantic import BaseModel, Field
 import sqlalchemy
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import Config
-from app.database.common import database_context, get_db
+from app.database import async_connection
+from app.database.common import database_context, get_async_db, get_async_session_factory, get_db
+from app.database.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.database.unit_of_work import UnitOfWork
 from app.database.models import (
-    GameDB,
     ProcessingTaskDB,
     ReportDB,
     TeamAnalysisDB,
@@ -43,25 +47,32 @@ from app.database.models import (
 )
 from app.llmmodels import GameSimulation, TeamWrapper
 from app.routers.util import get_verified_user_email
-from app.services.anthropic_api import analyze_team_pdf, simulate_game
+from app.services.projection_bands import attach_projection_bands
+from app.services.player_names import resolve_player_ids
+from app.services.anthropic_api import (
+    GAME_SIMULATION_MODEL,
+    analyze_team_pdf,
+    get_game_simulation_prompt_version,
+    simulate_game,
+)
+from app.services.pdf_uploads import StoredUpload, UploadTooLarge, store_pdf_upload
 from app.services.report_gen import generate_report
+from app.services.report_snapshots import write_report_snapshot
+from app.services.task_events import RESYNC, task_event_hub
 from app.database.connection import (
+    AnalysisPage,
     get_user_by_email,
-    insert_team,
-    insert_team_stats,
-    insert_player,
-    insert_player_stats,
-    insert_team_analysis,
+    get_user_team_ids,
+    insert_team_wrapper,
     insert_game,
     insert_game_simulation,
     insert_report,
-    get_recent_analyses,
+    get_child_task_progress,
+    get_task_progress,
     execute_query,
-    insert_player_raw_stats,
     insert_player_projections,
     insert_simulation_details,
-    find_player_by_name,
-    update_team_stats_game_id,
+    link_team_stats_to_game,
 )
 
 # Set up Jinja2 templates
@@ -73,6 +84,9 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
+# Uploaded PDFs, stored under their SHA-256
+UPLOADS_DIR = f"{config.base_dir}/app/temp/uploads"
+
 # Dictionary to store processing status
 processing_tasks = {}
 
@@ -86,6 +100,22 @@ PROCESSING_STEPS = [
     "Your report is ready",
 ]
 
+# Sections of a game that can be read before its task completes, with the
+# step whose commit stores them: the scouting report (GET /report/{game_uuid}/scouting)
+# once the game is stored, the full report (GET /report/{game_uuid}) once the
+# simulation is. The DOCX report ("report") is ready when the task completes.
+SECTION_STEPS = {
+    "scouting": 2,
+    "simulation": 4,
+}
+
+# Seconds between keep-alive comments on an idle task event stream
+TASK_EVENTS_HEARTBEAT_SECONDS = 15
+
+# Opponents of a batch upload, each simulated in its own thread with two
+# pooled connections at most while its opponent is analyzed
+MAX_BATCH_OPPONENTS = 6
+
 
 class ProcessingTaskResponse(BaseModel):
     task_uuid: str
@@ -94,6 +124,9 @@ class ProcessingTaskResponse(BaseModel):
     current_step: int
     total_steps: int
     game_uuid: Optional[str] = None
+    ready_sections: List[Literal["scouting", "simulation", "report"]] = []
+    # One task per opponent, for a batch task
+    children: List["ProcessingTaskResponse"] = []
 
 
 class UploadProcessResponse(BaseModel):
@@ -101,17 +134,30 @@ class UploadProcessResponse(BaseModel):
     status: Literal["processing", "completed", "failed"]
 
 
-@router.get("/analyses", response_class=JSONResponse)
-async def get_analyses(request: Request, user_email=Depends(get_verified_user_email)):
+class UploadBatchResponse(BaseModel):
+    task_id: str
+    child_task_ids: List[str]
+    status: Literal["processing", "completed", "failed"]
+
+
+@router.get("/analyses", response_model=AnalysisPage)
+async def get_analyses(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    user_email=Depends(get_verified_user_email),
+    db: AsyncSession = Depends(get_async_db),
+):
     """
-    Get recent analyses and display them on a webpage
+    Get a page of the user's recent analyses, newest first
     """
-    user = get_user_by_email(user_email)
+    user = await async_connection.get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    # Get analyses filtered by user_id
-    analyses = get_recent_analyses(limit=10, user_id=user["id"])
-
-    return JSONResponse(content={"analyses": analyses})
+    try:
+        return await async_connection.get_recent_analyses(db, limit=limit, user_id=user.id, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/upload", response_model=UploadProcessResponse)
@@ -137,6 +183,9 @@ async def upload_files(
             raise HTTPException(status_code=404, detail="Team not found")
 
     # Validate files are PDFs
+    if team_uuid is None and team_files is None:
+        raise HTTPException(status_code=400, detail="Upload a team file or choose an existing team")
+
     if team_uuid is None and not team_files.filename.lower().endswith(".pdf"):
         raise HTTPException(
             status_code=400, detail=f"Team file {team_files.filename} is not a PDF"
@@ -150,32 +199,17 @@ async def upload_files(
 
     # Create a unique task ID
     task_uuid = str(uuid.uuid4())
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    task_dir = f"{config.base_dir}/app/temp/uploads/{task_uuid}"
-    os.makedirs(task_dir, exist_ok=True)
-
-    # Save uploaded files
-    file_paths = []
-
-    # Save team file
-    if team_uuid is None:
-        team_file_path = f"{task_dir}/team_{team_files.filename}"
-        with open(team_file_path, "wb") as buffer:
-            content = await team_files.read()
-            buffer.write(content)
-        file_paths.append(team_file_path)
-
-    # Save opponent file
-    opponent_file_path = f"{task_dir}/opponent_{opponent_files.filename}"
-    with open(opponent_file_path, "wb") as buffer:
-        content = await opponent_files.read()
-        buffer.write(content)
-    file_paths.append(opponent_file_path)
+
+    # Stream the uploaded files to disk, checking their type, size and pages
+    team_file = await _store_upload(team_files) if team_uuid is None else None
+    opponent_file = await _store_upload(opponent_files)
 
     processing_task = ProcessingTaskDB(
         status="processing",
-        team_file_path=team_file_path if team_uuid is None else None,
-        opponent_file_path=opponent_file_path,
+        team_file_path=team_file.path if team_file else None,
+        team_file_sha256=team_file.sha256 if team_file else None,
+        opponent_file_path=opponent_file.path,
+        opponent_file_sha256=opponent_file.sha256,
         team_id=team_db.id if team_db else None,
         step=0,
         total_steps=len(PROCESSING_STEPS),
@@ -200,37 +234,277 @@ async def upload_files(
     return UploadProcessResponse(task_id=task_uuid, status="processing")
 
 
+async def _store_upload(upload: UploadFile) -> StoredUpload:
+    try:
+        return await store_pdf_upload(upload, UPLOADS_DIR)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/upload-batch", response_model=UploadBatchResponse)
+async def upload_batch(
+    background_tasks: BackgroundTasks,
+    team_uuid: Optional[str] = Form(None, description="UUID of the team to analyze"),
+    team_files: Optional[UploadFile] = File(None, description="PDF file of the team to analyze"),
+    team_name: Optional[str] = Form(None, description="Name of the team to analyze"),
+    opponent_files: List[UploadFile] = File(..., description="PDF file of each opponent to analyze"),
+    opponent_names: List[str] = Form(..., description="Name of each opponent, in the order of the files"),
+    use_local_simulation: Optional[bool] = Form(False),
+    user_email: str = Depends(get_verified_user_email),
+    db: Session = Depends(get_db),
+):
+    """
+    Upload our team and several opponents, e.g. before a tournament
+
+    Our team is analyzed once and shared by one game per opponent. Each
+    opponent gets a child task, which analyzes and simulates its game
+    concurrently with the others; the batch task tracks them all and its
+    status lists their progress.
+    """
+    user = get_user_by_email(db, user_email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    team_id = None
+    if team_uuid is not None:
+        # Only a team from one of the user's games can be reused
+        team_id = get_user_team_ids(db, user.id, [team_uuid]).get(team_uuid)
+        if team_id is None:
+            raise HTTPException(status_code=404, detail="Team not found")
+    elif team_files is None:
+        raise HTTPException(status_code=400, detail="Upload a team file or choose an existing team")
+    elif not team_files.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail=f"Team file {team_files.filename} is not a PDF")
+
+    if not 1 <= len(opponent_files) <= MAX_BATCH_OPPONENTS:
+        raise HTTPException(status_code=400, detail=f"Upload between 1 and {MAX_BATCH_OPPONENTS} opponents")
+    if len(opponent_names) != len(opponent_files):
+        raise HTTPException(status_code=400, detail="Give one opponent name per opponent file")
+    for opponent_file in opponent_files:
+        if not opponent_file.filename.lower().endswith(".pdf"):
+            raise HTTPException(status_code=400, detail=f"Opponent file {opponent_file.filename} is not a PDF")
+
+    team_file = await _store_upload(team_files) if team_id is None else None
+    stored_opponents = [await _store_upload(opponent_file) for opponent_file in opponent_files]
+
+    task_uuid = str(uuid.uuid4())
+    batch_task = ProcessingTaskDB(
+        task_uuid=task_uuid,
+        status="processing",
+        team_file_path=team_file.path if team_file else None,
+        team_file_sha256=team_file.sha256 if team_file else None,
+        team_id=team_id,
+        step=0,
+        total_steps=len(PROCESSING_STEPS),
+    )
+    db.add(batch_task)
+    db.flush()
+
+    children = []
+    for opponent_file, opponent_name in zip(stored_opponents, opponent_names):
+        child_uuid = str(uuid.uuid4())
+        db.add(ProcessingTaskDB(
+            task_uuid=child_uuid,
+            parent_id=batch_task.id,
+            status="processing",
+            opponent_file_path=opponent_file.path,
+            opponent_file_sha256=opponent_file.sha256,
+            team_id=team_id,
+            step=0,
+            total_steps=len(PROCESSING_STEPS),
+        ))
+        children.append((child_uuid, opponent_name))
+    db.commit()
+
+    background_tasks.add_task(
+        process_batch,
+        task_uuid,
+        user.id,
+        team_name,
+        children,
+        use_local_simulation,
+    )
+
+    return UploadBatchResponse(
+        task_id=task_uuid,
+        child_task_ids=[child_uuid for child_uuid, _ in children],
+        status="processing",
+    )
+
+
+def task_progress_response(task_uuid: str, status: str, step: int, total_steps: int, game_uuid=None) -> ProcessingTaskResponse:
+    """
+    Progress of a processing task as returned to the client
+
+    Args:
+        task_uuid: Task UUID
+        status: Task status
+        step: Current step, an index into PROCESSING_STEPS
+        total_steps: Number of steps
+        game_uuid: UUID of the task's game, once it was stored (optional)
+
+    Returns:
+        Task progress
+    """
+    # Steps commit together with the data they store, so even a failed task
+    # keeps the sections of the steps it got through
+    ready_sections = [section for section, ready_step in SECTION_STEPS.items() if step >= ready_step]
+    if status == "completed":
+        ready_sections.append("report")
+
+    return ProcessingTaskResponse(
+        task_uuid=str(task_uuid),
+        status=status,
+        step_description=PROCESSING_STEPS[step] if step < len(PROCESSING_STEPS) else "Completed",
+        current_step=step,
+        total_steps=total_steps,
+        game_uuid=str(game_uuid) if game_uuid is not None else None,
+        ready_sections=ready_sections,
+    )
+
+
+def batch_progress_response(progress: ProcessingTaskResponse, children: list) -> ProcessingTaskResponse:
+    """
+    Progress of a batch task, with the progress of its child tasks
+
+    Args:
+        progress: Progress of the batch task itself
+        children: Rows of (task_uuid, status, step, total_steps, game_uuid),
+            one per child task
+
+    Returns:
+        Task progress; a batch task has no game of its own, so no sections
+    """
+    if not children:
+        return progress
+    return progress.model_copy(update={
+        "ready_sections": [],
+        "children": [task_progress_response(*child) for child in children],
+    })
+
+
 @router.get("/status/{task_id}", response_model=ProcessingTaskResponse)
 def get_status(task_id: str, db: Session = Depends(get_db)):
     """
-    Get the status of a processing task
+    Get the status of a processing task, and of its children for a batch task
     """
-    processing_task_db = (
-        db.query(ProcessingTaskDB).filter(ProcessingTaskDB.task_uuid == task_id).first()
-    )
-    if processing_task_db is None:
+    progress = get_task_progress(db, task_id)
+    if progress is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    if processing_task_db.game_id is not None:
-        game_db = (
-            db.query(GameDB).filter(GameDB.id == processing_task_db.game_id).first()
-        )
-        game_uuid = str(game_db.uuid)
-    else:
-        game_uuid = None
+    return batch_progress_response(task_progress_response(task_id, *progress), get_child_task_progress(db, task_id))
 
-    return ProcessingTaskResponse(
-        task_uuid=task_id,
-        status=processing_task_db.status,
-        step_description=PROCESSING_STEPS[processing_task_db.step]
-        if processing_task_db.step < len(PROCESSING_STEPS)
-        else "Completed",
-        current_step=processing_task_db.step,
-        total_steps=processing_task_db.total_steps,
-        game_uuid=game_uuid,
+
+async def _read_task_progress(task_uuid: str) -> Optional[ProcessingTaskResponse]:
+    # A short-lived session, so a stream doesn't hold a pooled connection
+    async with get_async_session_factory()() as db:
+        progress = await async_connection.get_task_progress(db, task_uuid)
+        if progress is None:
+            return None
+        children = await async_connection.get_child_task_progress(db, task_uuid)
+    return batch_progress_response(task_progress_response(task_uuid, *progress), children)
+
+
+def _server_sent_event(progress: ProcessingTaskResponse) -> str:
+    return f"data: {progress.model_dump_json()}\n\n"
+
+
+async def _task_progress_events(task_uuid: str, queue, progress: ProcessingTaskResponse):
+    try:
+        while True:
+            yield _server_sent_event(progress)
+            if progress.status != "processing":
+                return
+
+            try:
+                event = await asyncio.wait_for(queue.get(), TASK_EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle stream
+                yield ": keep-alive\n\n"
+                continue
+
+            # A child of a batch task changed: re-read the batch and its children
+            if event is RESYNC or str(event["task_uuid"]).lower() != task_uuid.lower():
+                progress = await _read_task_progress(task_uuid)
+                if progress is None:
+                    return
+            else:
+                progress = task_progress_response(
+                    task_uuid, event["status"], event["step"], event["total_steps"], event.get("game_uuid")
+                )
+    finally:
+        task_event_hub.unsubscribe(task_uuid, queue)
+
+
+@router.get("/events/{task_id}")
+async def stream_task_events(task_id: str, user_email: str = Depends(get_verified_user_email)):
+    """
+    Stream the progress of a processing task as server-sent events
+
+    The current progress is sent first, then every step transition as soon as
+    the pipeline commits it, on whichever API node runs the task. Each event's
+    data is a ProcessingTaskResponse; the stream ends once the task completed
+    or failed. A batch task's stream also sends an event whenever one of its
+    children moves on.
+    """
+    try:
+        task_id = str(uuid.UUID(task_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    # Subscribe first, so a transition committed while reading isn't missed
+    queue = await task_event_hub.subscribe(task_id)
+    try:
+        progress = await _read_task_progress(task_id)
+    except Exception:
+        task_event_hub.unsubscribe(task_id, queue)
+        raise
+    if progress is None:
+        task_event_hub.unsubscribe(task_id, queue)
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    return StreamingResponse(
+        _task_progress_events(task_id, queue, progress),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+def get_report_file_path(report_id: str, report_type: Optional[str] = None) -> Optional[str]:
+    """
+    File path of a stored report, read on a pooled read-only connection
+
+    Args:
+        report_id: ReportDB ID, as given in the URL
+        report_type: Only match reports of this type (optional); the report
+            must also belong to a game
+
+    Returns:
+        The report's file path, or None if there is no such report
+    """
+    if not report_id.isdigit():
+        return None
+
+    if report_type is None:
+        query = """
+        SELECT r.file_path
+        FROM reports r
+        WHERE r.id = :report_id
+        """
+    else:
+        query = """
+        SELECT r.file_path
+        FROM reports r
+        JOIN games g ON r.game_id = g.id
+        WHERE r.id = :report_id AND r.report_type = :report_type
+        """
+
+    result = execute_query(query, {"report_id": int(report_id), "report_type": report_type})
+    return result[0]["file_path"] if result else None
+
+
 @router.get("/download/{task_id}")
 async def download_report(task_id: str):
     """
@@ -253,24 +527,14 @@ async def download_report(task_id: str):
         )
     else:
         # If not in processing_tasks, check if it's a report ID in the database
-        query = """
-        SELECT r.file_path
-        FROM reports r
-        WHERE r.id = %s
-        """
+        file_path = get_report_file_path(task_id)
 
-        result = execute_query(query, (task_id,))
-
-        if (
-            not result
-            or not result[0]["file_path"]
-            or not os.path.exists(result[0]["file_path"])
-        ):
+        if not file_path or not os.path.exists(file_path):
             raise HTTPException(status_code=404, detail="Report not found")
 
         return FileResponse(
-            path=result[0]["file_path"],
-            filename=os.path.basename(result[0]["file_path"]),
+            path=file_path,
+            filename=os.path.basename(file_path),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         )
 
@@ -301,27 +565,16 @@ async def download_team_analysis(task_id: str):
         )
     else:
         # If not in processing_tasks, check if it's a report ID in the database
-        query = """
-        SELECT r.file_path
-        FROM reports r
-        JOIN games g ON r.game_id = g.id
-        WHERE r.id = %s AND r.report_type = 'team_analysis'
-        """
-
-        result = execute_query(query, (task_id,))
+        file_path = get_report_file_path(task_id, "team_analysis")
 
-        if (
-            not result
-            or not result[0]["file_path"]
-            or not os.path.exists(result[0]["file_path"])
-        ):
+        if not file_path or not os.path.exists(file_path):
             raise HTTPException(
                 status_code=404, detail="Team analysis report not found"
             )
 
         return FileResponse(
-            path=result[0]["file_path"],
-            filename=os.path.basename(result[0]["file_path"]),
+            path=file_path,
+            filename=os.path.basename(file_path),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         )
 
@@ -352,27 +605,16 @@ async def download_opponent_analysis(task_id: str):
         )
     else:
         # If not in processing_tasks, check if it's a report ID in the database
-        query = """
-        SELECT r.file_path
-        FROM reports r
-        JOIN games g ON r.game_id = g.id
-        WHERE r.id = %s AND r.report_type = 'opponent_analysis'
-        """
-
-        result = execute_query(query, (task_id,))
+        file_path = get_report_file_path(task_id, "opponent_analysis")
 
-        if (
-            not result
-            or not result[0]["file_path"]
-            or not os.path.exists(result[0]["file_path"])
-        ):
+        if not file_path or not os.path.exists(file_path):
             raise HTTPException(
                 status_code=404, detail="Opponent analysis report not found"
             )
 
         return FileResponse(
-            path=result[0]["file_path"],
-            filename=os.path.basename(result[0]["file_path"]),
+            path=file_path,
+            filename=os.path.basename(file_path),
             media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         )
 
@@ -591,20 +833,36 @@ def generate_team_analysis_report(db, team_id: int) -> str:
     return report_path
 
 
+def set_task_step(db: Session, task_uuid: str, step: Optional[int] = None, status: str = "processing", **values):
+    """
+    Update a processing task's progress, without committing
+
+    Args:
+        db: SQLAlchemy database session
+        task_uuid: Task UUID
+        step: New step, unchanged if None
+        status: New status
+        **values: Other ProcessingTaskDB columns to set
+    """
+    if step is not None:
+        values["step"] = step
+    query = (
+        sqlalchemy.update(ProcessingTaskDB)
+        .where(ProcessingTaskDB.task_uuid == task_uuid)
+        .values(status=status, **values)
+    )
+    db.execute(query)
+
+
 def run_team_analysis(
     task_uuid: str, file_path: str, is_home_team: bool, team_name: str
 ):
     """
     Run the team analysis
     """
-    with database_context() as db:
-        query = (
-            sqlalchemy.update(ProcessingTaskDB)
-            .where(ProcessingTaskDB.task_uuid == task_uuid)
-            .values(step=0, status="processing")
-        )
-        db.execute(query)
-        db.commit()
+    with database_context() as db, UnitOfWork(db, task_uuid) as uow:
+        with uow.step("start team analysis"):
+            set_task_step(db, task_uuid, 0)
 
         print(f"DEBUG - Starting team analysis for {team_name} with file path {file_path}")
         # team_wrapper = analyze_team_pdf(file_path, is_our_team=is_home_team)
@@ -621,42 +879,13 @@ def run_team_analysis(
         if team_name:
             team_wrapper.team_details.team_name = team_name
 
-        query = (
-            sqlalchemy.update(ProcessingTaskDB)
-            .where(ProcessingTaskDB.task_uuid == task_uuid)
-            .values(step=1, status="processing")
-        )
-        db.execute(query)
-        db.commit()
-
-        # Insert teams into database
-        print(f"DEBUG - Inserting {team_label} team into database")
-        team_id = insert_team(db, team_wrapper.team_details)
-
-        print(f"DEBUG - {team_label} team ID: {team_id}")
-
-        # Insert team stats
-        print(f"DEBUG - Inserting {team_label} stats into database")
-        team_stats_id = insert_team_stats(db, team_id, team_wrapper.team_stats)
-        print(f"DEBUG - {team_label} Stats ID: {team_stats_id}")
-
-        print(f"DEBUG - Inserting {team_label} players and their stats into database")
-        for player in team_wrapper.team_details.players:
-            player_id = insert_player(db, team_id, player)
-            print(f"DEBUG - {team_label} Player ID: {player_id}, Name: {player.name}")
-            if player_id:
-                # Insert raw stats first
-                raw_stats_id = insert_player_raw_stats(db, player_id, player.stats)
-                print(f"DEBUG - {team_label} Player Raw Stats ID: {raw_stats_id}")
-                # Then insert processed stats with reference to raw stats
-                player_stats_id = insert_player_stats(
-                    db, player_id, player.stats, player_raw_stats_id=raw_stats_id
-                )
-                print(f"DEBUG - {team_label} Player Stats ID: {player_stats_id}")
-
-        print(f"DEBUG - Inserting {team_label} analysis into database")
-        team_analysis_id = insert_team_analysis(db, team_id, team_analysis)
-        print(f"DEBUG - {team_label} Analysis ID: {team_analysis_id}")
+        # Insert team, stats, players and analysis in a single transaction
+        print(f"DEBUG - Inserting {team_label} team, players and analysis into database")
+        with uow.step(f"store {team_label} team"):
+            team_id, team_stats_id, team_analysis_id = insert_team_wrapper(db, team_wrapper)
+            set_task_step(db, task_uuid, 1)
+        print(f"DEBUG - {team_label} team ID: {team_id}, Stats ID: {team_stats_id}, Analysis ID: {team_analysis_id}")
+        print(f"DEBUG - {team_label} players inserted: {len(team_wrapper.team_details.players)}")
 
         return team_id, team_stats_id, team_analysis_id
 
@@ -672,8 +901,11 @@ def process_files(
 ):
     """
     Process uploaded PDF files and generate a report
+
+    Each step's writes are committed together with the progress update that
+    follows them, so a failed run leaves no half-written step behind.
     """
-    with database_context() as db:
+    with database_context() as db, UnitOfWork(db, task_uuid) as uow:
         user = db.query(UserDB).filter(UserDB.id == user_id).first()
         processing_task_db = (
             db.query(ProcessingTaskDB)
@@ -686,18 +918,14 @@ def process_files(
         try:
             # Find team and opponent file paths
             team_id = processing_task_db.team_id
-            team_uuid = str(db.query(TeamDB.uuid).where(TeamDB.id == team_id).first().uuid)
+            team_row = db.query(TeamDB.uuid).where(TeamDB.id == team_id).first() if team_id is not None else None
+            team_uuid = str(team_row.uuid) if team_row else None
             team_file_path = processing_task_db.team_file_path
             opponent_file_path = processing_task_db.opponent_file_path
 
             if team_uuid is None and team_file_path is None:
-                sql_query = (
-                    sqlalchemy.update(ProcessingTaskDB)
-                    .where(ProcessingTaskDB.task_uuid == task_uuid)
-                    .values(team_uuid=team_uuid)
-                )
-                db.execute(sql_query)
-                db.commit()
+                with uow.step("record team"):
+                    set_task_step(db, task_uuid, team_uuid=team_uuid)
 
             if opponent_file_path is None:
                 raise ValueError("Could not identify opponent file")
@@ -730,13 +958,8 @@ def process_files(
                         opponent_result = opponent_future.result()
                     except Exception as e:
                         print(f"DEBUG - Error in team analysis: {e}")
-                        query = (
-                            sqlalchemy.update(ProcessingTaskDB)
-                            .where(ProcessingTaskDB.task_uuid == task_uuid)
-                            .values(step=0, status="failed")
-                        )
-                        db.execute(query)
-                        db.commit()
+                        with uow.step("mark team analysis failed"):
+                            set_task_step(db, task_uuid, 0, status="failed")
                         raise e
 
 
@@ -748,13 +971,8 @@ def process_files(
                 # fetch already existing stats for team, and do analysis for opponent
                 team_db = db.query(TeamDB.id).where(TeamDB.uuid == team_uuid).first()
                 if team_db is None:
-                    query = (
-                        sqlalchemy.update(ProcessingTaskDB)
-                        .where(ProcessingTaskDB.task_uuid == task_uuid)
-                        .values(step=0, status="failed")
-                    )
-                    db.execute(query)
-                    db.commit()
+                    with uow.step("mark missing team"):
+                        set_task_step(db, task_uuid, 0, status="failed")
                     raise ValueError("Team doesn't exist")
                 
                 team_id = team_db.id
@@ -782,59 +1000,48 @@ def process_files(
                     )
                 except Exception as e:
                     print(f"DEBUG - Error in opponent analysis: {e}")
-                    query = (
-                        sqlalchemy.update(ProcessingTaskDB)
-                        .where(ProcessingTaskDB.task_uuid == task_uuid)
-                        .values(step=0, status="failed")
-                    )
+                    with uow.step("mark opponent analysis failed"):
+                        set_task_step(db, task_uuid, 0, status="failed")
                     raise e
 
             # Insert game with user ID if available
             print("DEBUG - Inserting game into database")
             user_id = user.id
 
-            game_id, game_uuid = insert_game(db, team_id, opponent_id, user_id)
-            print(f"DEBUG - Game ID: {game_id}, Game UUID: {game_uuid}")
+            with uow.step("store game"):
+                game_id, game_uuid = insert_game(db, team_id, opponent_id, user_id)
+                print(f"DEBUG - Game ID: {game_id}, Game UUID: {game_uuid}")
 
-            # Set the game id for the team and opponent stats
-            update_team_stats_game_id(db, team_stats_id, game_id)
-            update_team_stats_game_id(db, opponent_stats_id, game_id)
+                # Set the game id for the team and opponent stats. A team
+                # reused from an earlier game gets a copy of its stats
+                link_team_stats_to_game(db, team_stats_id, game_id)
+                link_team_stats_to_game(db, opponent_stats_id, game_id)
 
-            # Step 5: Generate opponent analysis report
-            query = (
-                sqlalchemy.update(ProcessingTaskDB)
-                .where(ProcessingTaskDB.task_uuid == task_uuid)
-                .values(step=2, status="processing")
-            )
-            db.execute(query)
-            db.commit()
+                # Step 5: Generate opponent analysis report. The game is
+                # linked now, so its scouting report can be read right away
+                set_task_step(db, task_uuid, 2, game_id=game_id)
 
             team_analysis_path = generate_team_analysis_report(db, team_id)
             opponent_analysis_path = generate_team_analysis_report(
                 db, opponent_id
             )
 
-            # Insert reports
-            if game_id:
-                print("DEBUG - Inserting reports into database")
-                team_report_id, _ = insert_report(
-                    db, game_id, "team_analysis", team_analysis_path
-                )
-                opponent_report_id, _ = insert_report(
-                    db, game_id, "opponent_analysis", opponent_analysis_path
-                )
-                print(
-                    f"DEBUG - Team Report ID: {team_report_id}, Opponent Report ID: {opponent_report_id}"
-                )
+            with uow.step("store team reports"):
+                # Insert reports
+                if game_id:
+                    print("DEBUG - Inserting reports into database")
+                    team_report_id, _ = insert_report(
+                        db, game_id, "team_analysis", team_analysis_path
+                    )
+                    opponent_report_id, _ = insert_report(
+                        db, game_id, "opponent_analysis", opponent_analysis_path
+                    )
+                    print(
+                        f"DEBUG - Team Report ID: {team_report_id}, Opponent Report ID: {opponent_report_id}"
+                    )
 
-            # Step 6: Simulate game
-            query = (
-                sqlalchemy.update(ProcessingTaskDB)
-                .where(ProcessingTaskDB.task_uuid == task_uuid)
-                .values(step=3, status="processing")
-            )
-            db.execute(query)
-            db.commit()
+                # Step 6: Simulate game
+                set_task_step(db, task_uuid, 3)
 
             # with open("/Users/edoardo/programming/anova/simulation_results.json", "r") as f:
             #     simulation_results = GameSimulation.model_validate(json.load(f))
@@ -847,131 +1054,229 @@ def process_files(
             simulation_results_dict = simulation_results.model_dump(mode="json")
             # print("-"*40 + "\n" + "DEBUG - Simulation Results:", simulation_results)
 
-            # Insert game simulation
-            if game_id:
-                print("DEBUG - Inserting game simulation into database")
-                simulation_id = insert_game_simulation(db, game_id, simulation_results)
-                print(f"DEBUG - Simulation ID: {simulation_id}")
-
-                # If using local simulation, insert simulation details
-                if use_local_simulation and "numSimulations" in simulation_results:
-                    print("DEBUG - Inserting simulation details into database")
-                    simulation_details_id = insert_simulation_details(
+            with uow.step("store simulation"):
+                # Insert game simulation
+                if game_id:
+                    print("DEBUG - Inserting game simulation into database")
+                    simulation_id = insert_game_simulation(
                         db,
-                        simulation_id,
                         game_id,
-                        team_id,  # home team
-                        opponent_id,  # away team
-                        simulation_results_dict,
+                        simulation_results,
+                        model_name=GAME_SIMULATION_MODEL,
+                        prompt_version=get_game_simulation_prompt_version(),
                     )
-                    print(f"DEBUG - Simulation Details ID: {simulation_details_id}")
-
-                # Insert player projections
-                print("DEBUG - Inserting player projections into database")
-
-                # Process team player projections
-                for i in range(1, 7):  # Assuming up to 6 players
-                    player_key = f"team_p{i}_name"
-                    if player_key in simulation_results_dict:
-                        # Find player ID by name
-                        player_name = simulation_results_dict[f"team_p{i}_name"]
-                        player = find_player_by_name(db, player_name, team_id)
-
-                        if player:
-                            projection_data = {
-                                "ppg": simulation_results_dict.get(f"team_p{i}_ppg", 0),
-                                "rpg": simulation_results_dict.get(f"team_p{i}_rpg", 0),
-                                "apg": simulation_results_dict.get(f"team_p{i}_apg", 0),
-                                "fg": simulation_results_dict.get(
-                                    f"team_p{i}_fg", "0%"
-                                ),
-                                "3p": simulation_results_dict.get(
-                                    f"team_p{i}_3p", "0%"
-                                ),
-                                "role": simulation_results_dict.get(
-                                    f"team_p{i}_role", ""
-                                ),
-                            }
-
-                            projection_id = insert_player_projections(
-                                db,
-                                simulation_id,
-                                player.id,
-                                team_id,
-                                game_id,
-                                projection_data,
-                                True,  # is_home_team
-                            )
-                            print(
-                                f"DEBUG - Team Player Projection ID: {projection_id}, Player: {player_name}"
-                            )
-
-                # Process opponent player projections
-                for i in range(1, 7):  # Assuming up to 6 players
-                    player_key = f"opp_p{i}_name"
-                    if player_key in simulation_results_dict:
-                        # Find player ID by name
-                        player_name = simulation_results_dict[f"opp_p{i}_name"]
-                        player = find_player_by_name(db, player_name, opponent_id)
-
-                        if player:
-                            projection_data = {
-                                "ppg": simulation_results_dict.get(f"opp_p{i}_ppg", 0),
-                                "rpg": simulation_results_dict.get(f"opp_p{i}_rpg", 0),
-                                "apg": simulation_results_dict.get(f"opp_p{i}_apg", 0),
-                                "fg": simulation_results_dict.get(f"opp_p{i}_fg", "0%"),
-                                "3p": simulation_results_dict.get(f"opp_p{i}_3p", "0%"),
-                                "role": simulation_results_dict.get(
-                                    f"opp_p{i}_role", ""
-                                ),
-                            }
-
-                            projection_id = insert_player_projections(
-                                db,
-                                simulation_id,
-                                player.id,
-                                opponent_id,
-                                game_id,
-                                projection_data,
-                                False,  # is_home_team
-                            )
-                            print(
-                                f"DEBUG - Opponent Player Projection ID: {projection_id}, Player: {player_name}"
-                            )
-
-            # Step 7: Generate final report
-            print("DEBUG - Generating final report")
-            query = (
-                sqlalchemy.update(ProcessingTaskDB)
-                .where(ProcessingTaskDB.task_uuid == task_uuid)
-                .values(step=4, status="processing")
-            )
-            db.execute(query)
-            db.commit()
+                    print(f"DEBUG - Simulation ID: {simulation_id}")
+
+                    # If using local simulation, insert simulation details
+                    if use_local_simulation and "numSimulations" in simulation_results:
+                        print("DEBUG - Inserting simulation details into database")
+                        simulation_details_id = insert_simulation_details(
+                            db,
+                            simulation_id,
+                            game_id,
+                            team_id,  # home team
+                            opponent_id,  # away team
+                            simulation_results_dict,
+                        )
+                        print(f"DEBUG - Simulation Details ID: {simulation_details_id}")
+
+                    # Insert player projections
+                    print("DEBUG - Inserting player projections into database")
+
+                    # Resolve every projected name against both rosters at once
+                    player_ids = resolve_player_ids(
+                        db,
+                        {
+                            team_id: [
+                                simulation_results_dict[f"team_p{i}_name"]
+                                for i in range(1, 7)
+                                if f"team_p{i}_name" in simulation_results_dict
+                            ],
+                            opponent_id: [
+                                simulation_results_dict[f"opp_p{i}_name"]
+                                for i in range(1, 7)
+                                if f"opp_p{i}_name" in simulation_results_dict
+                            ],
+                        },
+                    )
+
+                    # Process team player projections
+                    for i in range(1, 7):  # Assuming up to 6 players
+                        player_key = f"team_p{i}_name"
+                        if player_key in simulation_results_dict:
+                            player_name = simulation_results_dict[f"team_p{i}_name"]
+                            player_id = player_ids[team_id].get(player_name)
+
+                            if player_id:
+                                projection_data = {
+                                    "ppg": simulation_results_dict.get(f"team_p{i}_ppg", 0),
+                                    "rpg": simulation_results_dict.get(f"team_p{i}_rpg", 0),
+                                    "apg": simulation_results_dict.get(f"team_p{i}_apg", 0),
+                                    "fg": simulation_results_dict.get(
+                                        f"team_p{i}_fg", "0%"
+                                    ),
+                                    "3p": simulation_results_dict.get(
+                                        f"team_p{i}_3p", "0%"
+                                    ),
+                                    "role": simulation_results_dict.get(
+                                        f"team_p{i}_role", ""
+                                    ),
+                                }
+
+                                with uow.savepoint(f"projection for {player_name}"):
+                                    projection_id = insert_player_projections(
+                                        db,
+                                        simulation_id,
+                                        player_id,
+                                        team_id,
+                                        game_id,
+                                        projection_data,
+                                        True,  # is_home_team
+                                    )
+                                    print(
+                                        f"DEBUG - Team Player Projection ID: {projection_id}, Player: {player_name}"
+                                    )
+
+                    # Process opponent player projections
+                    for i in range(1, 7):  # Assuming up to 6 players
+                        player_key = f"opp_p{i}_name"
+                        if player_key in simulation_results_dict:
+                            player_name = simulation_results_dict[f"opp_p{i}_name"]
+                            player_id = player_ids[opponent_id].get(player_name)
+
+                            if player_id:
+                                projection_data = {
+                                    "ppg": simulation_results_dict.get(f"opp_p{i}_ppg", 0),
+                                    "rpg": simulation_results_dict.get(f"opp_p{i}_rpg", 0),
+                                    "apg": simulation_results_dict.get(f"opp_p{i}_apg", 0),
+                                    "fg": simulation_results_dict.get(f"opp_p{i}_fg", "0%"),
+                                    "3p": simulation_results_dict.get(f"opp_p{i}_3p", "0%"),
+                                    "role": simulation_results_dict.get(
+                                        f"opp_p{i}_role", ""
+                                    ),
+                                }
+
+                                with uow.savepoint(f"projection for {player_name}"):
+                                    projection_id = insert_player_projections(
+                                        db,
+                                        simulation_id,
+                                        player_id,
+                                        opponent_id,
+                                        game_id,
+                                        projection_data,
+                                        False,  # is_home_team
+                                    )
+                                    print(
+                                        f"DEBUG - Opponent Player Projection ID: {projection_id}, Player: {player_name}"
+                                    )
+
+                    # Confidence bands from per-game lines, when the PDFs had them
+                    with uow.savepoint("projection bands"):
+                        attach_projection_bands(db, game_id)
+
+                # Step 7: Generate final report
+                set_task_step(db, task_uuid, 4)
 
+            print("DEBUG - Generating final report")
             report_path = generate_report(db, game_id)
-            report_id, _ = insert_report(db, game_id, "game_analysis", report_path)
-            print(f"DEBUG - Report ID: {report_id}")
+            with uow.step("store final report"):
+                report_id, _ = insert_report(db, game_id, "game_analysis", report_path)
+                print(f"DEBUG - Report ID: {report_id}")
 
-            query = (
-                sqlalchemy.update(ProcessingTaskDB)
-                .where(ProcessingTaskDB.task_uuid == task_uuid)
-                .values(step=5, status="completed", game_id=game_id)
-            )
-            db.execute(query)
-            db.commit()
+                # The report page is served from this snapshot from now on
+                with uow.savepoint("report snapshot"):
+                    write_report_snapshot(db, game_id)
+
+                # Count this last commit too
+                set_task_step(
+                    db, task_uuid, 5, status="completed", game_id=game_id, commit_count=uow.task_commit_count + 1
+                )
+            print(f"DEBUG - Task {task_uuid} completed with {uow.task_commit_count} commits")
 
         except Exception as e:
             # Update task status with error
-            query = (
-                sqlalchemy.update(ProcessingTaskDB)
-                .where(ProcessingTaskDB.task_uuid == task_uuid)
-                .values(status="failed")
-            )
-            db.execute(query)
+            with uow.step("mark task failed"):
+                set_task_step(db, task_uuid, status="failed", commit_count=uow.task_commit_count + 1)
             print("-" * 40)
             print(f"ERROR: {str(e)} : {traceback.format_exc()}")
+        finally:
+            uow.close(finished=True)
+
+
+def process_batch(
+    task_uuid: str,
+    user_id: int,
+    team_name: Optional[str],
+    children: List[Tuple[str, Optional[str]]],
+    use_local_simulation: bool = False,
+):
+    """
+    Process a batch upload: our team once, then every opponent concurrently
+
+    Our team is analyzed first, unless an existing team was chosen, and set on
+    every child task. Each child then runs process_files in its own thread,
+    reusing our team's stats and analysis. A child that fails doesn't stop the
+    others; the batch completes if any of its games did.
+
+    Args:
+        task_uuid: Task UUID of the batch task
+        user_id: ID of the user the games belong to
+        team_name: Name of our team (optional)
+        children: (task UUID, opponent name) of each child task
+        use_local_simulation: Simulate the games locally
+    """
+    child_uuids = [child_uuid for child_uuid, _ in children]
+    with database_context() as db, UnitOfWork(db, task_uuid) as uow:
+        try:
+            batch_task = db.query(ProcessingTaskDB).filter(ProcessingTaskDB.task_uuid == task_uuid).first()
+            team_id = batch_task.team_id
+            if team_id is None:
+                team_id, _, _ = run_team_analysis(task_uuid, batch_task.team_file_path, True, team_name)
+
+            with uow.step("share team"):
+                db.execute(
+                    sqlalchemy.update(ProcessingTaskDB)
+                    .where(ProcessingTaskDB.task_uuid.in_(child_uuids))
+                    .values(team_id=team_id)
+                )
+                set_task_step(db, task_uuid, 1, team_id=team_id)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(children)) as executor:
+                futures = {
+                    executor.submit(process_files, child_uuid, user_id, None, opponent_name, use_local_simulation): child_uuid
+                    for child_uuid, opponent_name in children
+                }
+                for future in concurrent.futures.as_completed(futures):
+                    # process_files marks its task failed itself, unless it
+                    # couldn't get that far
+                    if future.exception() is not None:
+                        print(f"ERROR: Batch game {futures[future]} failed: {future.exception()}")
+                        with uow.step("mark game failed"):
+                            set_task_step(db, futures[future], status="failed")
+
+            completed = (
+                db.query(ProcessingTaskDB.id)
+                .filter(ProcessingTaskDB.task_uuid.in_(child_uuids), ProcessingTaskDB.status == "completed")
+                .count()
+            )
+            with uow.step("finish batch"):
+                set_task_step(
+                    db, task_uuid, 5, status="completed" if completed else "failed", commit_count=uow.task_commit_count + 1
+                )
+            print(f"DEBUG - Batch {task_uuid} finished, {completed} of {len(children)} games completed")
 
+        except Exception as e:
+            # Our team couldn't be analyzed, so none of the games can be played
+            with uow.step("mark batch failed"):
+                db.execute(
+                    sqlalchemy.update(ProcessingTaskDB)
+                    .where(ProcessingTaskDB.task_uuid.in_([task_uuid, *child_uuids]), ProcessingTaskDB.status == "processing")
+                    .values(status="failed")
+                )
+            print("-" * 40)
+            print(f"ERROR: {str(e)} : {traceback.format_exc()}")
+        finally:
+            uow.close(finished=True)
 
 if __name__ == "__main__":
     processing_tasks["0d05182f-2088-418f-bd4e-fed202f8a271"] = {}
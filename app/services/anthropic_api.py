@@ -1,15 +1,25 @@
 import os
 import base64
+import hashlib
 import json
 import random
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import anthropic
 import logging
+import numpy as np
 import instructor
 from sqlalchemy.orm import Session
 from app.database.models import PlayerDB, PlayerStatsDB, TeamAnalysisDB, TeamDB, TeamStatsDB
 from app.llmmodels import GameSimulation, TeamAnalysis, TeamWrapper
+from app.services.simulation_engine import EFFECT_NAMES, EFFECT_WEIGHTS, matchup_effects, simulate_scores, team_vector_from_dict
+from app.services.simulation_stats import (
+    Histogram,
+    QuantileSketch,
+    RunningStats,
+    mean_interval,
+    proportion_interval,
+)
 from app.config import Config
 
 # Set up logging
@@ -23,6 +33,16 @@ client = anthropic.Anthropic(api_key=config.anthropics_api_key)
 client = instructor.from_anthropic(client)
 logger.info("Anthropic API client initialized")
 
+# Model used for game simulations, stored with every simulation for backtesting
+GAME_SIMULATION_MODEL = "claude-3-7-sonnet-20250219"
+
+# Absolute margin buckets reported in marginDistribution
+MARGIN_BUCKET_EDGES = [5, 10, 15, 20]
+MARGIN_BUCKET_LABELS = ["1-5 points", "6-10 points", "11-15 points", "16-20 points", "21+ points"]
+
+# Signed margin (team A - team B) histogram, 5 point bins between -40 and +40
+MARGIN_HISTOGRAM_EDGES = list(range(-40, 41, 5))
+
 def encode_pdf_to_base64(file_path: str) -> str:
     """
     Encode a PDF file to base64
@@ -277,8 +297,8 @@ def simulate_game_locally(team_analysis: Dict[str, Any], opponent_analysis: Dict
         "bpg": to_float(opponent_stats.get("BLK", 0))
     }
     
-    # Run simulations
-    return runSimulations(teamA, teamB, 100)
+    # Run simulations until the win probability and margin are precise enough
+    return runAdaptiveSimulations(teamA, teamB)
 
 def simulateGame(teamA: Dict[str, Any], teamB: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -296,31 +316,31 @@ def simulateGame(teamA: Dict[str, Any], teamB: Dict[str, Any]) -> Dict[str, Any]
     teamBScore = teamB["ppg"]
 
     # Calculate statistical advantages and their point impacts
-    # Rebounding advantage (each extra rebound = 0.7 points)
+    # Rebounding advantage (by default each extra rebound = 0.7 points)
     reboundDiff = teamA["rpg"] - teamB["rpg"]
-    reboundEffect = reboundDiff * 0.7
+    reboundEffect = reboundDiff * EFFECT_WEIGHTS["rebounding"]
 
     # Shooting efficiency advantages
     fgDiff = (teamA["fgPct"] - teamB["fgPct"]) * 100  # Convert to percentage points
-    fgEffect = fgDiff * 0.25  # Each percentage point = 0.25 points
+    fgEffect = fgDiff * EFFECT_WEIGHTS["fieldGoal"]  # Each percentage point = 0.25 points by default
 
     threeDiff = (teamA["threePct"] - teamB["threePct"]) * 100
-    threeEffect = threeDiff * 0.15  # Each percentage point = 0.15 points
+    threeEffect = threeDiff * EFFECT_WEIGHTS["threePoint"]  # Each percentage point = 0.15 points by default
 
-    # Turnover differential (each fewer turnover = 1 point)
+    # Turnover differential (by default each fewer turnover = 1 point)
     turnoverDiff = teamB["tpg"] - teamA["tpg"]
-    turnoverEffect = turnoverDiff * 1.0
+    turnoverEffect = turnoverDiff * EFFECT_WEIGHTS["turnovers"]
 
-    # Assist differential (each extra assist = 0.5 points)
+    # Assist differential (by default each extra assist = 0.5 points)
     assistDiff = teamA["apg"] - teamB["apg"]
-    assistEffect = assistDiff * 0.5
+    assistEffect = assistDiff * EFFECT_WEIGHTS["assists"]
 
     # Defensive impact from steals and blocks
     stealsDiff = teamA["spg"] - teamB["spg"]
-    stealsEffect = stealsDiff * 1.0
+    stealsEffect = stealsDiff * EFFECT_WEIGHTS["steals"]
 
     blocksDiff = teamA["bpg"] - teamB["bpg"]
-    blocksEffect = blocksDiff * 0.8
+    blocksEffect = blocksDiff * EFFECT_WEIGHTS["blocks"]
 
     # Calculate total statistical effect
     totalEffect = (reboundEffect + fgEffect + threeEffect + turnoverEffect +
@@ -358,9 +378,77 @@ def simulateGame(teamA: Dict[str, Any], teamB: Dict[str, Any]) -> Dict[str, Any]
         }
     }
 
+EFFECT_KEYS = ["rebounding", "fieldGoal", "threePoint", "turnovers", "assists", "steals", "blocks", "total"]
+
+
+def _new_accumulators() -> Dict[str, Any]:
+    """Streaming accumulators shared by runSimulations and runAdaptiveSimulations"""
+    return {
+        # Score tracking: mean/variance plus quantiles
+        "scoreStatsA": RunningStats(),
+        "scoreStatsB": RunningStats(),
+        "scoreSketchA": QuantileSketch(),
+        "scoreSketchB": QuantileSketch(),
+        # Margin tracking: signed margin (A - B) stats and fixed-bin histograms
+        "marginStats": RunningStats(),
+        "marginBuckets": Histogram(MARGIN_BUCKET_EDGES, labels=MARGIN_BUCKET_LABELS),
+        "marginHistogram": Histogram(MARGIN_HISTOGRAM_EDGES),
+        # Effects tracking
+        "effectStats": {effect: RunningStats() for effect in EFFECT_KEYS},
+    }
+
+
+def _summarize_simulations(
+    accumulators: Dict[str, Any],
+    numSimulations: int,
+    teamAWins: int,
+    teamBWins: int,
+    closestGame: Dict[str, Any],
+    blowoutGame: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build the simulation results dictionary from the streaming accumulators"""
+    # Calculate average scores
+    avgScoreA = round(accumulators["scoreStatsA"].mean * 10) / 10
+    avgScoreB = round(accumulators["scoreStatsB"].mean * 10) / 10
+
+    # Calculate win percentage
+    teamAWinPct = (teamAWins / numSimulations) * 100
+    teamBWinPct = (teamBWins / numSimulations) * 100
+
+    # Calculate average effects
+    avgEffects = {}
+    for effect, stats in accumulators["effectStats"].items():
+        avgEffects[effect] = round(stats.mean * 10) / 10
+
+    # Return comprehensive simulation results
+    return {
+        "numSimulations": numSimulations,
+        "teamAWins": teamAWins,
+        "teamBWins": teamBWins,
+        "teamAWinPct": round(teamAWinPct * 10) / 10,
+        "teamBWinPct": round(teamBWinPct * 10) / 10,
+        "avgScoreA": avgScoreA,
+        "avgScoreB": avgScoreB,
+        "closestGame": closestGame,
+        "blowoutGame": blowoutGame,
+        "marginDistribution": accumulators["marginBuckets"].to_distribution(),
+        "avgEffects": avgEffects,
+        "scoreDistribution": {
+            "teamA": {**accumulators["scoreStatsA"].to_dict(), **accumulators["scoreSketchA"].to_dict()},
+            "teamB": {**accumulators["scoreStatsB"].to_dict(), **accumulators["scoreSketchB"].to_dict()},
+        },
+        "marginStats": accumulators["marginStats"].to_dict(),
+        "marginHistogram": accumulators["marginHistogram"].to_dict(),
+        "effectStats": {effect: stats.to_dict() for effect, stats in accumulators["effectStats"].items()},
+    }
+
+
 def runSimulations(teamA: Dict[str, Any], teamB: Dict[str, Any], numSimulations: int = 100) -> Dict[str, Any]:
     """
     Run multiple simulations between two teams
+
+    Results are aggregated with streaming accumulators, so memory use stays
+    constant no matter how many simulations are run.
     
     Args:
         teamA: First team's statistics
@@ -370,30 +458,15 @@ def runSimulations(teamA: Dict[str, Any], teamB: Dict[str, Any], numSimulations:
     Returns:
         Dictionary containing aggregated simulation results
     """
-    results = []
     teamAWins = 0
     teamBWins = 0
-    totalPointsA = 0
-    totalPointsB = 0
     closestGame = {"margin": float('inf')}
     blowoutGame = {"margin": 0}
-
-    # Effects tracking
-    effectTotals = {
-        "rebounding": 0,
-        "fieldGoal": 0,
-        "threePoint": 0,
-        "turnovers": 0,
-        "assists": 0,
-        "steals": 0,
-        "blocks": 0,
-        "total": 0
-    }
+    accumulators = _new_accumulators()
 
     # Run the specified number of simulations
     for i in range(numSimulations):
         gameResult = simulateGame(teamA, teamB)
-        results.append(gameResult)
 
         # Track wins
         if gameResult["winner"] == teamA["name"]:
@@ -402,8 +475,15 @@ def runSimulations(teamA: Dict[str, Any], teamB: Dict[str, Any], numSimulations:
             teamBWins += 1
 
         # Track points
-        totalPointsA += gameResult["teamAScore"]
-        totalPointsB += gameResult["teamBScore"]
+        accumulators["scoreStatsA"].push(gameResult["teamAScore"])
+        accumulators["scoreStatsB"].push(gameResult["teamBScore"])
+        accumulators["scoreSketchA"].push(gameResult["teamAScore"])
+        accumulators["scoreSketchB"].push(gameResult["teamBScore"])
+
+        # Track margins
+        accumulators["marginStats"].push(gameResult["teamAScore"] - gameResult["teamBScore"])
+        accumulators["marginBuckets"].push(gameResult["margin"])
+        accumulators["marginHistogram"].push(gameResult["teamAScore"] - gameResult["teamBScore"])
 
         # Track closest game
         if gameResult["margin"] < closestGame["margin"]:
@@ -415,64 +495,132 @@ def runSimulations(teamA: Dict[str, Any], teamB: Dict[str, Any], numSimulations:
 
         # Track effect contributions
         for effect in gameResult["effects"]:
-            effectTotals[effect] += gameResult["effects"][effect]
+            accumulators["effectStats"][effect].push(gameResult["effects"][effect])
 
-    # Calculate average scores
-    avgScoreA = round(totalPointsA / numSimulations * 10) / 10
-    avgScoreB = round(totalPointsB / numSimulations * 10) / 10
+    return _summarize_simulations(accumulators, numSimulations, teamAWins, teamBWins, closestGame, blowoutGame)
 
-    # Calculate win percentage
-    teamAWinPct = (teamAWins / numSimulations) * 100
-    teamBWinPct = (teamBWins / numSimulations) * 100
 
-    # Calculate average effects
-    avgEffects = {}
-    for effect in effectTotals:
-        avgEffects[effect] = round((effectTotals[effect] / numSimulations) * 10) / 10
-
-    # Analyze the distribution of margins
-    marginBuckets = {
-        "1-5 points": 0,
-        "6-10 points": 0,
-        "11-15 points": 0,
-        "16-20 points": 0,
-        "21+ points": 0
-    }
+def runAdaptiveSimulations(
+    teamA: Dict[str, Any],
+    teamB: Dict[str, Any],
+    blockSize: Optional[int] = None,
+    maxSimulations: Optional[int] = None,
+    winPctTolerance: Optional[float] = None,
+    marginTolerance: Optional[float] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, Any]:
+    """
+    Run simulations in vectorized blocks until the results are precise enough
 
-    for game in results:
-        if game["margin"] <= 5:
-            marginBuckets["1-5 points"] += 1
-        elif game["margin"] <= 10:
-            marginBuckets["6-10 points"] += 1
-        elif game["margin"] <= 15:
-            marginBuckets["11-15 points"] += 1
-        elif game["margin"] <= 20:
-            marginBuckets["16-20 points"] += 1
-        else:
-            marginBuckets["21+ points"] += 1
-
-    # Calculate margin distribution percentages
-    marginDistribution = {}
-    for range_, count in marginBuckets.items():
-        marginDistribution[range_] = {
-            "count": count,
-            "percentage": round((count / numSimulations) * 1000) / 10
+    After every block the 95% confidence intervals on team A's win probability
+    and on the mean margin are checked; simulation stops once both half-widths
+    are within tolerance or maxSimulations is reached. Lopsided matchups stop
+    after the first block, close ones keep sampling.
+
+    Args:
+        teamA: First team's statistics
+        teamB: Second team's statistics
+        blockSize: Games per vectorized block (defaults to config)
+        maxSimulations: Simulation cap (defaults to config)
+        winPctTolerance: Win probability CI half-width, in percentage points (defaults to config)
+        marginTolerance: Mean margin CI half-width, in points (defaults to config)
+        rng: numpy random generator (optional)
+
+    Returns:
+        Same dictionary as runSimulations, plus "winPctCI" and "marginCI"
+        ({"lower", "upper"}) and "converged"
+    """
+    blockSize = blockSize or config.simulation_block_size
+    maxSimulations = maxSimulations or config.simulation_max_games
+    winPctTolerance = winPctTolerance if winPctTolerance is not None else config.simulation_win_pct_tolerance
+    marginTolerance = marginTolerance if marginTolerance is not None else config.simulation_margin_tolerance
+    rng = rng or np.random.default_rng()
+
+    vectorA = team_vector_from_dict(teamA)
+    vectorB = team_vector_from_dict(teamB)
+
+    # Statistical effects do not depend on the random draws
+    effectValues = dict(zip(EFFECT_NAMES, matchup_effects(vectorA, vectorB).tolist()))
+    effectValues["total"] = sum(effectValues.values())
+    effects = {effect: round(value * 10) / 10 for effect, value in effectValues.items()}
+
+    def gameResult(scoreA: int, scoreB: int, gameNumber: int) -> Dict[str, Any]:
+        return {
+            "teamAScore": scoreA,
+            "teamBScore": scoreB,
+            "winner": teamA["name"] if scoreA > scoreB else teamB["name"],
+            "margin": abs(scoreA - scoreB),
+            "effects": effects,
+            "gameNumber": gameNumber,
         }
 
-    # Return comprehensive simulation results
-    return {
-        "numSimulations": numSimulations,
-        "teamAWins": teamAWins,
-        "teamBWins": teamBWins,
-        "teamAWinPct": round(teamAWinPct * 10) / 10,
-        "teamBWinPct": round(teamBWinPct * 10) / 10,
-        "avgScoreA": avgScoreA,
-        "avgScoreB": avgScoreB,
-        "closestGame": closestGame,
-        "blowoutGame": blowoutGame,
-        "marginDistribution": marginDistribution,
-        "avgEffects": avgEffects
-    }
+    numSimulations = 0
+    teamAWins = 0
+    closestGame = {"margin": float('inf')}
+    blowoutGame = {"margin": 0}
+    accumulators = _new_accumulators()
+    converged = False
+
+    while numSimulations < maxSimulations:
+        size = min(blockSize, maxSimulations - numSimulations)
+        scoresA, scoresB = simulate_scores(vectorA, vectorB, size, rng)
+        margins = scoresA - scoresB
+        absMargins = np.abs(margins)
+
+        teamAWins += int((scoresA > scoresB).sum())
+        accumulators["scoreStatsA"].push_many(scoresA)
+        accumulators["scoreStatsB"].push_many(scoresB)
+        accumulators["scoreSketchA"].push_many(scoresA)
+        accumulators["scoreSketchB"].push_many(scoresB)
+        accumulators["marginStats"].push_many(margins)
+        accumulators["marginBuckets"].push_many(absMargins)
+        accumulators["marginHistogram"].push_many(margins)
+        for effect, value in effects.items():
+            accumulators["effectStats"][effect].push_many(np.full(size, value))
+
+        closest = int(absMargins.argmin())
+        if absMargins[closest] < closestGame["margin"]:
+            closestGame = gameResult(int(scoresA[closest]), int(scoresB[closest]), numSimulations + closest + 1)
+        blowout = int(absMargins.argmax())
+        if absMargins[blowout] > blowoutGame["margin"]:
+            blowoutGame = gameResult(int(scoresA[blowout]), int(scoresB[blowout]), numSimulations + blowout + 1)
+
+        numSimulations += size
+
+        winLower, winUpper = proportion_interval(teamAWins, numSimulations)
+        marginLower, marginUpper = mean_interval(accumulators["marginStats"])
+        if (winUpper - winLower) * 50 <= winPctTolerance and (marginUpper - marginLower) / 2 <= marginTolerance:
+            converged = True
+            break
+
+    logger.info(f"Adaptive simulation: {numSimulations} games, converged={converged}")
+
+    results = _summarize_simulations(
+        accumulators, numSimulations, teamAWins, numSimulations - teamAWins, closestGame, blowoutGame
+    )
+    results["winPctCI"] = {"lower": round(winLower * 1000) / 10, "upper": round(winUpper * 1000) / 10}
+    results["marginCI"] = {"lower": round(marginLower * 10) / 10, "upper": round(marginUpper * 10) / 10}
+    results["converged"] = converged
+    return results
+
+def _load_game_simulation_prompt() -> str:
+    """Read the game simulation prompt template"""
+    prompt_path = os.path.join(f"{config.base_dir}/app/prompts", "game_simulation_prompt.txt")
+    with open(prompt_path, "r") as file:
+        return file.read()
+
+
+def get_game_simulation_prompt_version() -> str:
+    """
+    Short content hash of the game simulation prompt
+
+    Stored with every simulation so backtests can compare prompt revisions.
+
+    Returns:
+        First 12 hex characters of the prompt's SHA-256
+    """
+    return hashlib.sha256(_load_game_simulation_prompt().encode("utf-8")).hexdigest()[:12]
+
 
 def simulate_game(
         db: Session,
@@ -497,9 +645,7 @@ def simulate_game(
         # return simulate_game_locally(team_analysis, opponent_analysis)
         
     # Load prompt template
-    prompt_path = os.path.join(f"{config.base_dir}/app/prompts", "game_simulation_prompt.txt")
-    with open(prompt_path, "r") as file:
-        prompt_template = file.read()
+    prompt_template = _load_game_simulation_prompt()
     
     team_db = db.query(TeamDB).filter(TeamDB.id == team_id).first()
     opponent_db = db.query(TeamDB).filter(TeamDB.id == opponent_id).first()
@@ -523,7 +669,7 @@ def simulate_game(
 
     # Create message
     message = client.messages.create(
-        model="claude-3-7-sonnet-20250219",
+        model=GAME_SIMULATION_MODEL,
         max_tokens=8000,
         temperature=0.2,  # Slightly higher temperature for simulation variety
         system="You are an expert basketball analyst and simulator. You are simulating a game between two basketball teams based on their statistics.",
@@ -0,0 +1,214 @@
+import datetime
+import logging
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, and_, case, cast, func, select, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.database.common import database_context
+from app.database.models import BacktestResultDB, GameDB, GameSimulationDB
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Patterns used to read numbers out of the free-text projections, e.g.
+# "Team A has a 62% win probability based on 100 simulations." and
+# "Team A 58 - Team B 52" / "Team A 78 - 72 Team B". They are valid both as
+# Python and PostgreSQL regular expressions, the first group being the value.
+# Scores are split on " - ", so hyphenated names like "Winston-Salem" stay
+# whole, and each side's score is its last number that isn't part of a word,
+# so names like "76ers" are skipped.
+WIN_PROBABILITY_PATTERN = r"([0-9]+(?:\.[0-9]+)?)\s*%"
+TEAM_SCORE_PATTERN = r"(?<![0-9A-Za-z.])([0-9]+(?:\.[0-9]+)?)(?![0-9A-Za-z])[^0-9]*? - "
+OPPONENT_SCORE_PATTERN = r" - (?:.*[^0-9A-Za-z.])?([0-9]+(?:\.[0-9]+)?)(?![0-9A-Za-z])"
+
+# Part of every results fingerprint; bump it when the parsing above changes,
+# so cached results computed with the old patterns are recomputed
+PARSER_VERSION = "2"
+
+# Simulations stored before model/prompt tracking are grouped under this version
+UNKNOWN_VERSION = "unknown"
+
+CALIBRATION_BINS = 10
+
+
+def parse_projection(win_probability: Optional[str], projected_score: Optional[str]) -> Dict[str, Optional[float]]:
+    """
+    Parse a stored projection the same way the backtest query does
+
+    Args:
+        win_probability: GameSimulationDB.win_probability text
+        projected_score: GameSimulationDB.projected_score text
+
+    Returns:
+        Dictionary with win_probability (0-1), team_score and opponent_score,
+        None for anything that could not be parsed
+    """
+    def first_group(pattern: str, text: Optional[str]) -> Optional[float]:
+        match = re.search(pattern, text or "")
+        return float(match.group(1)) if match else None
+
+    probability = first_group(WIN_PROBABILITY_PATTERN, win_probability)
+    return {
+        "win_probability": probability / 100 if probability is not None else None,
+        "team_score": first_group(TEAM_SCORE_PATTERN, projected_score),
+        "opponent_score": first_group(OPPONENT_SCORE_PATTERN, projected_score),
+    }
+
+
+def _backtest_rows():
+    """One row per simulated game with a result: parsed projection next to the actual score"""
+    win_probability = cast(func.substring(GameSimulationDB.win_probability, WIN_PROBABILITY_PATTERN), Float) / 100
+    projected_margin = (
+        cast(func.substring(GameSimulationDB.projected_score, TEAM_SCORE_PATTERN), Float)
+        - cast(func.substring(GameSimulationDB.projected_score, OPPONENT_SCORE_PATTERN), Float)
+    )
+    return (
+        select(
+            GameSimulationDB.id.label("simulation_id"),
+            func.coalesce(GameSimulationDB.model_name, UNKNOWN_VERSION).label("model_name"),
+            func.coalesce(GameSimulationDB.prompt_version, UNKNOWN_VERSION).label("prompt_version"),
+            win_probability.label("win_probability"),
+            projected_margin.label("projected_margin"),
+            (GameDB.home_score - GameDB.away_score).label("actual_margin"),
+            cast(case((GameDB.home_score > GameDB.away_score, 1), else_=0), Float).label("outcome"),
+            GameDB.home_score,
+            GameDB.away_score,
+        )
+        .join(GameDB, GameDB.id == GameSimulationDB.game_id)
+        .where(GameDB.home_score.isnot(None), GameDB.away_score.isnot(None))
+        .cte("backtest_rows")
+    )
+
+
+def _fingerprints(db: Session, rows) -> Dict[Tuple[str, str], Tuple[int, str]]:
+    """Game count and a hash of the simulations and results behind each model/prompt version"""
+    fingerprint = func.md5(func.concat(PARSER_VERSION, "|", func.string_agg(
+        func.concat_ws(":", rows.c.simulation_id, rows.c.home_score, rows.c.away_score),
+        aggregate_order_by(",", rows.c.simulation_id),
+    )))
+    query = (
+        select(rows.c.model_name, rows.c.prompt_version, func.count(), fingerprint)
+        .group_by(rows.c.model_name, rows.c.prompt_version)
+    )
+    return {(model, prompt): (count, digest) for model, prompt, count, digest in db.execute(query)}
+
+
+def _compute_metrics(db: Session, rows, versions: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Brier score, accuracy, margin errors and calibration bins for the given versions"""
+    version_filter = tuple_(rows.c.model_name, rows.c.prompt_version).in_(versions)
+    margin_error = rows.c.projected_margin - rows.c.actual_margin
+    correct = cast(case(
+        (rows.c.win_probability.is_(None), None),
+        (and_(rows.c.win_probability > 0.5, rows.c.outcome == 1), 1),
+        (and_(rows.c.win_probability < 0.5, rows.c.outcome == 0), 1),
+        else_=0,
+    ), Float)
+
+    summary_query = (
+        select(
+            rows.c.model_name,
+            rows.c.prompt_version,
+            func.avg(func.power(rows.c.win_probability - rows.c.outcome, 2)),
+            func.avg(correct) * 100,
+            func.avg(func.abs(margin_error)),
+            func.sqrt(func.avg(margin_error * margin_error)),
+            func.avg(margin_error),
+        )
+        .where(version_filter)
+        .group_by(rows.c.model_name, rows.c.prompt_version)
+    )
+    metrics = {}
+    for model, prompt, brier, accuracy, mae, rmse, bias in db.execute(summary_query):
+        metrics[(model, prompt)] = {
+            "brier_score": brier,
+            "win_accuracy": accuracy,
+            "margin_mae": mae,
+            "margin_rmse": rmse,
+            "margin_bias": bias,
+            "calibration": [],
+        }
+
+    calibration_bin = func.least(
+        cast(func.floor(rows.c.win_probability * CALIBRATION_BINS), Integer), CALIBRATION_BINS - 1
+    ).label("bin")
+    calibration_query = (
+        select(
+            rows.c.model_name,
+            rows.c.prompt_version,
+            calibration_bin,
+            func.count(),
+            func.avg(rows.c.win_probability),
+            func.avg(rows.c.outcome),
+        )
+        .where(version_filter, rows.c.win_probability.isnot(None))
+        .group_by(rows.c.model_name, rows.c.prompt_version, calibration_bin)
+        .order_by(rows.c.model_name, rows.c.prompt_version, calibration_bin)
+    )
+    for model, prompt, bin_index, count, predicted, observed in db.execute(calibration_query):
+        metrics[(model, prompt)]["calibration"].append({
+            "bin_lower": bin_index / CALIBRATION_BINS,
+            "bin_upper": (bin_index + 1) / CALIBRATION_BINS,
+            "count": count,
+            "predicted": round(predicted, 4),
+            "observed": round(observed, 4),
+        })
+    return metrics
+
+
+def run_backtest(db: Session) -> List[BacktestResultDB]:
+    """
+    Compare stored projections with actual results, per model and prompt version
+
+    Parsing, joining and aggregation all happen in the database. Versions whose
+    simulations and results are unchanged since the last run keep their cached
+    BacktestResultDB row; only the others are recomputed.
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        List of BacktestResultDB objects, one per model/prompt version
+    """
+    rows = _backtest_rows()
+    fingerprints = _fingerprints(db, rows)
+    cached = {(result.model_name, result.prompt_version): result for result in db.query(BacktestResultDB).all()}
+
+    stale = [
+        version for version, (_, digest) in fingerprints.items()
+        if version not in cached or cached[version].results_fingerprint != digest
+    ]
+    logger.info(f"Backtest: {len(fingerprints)} versions, {len(stale)} to recompute")
+
+    if stale:
+        metrics = _compute_metrics(db, rows, stale)
+        for version in stale:
+            result = cached.get(version)
+            if result is None:
+                result = BacktestResultDB(model_name=version[0], prompt_version=version[1])
+                db.add(result)
+                cached[version] = result
+            result.num_games, result.results_fingerprint = fingerprints[version]
+            for field, value in metrics[version].items():
+                setattr(result, field, value)
+            result.updated_at = datetime.datetime.now(datetime.timezone.utc)
+        db.commit()
+
+    return [cached[version] for version in sorted(fingerprints)]
+
+
+def run_backtest_job():
+    """Background job entry point: run the backtest in its own session"""
+    with database_context() as db:
+        try:
+            run_backtest(db)
+        except Exception as e:
+            logger.error(f"Backtest failed: {e}")
+            db.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    run_backtest_job()
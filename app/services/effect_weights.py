@@ -0,0 +1,151 @@
+import argparse
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database.common import database_context
+from app.database.connection import get_active_simulation_weights, get_completed_game_team_stats
+from app.database.models import SimulationWeightsDB
+from app.services.simulation_engine import (
+    DEFAULT_EFFECT_WEIGHTS,
+    EFFECT_NAMES,
+    EFFECT_WEIGHTS,
+    PPG,
+    matchup_diffs,
+    set_effect_weights,
+    team_vector,
+)
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Strength of the pull towards the default weights, in games
+DEFAULT_REGULARIZATION = 10.0
+
+# Fewer completed games than this cannot produce a meaningful fit
+MIN_FIT_GAMES = 10
+
+
+def build_design_matrix(games: List[Tuple[Any, Any, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build the least-squares problem from completed games
+
+    The engine predicts margin = (home ppg - away ppg) + weights . diffs, so the
+    target is the part of the actual margin not explained by scoring averages.
+
+    Args:
+        games: (GameDB, home TeamStatsDB, away TeamStatsDB) tuples
+
+    Returns:
+        (X, y): stat differentials of shape (n, len(EFFECT_NAMES)) and residual margins of shape (n,)
+    """
+    home = np.vstack([team_vector(home_stats) for _, home_stats, _ in games])
+    away = np.vstack([team_vector(away_stats) for _, _, away_stats in games])
+    margins = np.array([game.home_score - game.away_score for game, _, _ in games], dtype=float)
+    return matchup_diffs(home, away), margins - (home[:, PPG] - away[:, PPG])
+
+
+def fit_weights(
+    X: np.ndarray,
+    y: np.ndarray,
+    regularization: float = DEFAULT_REGULARIZATION,
+    prior: Optional[Dict[str, float]] = None,
+) -> Dict[str, float]:
+    """
+    Ridge regression shrunk towards prior weights
+
+    Minimizes ||y - X w||^2 + regularization * ||w - prior||^2, so with few games
+    the weights stay close to the prior and with many games the data wins.
+
+    Args:
+        X: Design matrix of shape (n, len(EFFECT_NAMES))
+        y: Target vector of shape (n,)
+        regularization: Strength of the pull towards the prior
+        prior: Prior weights (defaults to DEFAULT_EFFECT_WEIGHTS)
+
+    Returns:
+        Dictionary of fitted weights keyed by effect name
+    """
+    prior = prior or DEFAULT_EFFECT_WEIGHTS
+    prior_vector = np.array([prior[name] for name in EFFECT_NAMES])
+    penalty = regularization * np.eye(len(EFFECT_NAMES))
+    weights = np.linalg.solve(X.T @ X + penalty, X.T @ y + penalty @ prior_vector)
+    return dict(zip(EFFECT_NAMES, weights.tolist()))
+
+
+def fit_effect_weights(
+    db: Session,
+    regularization: float = DEFAULT_REGULARIZATION,
+    activate: bool = True,
+) -> SimulationWeightsDB:
+    """
+    Fit the effect weights on every completed game and store them as a new version
+
+    Args:
+        db: SQLAlchemy database session
+        regularization: Strength of the pull towards the default weights
+        activate: Make the new version the active one
+
+    Returns:
+        The new SimulationWeightsDB version
+    """
+    games = get_completed_game_team_stats(db)
+    if len(games) < MIN_FIT_GAMES:
+        raise ValueError(f"Need at least {MIN_FIT_GAMES} completed games with team stats, found {len(games)}")
+
+    X, y = build_design_matrix(games)
+    weights = fit_weights(X, y, regularization)
+    residuals = y - X @ np.array([weights[name] for name in EFFECT_NAMES])
+    rmse = float(np.sqrt(np.mean(residuals ** 2)))
+
+    if activate:
+        db.query(SimulationWeightsDB).filter(SimulationWeightsDB.is_active.is_(True)).update({"is_active": False})
+    latest_version = db.query(func.max(SimulationWeightsDB.version)).scalar() or 0
+    simulation_weights = SimulationWeightsDB(
+        version=latest_version + 1,
+        weights={name: round(value, 4) for name, value in weights.items()},
+        regularization=regularization,
+        num_games=len(games),
+        rmse=rmse,
+        is_active=activate,
+    )
+    db.add(simulation_weights)
+    db.commit()
+    db.refresh(simulation_weights)
+
+    logger.info(f"Fitted simulation weights v{simulation_weights.version} on {len(games)} games, RMSE {rmse:.2f}")
+    return simulation_weights
+
+
+def load_active_effect_weights(db: Session) -> Optional[int]:
+    """
+    Load the active fitted weights into the simulation engine
+
+    Args:
+        db: SQLAlchemy database session
+
+    Returns:
+        The loaded version, or None when no version is active and the defaults are used
+    """
+    simulation_weights = get_active_simulation_weights(db)
+    if simulation_weights is None:
+        set_effect_weights(DEFAULT_EFFECT_WEIGHTS)
+        logger.info("No active simulation weights, using defaults")
+        return None
+
+    set_effect_weights(simulation_weights.weights)
+    logger.info(f"Loaded simulation weights v{simulation_weights.version}: {EFFECT_WEIGHTS}")
+    return simulation_weights.version
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the local simulation effect weights from completed games")
+    parser.add_argument("--regularization", type=float, default=DEFAULT_REGULARIZATION)
+    parser.add_argument("--no-activate", action="store_true", help="Store the new version without activating it")
+    args = parser.parse_args()
+
+    with database_context() as db:
+        fit_effect_weights(db, args.regularization, activate=not args.no_activate)
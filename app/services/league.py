@@ -0,0 +1,124 @@
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_latest_team_stats_for_teams, get_league_matrix
+from app.database.models import LeagueMatrixDB, TeamDB
+from app.services.simulation_engine import simulate_matchups, team_vector
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEAGUE_SIMULATIONS = 2000
+
+
+def _vector_key(vector: np.ndarray) -> List[float]:
+    """Rounded list form of a team vector, used to detect changed stats"""
+    return [round(float(value), 4) for value in vector]
+
+
+def rank_teams(matrix: np.ndarray, team_ids: List[int], team_names: Dict[int, str]) -> List[Dict[str, Any]]:
+    """
+    Rank teams by their average win probability against every other team
+
+    Both orderings of each matchup are used, so a team's strength is the mean of
+    P(team beats opponent) and 1 - P(opponent beats team).
+
+    Args:
+        matrix: Win-probability matrix in percent, rows are team A, NaN diagonal
+        team_ids: Team IDs in matrix order
+        team_names: Mapping from team ID to team name
+
+    Returns:
+        List of rankings, strongest team first
+    """
+    if len(team_ids) < 2:
+        return [{"rank": 1, "team_id": team_id, "team_name": team_names.get(team_id), "avg_win_probability": None}
+                for team_id in team_ids]
+
+    strength = np.nanmean((matrix + (100 - matrix.T)) / 2, axis=1)
+    order = np.argsort(-strength, kind="stable")
+    return [
+        {
+            "rank": rank,
+            "team_id": team_ids[index],
+            "team_name": team_names.get(team_ids[index]),
+            "avg_win_probability": round(float(strength[index]), 1),
+        }
+        for rank, index in enumerate(order, start=1)
+    ]
+
+
+def build_league_matrix(
+    db: Session,
+    user_id: int,
+    team_ids: List[int],
+    num_simulations: int = DEFAULT_LEAGUE_SIMULATIONS,
+    name: Optional[str] = None,
+) -> Tuple[LeagueMatrixDB, List[int]]:
+    """
+    Simulate every ordered pair of teams and store the win-probability matrix
+
+    The previous matrix for the same user and team set is reused: only the rows
+    and columns of teams whose latest team stats changed are simulated again.
+
+    Args:
+        db: SQLAlchemy database session
+        user_id: User ID the matrix belongs to
+        team_ids: TeamDB IDs to include
+        num_simulations: Number of games simulated per ordered pair
+        name: Optional label for the league
+
+    Returns:
+        (LeagueMatrixDB, list of team IDs whose rows/columns were recomputed)
+    """
+    team_ids = sorted(set(team_ids))
+    latest_stats = get_latest_team_stats_for_teams(db, team_ids)
+    missing = [team_id for team_id in team_ids if team_id not in latest_stats]
+    if missing:
+        raise ValueError(f"No team stats found for teams {missing}")
+
+    vectors = np.vstack([team_vector(latest_stats[team_id]) for team_id in team_ids])
+    vector_keys = {str(team_id): _vector_key(vector) for team_id, vector in zip(team_ids, vectors)}
+
+    league_matrix = get_league_matrix(db, user_id, team_ids)
+    if league_matrix is not None and league_matrix.num_simulations == num_simulations:
+        matrix = np.array(league_matrix.win_probabilities, dtype=float)
+        changed = [
+            index for index, team_id in enumerate(team_ids)
+            if (league_matrix.team_vectors or {}).get(str(team_id)) != vector_keys[str(team_id)]
+        ]
+    else:
+        matrix = np.full((len(team_ids), len(team_ids)), np.nan)
+        changed = list(range(len(team_ids)))
+
+    # Every ordered pair touching a changed team, in one vectorized run
+    is_changed = np.zeros(len(team_ids), dtype=bool)
+    is_changed[changed] = True
+    rows, cols = np.nonzero(is_changed[:, None] | is_changed[None, :])
+    off_diagonal = rows != cols
+    rows, cols = rows[off_diagonal], cols[off_diagonal]
+
+    if len(rows):
+        results = simulate_matchups(vectors[rows], vectors[cols], num_simulations)
+        matrix[rows, cols] = np.round(results["win_prob"] * 100, 1)
+    logger.info(f"League matrix: simulated {len(rows)} matchups for {len(changed)} changed teams")
+
+    team_names = dict(db.query(TeamDB.id, TeamDB.name).filter(TeamDB.id.in_(team_ids)).all())
+    rankings = rank_teams(matrix, team_ids, team_names)
+    win_probabilities = [[None if np.isnan(value) else float(value) for value in row] for row in matrix]
+
+    if league_matrix is None:
+        league_matrix = LeagueMatrixDB(user_id=user_id, team_ids=team_ids)
+        db.add(league_matrix)
+    league_matrix.name = name or league_matrix.name
+    league_matrix.team_vectors = vector_keys
+    league_matrix.num_simulations = num_simulations
+    league_matrix.win_probabilities = win_probabilities
+    league_matrix.rankings = rankings
+    db.commit()
+    db.refresh(league_matrix)
+
+    return league_matrix, [team_ids[index] for index in changed]
@@ -0,0 +1,161 @@
+import itertools
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.services.simulation_engine import (
+    APG,
+    BPG,
+    FG_PCT,
+    PPG,
+    RPG,
+    SPG,
+    STAT_FIELDS,
+    THREE_PCT,
+    TPG,
+    _to_float,
+    matchup_effects,
+    simulate_matchups,
+)
+
+LINEUP_SIZE = 5
+
+# Players averaging fewer minutes are treated as playing this many, so a few
+# productive minutes off the bench don't turn into inflated full-game rates
+MINUTES_FLOOR = 10.0
+
+# PlayerStatsDB columns summed into a lineup vector, by team vector position
+COUNTING_STATS = {PPG: "ppg", RPG: "rpg", TPG: "topg", APG: "apg", SPG: "spg", BPG: "bpg"}
+
+
+def player_rates(player_stats: List, game_minutes: float) -> np.ndarray:
+    """
+    Full-game rates of each player, as if they played every minute
+
+    Args:
+        player_stats: PlayerStatsDB rows (or objects with the same attributes)
+        game_minutes: Length of regulation time in minutes
+
+    Returns:
+        Array of shape (players, len(STAT_FIELDS)) in team vector layout;
+        counting stats are per full game, percentages are fractions
+    """
+    rates = np.zeros((len(player_stats), len(STAT_FIELDS)))
+    for i, stats in enumerate(player_stats):
+        minutes = _to_float(stats.minutes)
+        scale = game_minutes / max(minutes, MINUTES_FLOOR) if minutes > 0 else 1.0
+        for index, column in COUNTING_STATS.items():
+            rates[i, index] = _to_float(getattr(stats, column)) * scale
+        rates[i, FG_PCT] = _to_float(stats.fg_pct) / 100
+        rates[i, THREE_PCT] = _to_float(stats.fg3_pct) / 100
+    return rates
+
+
+def lineup_vectors(rates: np.ndarray, combinations: np.ndarray) -> np.ndarray:
+    """
+    Team vectors of many lineups at once
+
+    Counting stats are summed over the five players; shooting percentages are
+    averaged, weighted by each player's scoring.
+
+    Args:
+        rates: Player rates from player_rates, shape (players, len(STAT_FIELDS))
+        combinations: Player indices of each lineup, shape (lineups, LINEUP_SIZE)
+
+    Returns:
+        Array of shape (lineups, len(STAT_FIELDS))
+    """
+    members = rates[combinations]
+    vectors = members.sum(axis=1)
+
+    points = members[..., PPG]
+    total_points = points.sum(axis=1, keepdims=True)
+    weights = np.divide(points, total_points, out=np.full_like(points, 1 / LINEUP_SIZE), where=total_points > 0)
+    vectors[:, FG_PCT] = (members[..., FG_PCT] * weights).sum(axis=1)
+    vectors[:, THREE_PCT] = (members[..., THREE_PCT] * weights).sum(axis=1)
+    return vectors
+
+
+def rank_lineups(
+    rates: np.ndarray,
+    opponent: np.ndarray,
+    top_k: int = 0,
+    num_simulations: int = 0,
+    num_results: int = 10,
+    rng: Optional[np.random.Generator] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Score every 5-man lineup against an opponent and return the best ones
+
+    All combinations are scored in one vectorized pass by their projected net
+    rating: expected points plus matchup effects minus the opponent's points,
+    over a full game. The top_k lineups can then be refined with the local
+    simulator, which also gives a win probability, and are re-ranked by it.
+
+    Args:
+        rates: Player rates from player_rates
+        opponent: Opponent team vector
+        top_k: Number of best lineups to refine with the simulator (0 to skip)
+        num_simulations: Games simulated per refined lineup
+        num_results: Number of lineups to return
+        rng: numpy random generator (optional)
+
+    Returns:
+        List of lineups, best first, each with player indices, net_rating,
+        projected_points and, when refined, win_probability and simulated_margin
+    """
+    combinations = np.array(list(itertools.combinations(range(len(rates)), LINEUP_SIZE)), dtype=int)
+    vectors = lineup_vectors(rates, combinations)
+    opponents = np.broadcast_to(opponent, vectors.shape)
+    projected_points = vectors[:, PPG] + matchup_effects(vectors, opponents).sum(axis=1)
+    net_rating = projected_points - opponent[PPG]
+
+    order = np.argsort(-net_rating, kind="stable")
+    refined = {}
+    if top_k and num_simulations:
+        candidates = order[:top_k]
+        results = simulate_matchups(
+            vectors[candidates], opponents[candidates], num_simulations, rng=rng, common_random_numbers=True
+        )
+        refined = {
+            int(candidate): (float(results["win_prob"][i]), float(results["avg_margin"][i]))
+            for i, candidate in enumerate(candidates)
+        }
+        candidates = sorted(candidates, key=lambda candidate: (-refined[candidate][0], -net_rating[candidate]))
+        order = np.concatenate([np.array(candidates, dtype=int), order[top_k:]])
+
+    lineups = []
+    for index in order[:num_results]:
+        lineup = {
+            "players": [int(player) for player in combinations[index]],
+            "net_rating": round(float(net_rating[index]), 1),
+            "projected_points": round(float(projected_points[index]), 1),
+            "win_probability": None,
+            "simulated_margin": None,
+        }
+        if int(index) in refined:
+            win_prob, margin = refined[int(index)]
+            lineup["win_probability"] = round(win_prob * 100, 1)
+            lineup["simulated_margin"] = round(margin, 1)
+        lineups.append(lineup)
+    return lineups
+
+
+def rotation(lineups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Players ordered by how often they appear in the best lineups
+
+    Args:
+        lineups: Ranked lineups from rank_lineups
+
+    Returns:
+        List of player indices with their share of the lineups, in percent
+    """
+    counts: Dict[int, int] = {}
+    for lineup in lineups:
+        for player in lineup["players"]:
+            counts[player] = counts.get(player, 0) + 1
+    return [
+        {"player": player, "lineup_share": round(count / len(lineups) * 100, 1)}
+        for player, count in sorted(counts.items(), key=lambda item: -item[1])
+    ]
@@ -0,0 +1,150 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from app.services.simulation_engine import PPG, _to_float, matchup_effects, team_vector
+
+# Maximum number of games whose rate tables are kept in memory
+RATE_TABLE_CACHE_SIZE = 512
+
+# Ties still unresolved after this many overtimes are split evenly
+MAX_OVERTIMES = 10
+
+# Used when a team's made-shot counts are missing
+DEFAULT_POINTS_PER_SCORE = 2.0
+
+_rate_tables: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_rate_tables_lock = threading.Lock()
+
+
+def points_per_score(stats) -> float:
+    """
+    Average points per scoring play (made field goal or free throw)
+
+    Args:
+        stats: TeamStatsDB row
+
+    Returns:
+        Points per scoring play, between 1 and 3
+    """
+    fg_made = _to_float(getattr(stats, "fg_made", None))
+    fg3_made = _to_float(getattr(stats, "fg3_made", None))
+    ft_made = _to_float(getattr(stats, "ft_made", None))
+    if fg_made + ft_made <= 0:
+        return DEFAULT_POINTS_PER_SCORE
+    points = 2 * (fg_made - fg3_made) + 3 * fg3_made + ft_made
+    return float(np.clip(points / (fg_made + ft_made), 1.0, 3.0))
+
+
+def build_rate_table(team_stats, opponent_stats, regulation_minutes: float) -> np.ndarray:
+    """
+    Per-minute scoring rates for both teams of a game
+
+    Expected points use the same matchup effects as the full-game simulation,
+    spread evenly over regulation time.
+
+    Args:
+        team_stats: TeamStatsDB row for our team
+        opponent_stats: TeamStatsDB row for the opponent
+        regulation_minutes: Length of regulation time in minutes
+
+    Returns:
+        Array of shape (2, 2): one row per team (team, opponent) with
+        [points per minute, points per scoring play]
+    """
+    team = team_vector(team_stats)
+    opponent = team_vector(opponent_stats)
+    expected_team = team[PPG] + matchup_effects(team, opponent).sum()
+    expected_opponent = opponent[PPG]
+    return np.array([
+        [max(expected_team, 0.0) / regulation_minutes, points_per_score(team_stats)],
+        [max(expected_opponent, 0.0) / regulation_minutes, points_per_score(opponent_stats)],
+    ])
+
+
+def _remaining_points(rates: np.ndarray, minutes: float, num_simulations: int, rng: np.random.Generator) -> np.ndarray:
+    """Whole points scored by both teams in the given minutes, shape (2, num_simulations)"""
+    scoring_plays = rng.poisson(rates[:, 0:1] * minutes / rates[:, 1:2], size=(2, num_simulations))
+    return np.round(scoring_plays * rates[:, 1:2])
+
+
+def simulate_remaining(
+    rates: np.ndarray,
+    team_score: int,
+    opponent_score: int,
+    minutes_remaining: float,
+    overtime_minutes: float,
+    num_simulations: int,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, float]:
+    """
+    Simulate the rest of a game from its current state
+
+    Each team's remaining scoring plays are Poisson with a mean given by its
+    per-minute rate, so uncertainty shrinks as the clock runs down. Games
+    tied at the end go to overtime.
+
+    Args:
+        rates: Rate table from build_rate_table
+        team_score: Our current score
+        opponent_score: Opponent's current score
+        minutes_remaining: Regulation minutes left in the game
+        overtime_minutes: Length of each overtime period
+        num_simulations: Number of simulated endings
+        rng: numpy random generator (optional)
+
+    Returns:
+        Dictionary with win_prob, overtime_prob, avg_team_score, avg_opponent_score
+    """
+    rng = rng or np.random.default_rng()
+    scores = np.array([[team_score], [opponent_score]], dtype=float) + \
+        _remaining_points(rates, minutes_remaining, num_simulations, rng)
+
+    tied = scores[0] == scores[1]
+    overtime_prob = tied.mean()
+    for _ in range(MAX_OVERTIMES):
+        if not tied.any():
+            break
+        scores[:, tied] += _remaining_points(rates, overtime_minutes, int(tied.sum()), rng)
+        tied = scores[0] == scores[1]
+
+    wins = (scores[0] > scores[1]).sum() + 0.5 * tied.sum()
+    return {
+        "win_prob": float(wins / num_simulations),
+        "overtime_prob": float(overtime_prob),
+        "avg_team_score": float(scores[0].mean()),
+        "avg_opponent_score": float(scores[1].mean()),
+    }
+
+
+def get_cached_rate_table(game_uuid: str) -> Optional[Dict[str, Any]]:
+    """Return the cached rate table entry for a game, if any"""
+    with _rate_tables_lock:
+        entry = _rate_tables.get(game_uuid)
+        if entry is not None:
+            _rate_tables.move_to_end(game_uuid)
+        return entry
+
+
+def cache_rate_table(game_uuid: str, user_email: str, rates: np.ndarray):
+    """
+    Cache a game's rate table, evicting the least recently used game when full
+
+    Args:
+        game_uuid: Game UUID
+        user_email: Email of the game's owner, checked on every cache hit
+        rates: Rate table from build_rate_table
+    """
+    with _rate_tables_lock:
+        _rate_tables[game_uuid] = {"user_email": user_email, "rates": rates}
+        _rate_tables.move_to_end(game_uuid)
+        while len(_rate_tables) > RATE_TABLE_CACHE_SIZE:
+            _rate_tables.popitem(last=False)
+
+
+def clear_rate_tables():
+    """Drop every cached rate table"""
+    with _rate_tables_lock:
+        _rate_tables.clear()
@@ -0,0 +1,124 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+
+import anyio
+from fastapi import UploadFile
+from pydantic import BaseModel
+from PyPDF2 import PdfReader
+from PyPDF2.errors import PdfReadError
+
+from app.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+PDF_MAGIC = b"%PDF-"
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """An uploaded file is over the size limit"""
+
+
+class StoredUpload(BaseModel):
+    path: str
+    sha256: str
+    size: int
+    pages: int
+
+
+def count_pdf_pages(path: str) -> int:
+    """
+    Number of pages of a PDF file
+
+    Args:
+        path: Path to the PDF file
+
+    Returns:
+        Page count
+
+    Raises:
+        ValueError: If the file can't be read as a PDF
+    """
+    try:
+        return len(PdfReader(path).pages)
+    except (PdfReadError, OSError, KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Not a readable PDF ({e})") from e
+
+
+def _too_large_message(upload: UploadFile, max_bytes: int) -> str:
+    return f"{upload.filename} is over the upload limit of {max_bytes / (1024 * 1024):g} MB"
+
+
+async def store_pdf_upload(
+    upload: UploadFile,
+    directory: str,
+    max_bytes: int = None,
+    max_pages: int = None,
+) -> StoredUpload:
+    """
+    Stream an uploaded PDF to disk, hashing and checking it on the way
+
+    The file is read and written in chunks with non-blocking file I/O, so
+    memory per upload stays flat and the event loop never waits on the disk.
+    It is rejected as soon as its first bytes aren't a PDF header or it grows
+    past max_bytes. Files are stored under their SHA-256, so a PDF uploaded
+    again is kept only once.
+
+    Args:
+        upload: Uploaded file
+        directory: Directory the PDFs are stored in
+        max_bytes: Size limit, MAX_UPLOAD_BYTES if not given
+        max_pages: Page limit, MAX_UPLOAD_PAGES if not given
+
+    Returns:
+        Where the PDF was stored, with its SHA-256, size and page count
+
+    Raises:
+        UploadTooLarge: If the file is over the size limit
+        ValueError: If the file is not a PDF or has too many pages
+    """
+    config = Config()
+    max_bytes = max_bytes or config.max_upload_bytes
+    max_pages = max_pages or config.max_upload_pages
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLarge(_too_large_message(upload, max_bytes))
+
+    os.makedirs(directory, exist_ok=True)
+    partial_path = os.path.join(directory, f".{uuid.uuid4()}.part")
+    digest = hashlib.sha256()
+    size = 0
+    head = b""
+    try:
+        async with await anyio.open_file(partial_path, "wb") as buffer:
+            while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(_too_large_message(upload, max_bytes))
+                if len(head) < len(PDF_MAGIC):
+                    head += chunk[:len(PDF_MAGIC)]
+                    if not PDF_MAGIC.startswith(head[:len(PDF_MAGIC)]):
+                        raise ValueError(f"{upload.filename} is not a PDF")
+                digest.update(chunk)
+                await buffer.write(chunk)
+        if len(head) < len(PDF_MAGIC):
+            raise ValueError(f"{upload.filename} is not a PDF")
+
+        try:
+            pages = await asyncio.to_thread(count_pdf_pages, partial_path)
+        except ValueError as e:
+            raise ValueError(f"{upload.filename}: {e}") from e
+        if pages > max_pages:
+            raise ValueError(f"{upload.filename} has {pages} pages, more than the limit of {max_pages}")
+
+        path = os.path.join(directory, f"{digest.hexdigest()}.pdf")
+        # Renaming is atomic, so a concurrent upload of the same PDF is harmless
+        await anyio.Path(partial_path).replace(path)
+    finally:
+        await anyio.Path(partial_path).unlink(missing_ok=True)
+
+    logger.info(f"Stored {upload.filename} as {path} ({size} bytes, {pages} pages)")
+    return StoredUpload(path=path, sha256=digest.hexdigest(), size=size, pages=pages)
@@ -0,0 +1,147 @@
+import difflib
+import logging
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.database.connection import find_similar_player, get_team_rosters, trigram_search_available
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Minimum difflib similarity ratio for a fuzzy name match
+FUZZY_CUTOFF = 0.8
+
+
+def normalize_name(name: str) -> str:
+    """
+    Canonical form of a player name for matching
+
+    Jersey numbers ("#23", "23 -", "(23)"), accents, punctuation, case and
+    repeated whitespace are all dropped, e.g. "#23 José O'Neil Jr." and
+    "jose oneil jr" normalize the same way.
+
+    Args:
+        name: Player name as written in a roster or projection
+
+    Returns:
+        Normalized name
+    """
+    name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    name = re.sub(r"#\s*\d+|\(\s*\d+\s*\)|\b\d+\b", " ", name.lower())
+    name = re.sub(r"[^a-z\s-]", "", name).replace("-", " ")
+    return " ".join(name.split())
+
+
+def build_roster(players: Iterable) -> Dict[str, Set[int]]:
+    """
+    Index a team's players by normalized name
+
+    Names made only of a jersey number normalize to nothing and are left out.
+    Players whose names normalize the same way share an entry, so matching
+    the name is ambiguous.
+
+    Args:
+        players: Players with id and name attributes
+
+    Returns:
+        Mapping from normalized name to player IDs
+    """
+    roster: Dict[str, Set[int]] = {}
+    for player in players:
+        normalized = normalize_name(player.name)
+        if normalized:
+            roster.setdefault(normalized, set()).add(player.id)
+    return roster
+
+
+def match_name(name: str, roster: Dict[str, Set[int]]) -> Optional[int]:
+    """
+    Match one name against a team's roster, most exact rule first
+
+    Rules, in order: identical normalized names; one name containing the
+    other; same last name and first initial ("J. Smith"); difflib similarity
+    of at least FUZZY_CUTOFF. A rule that matches several players is skipped.
+
+    Args:
+        name: Name to look up
+        roster: Mapping from normalized roster name to player IDs, as built
+            by build_roster
+
+    Returns:
+        Player ID, or None if no rule gave a single player
+    """
+    normalized = normalize_name(name)
+    if not normalized:
+        return None
+
+    def single(candidates: List[str]) -> Optional[int]:
+        player_ids = set().union(*(roster[candidate] for candidate in candidates))
+        return player_ids.pop() if len(player_ids) == 1 else None
+
+    if normalized in roster:
+        return single([normalized])
+
+    contained = [
+        candidate for candidate in roster
+        if f" {normalized} " in f" {candidate} " or f" {candidate} " in f" {normalized} "
+    ]
+    if contained:
+        return single(contained)
+
+    parts = normalized.split()
+    if len(parts) > 1:
+        initial_match = [
+            candidate for candidate in roster
+            if candidate.split()[-1] == parts[-1] and candidate[0] == parts[0][0]
+        ]
+        if initial_match:
+            return single(initial_match)
+
+    scored = sorted(
+        ((difflib.SequenceMatcher(None, normalized, candidate).ratio(), candidate) for candidate in roster),
+        reverse=True,
+    )
+    if not scored or scored[0][0] < FUZZY_CUTOFF:
+        return None
+    return single([candidate for ratio, candidate in scored if ratio == scored[0][0]])
+
+
+def resolve_player_ids(db: Session, names_by_team: Dict[int, List[str]]) -> Dict[int, Dict[str, int]]:
+    """
+    Resolve projected player names to player IDs, team by team
+
+    The rosters of every team are loaded in one query and all names are
+    matched in memory with match_name. The occasional name match_name cannot
+    place is looked up by trigram similarity in the database, when pg_trgm is
+    installed.
+
+    Args:
+        db: SQLAlchemy database session
+        names_by_team: Mapping from team ID to the player names to resolve
+
+    Returns:
+        Mapping from team ID to {name: player ID}; names that could not be
+        matched are left out
+    """
+    rosters = get_team_rosters(db, list(names_by_team))
+
+    player_ids: Dict[int, Dict[str, int]] = {}
+    trigram_search = None
+    for team_id, names in names_by_team.items():
+        roster = build_roster(rosters.get(team_id, []))
+        player_ids[team_id] = {}
+        for name in names:
+            player_id = match_name(name, roster)
+            if player_id is None and roster and normalize_name(name):
+                if trigram_search is None:
+                    trigram_search = trigram_search_available(db)
+                if trigram_search:
+                    player_id = find_similar_player(db, team_id, normalize_name(name))
+            if player_id is None:
+                logger.warning(f"No player matching '{name}' in team {team_id}")
+            else:
+                player_ids[team_id][name] = player_id
+    return player_ids
@@ -0,0 +1,116 @@
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_player_game_lines
+from app.database.models import PlayerProjectionDB, PlayerRawStatsDB
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+BOOTSTRAP_SAMPLES = 5000
+
+# Lower and upper quantiles of the bootstrap distribution (90% band)
+BAND_QUANTILES = (0.05, 0.95)
+
+# Per-game stats the bands are computed for, in array order
+BAND_STATS = ["ppg", "rpg", "apg"]
+
+
+def game_line_values(row: PlayerRawStatsDB) -> List[float]:
+    """
+    Points, rebounds and assists of a single per-game raw stats row
+
+    Args:
+        row: PlayerRawStatsDB row with a game_number
+
+    Returns:
+        [points, rebounds, assists]
+    """
+    fgm, fg3m, ftm = row.fgm or 0, row.fg3m or 0, row.ftm or 0
+    points = 2 * (fgm - fg3m) + 3 * fg3m + ftm
+    return [points, row.total_rebounds or 0, row.total_assists or 0]
+
+
+def bootstrap_bands(
+    values: np.ndarray,
+    counts: np.ndarray,
+    num_samples: int = BOOTSTRAP_SAMPLES,
+    quantiles: Tuple[float, float] = BAND_QUANTILES,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap confidence bands for the per-game averages of many players at once
+
+    Every player's game lines are resampled with replacement num_samples times
+    and the per-game average of each resample is taken; the bands are quantiles
+    of those averages. All players are handled in one array operation.
+
+    Args:
+        values: Array of shape (players, max_games, stats), zero-padded after each
+            player's last game
+        counts: Number of games of each player, shape (players,), all >= 1
+        num_samples: Number of bootstrap resamples
+        quantiles: (lower, upper) quantiles of the band
+        rng: numpy random generator (optional)
+
+    Returns:
+        (lower, upper) arrays of shape (players, stats)
+    """
+    rng = rng or np.random.default_rng()
+    num_players, max_games, _ = values.shape
+
+    # Indices drawn uniformly from each player's own games
+    indices = (rng.random((num_players, num_samples, max_games)) * counts[:, None, None]).astype(int)
+    sampled = values[np.arange(num_players)[:, None, None], indices]
+    in_sample = (np.arange(max_games)[None, None, :] < counts[:, None, None])[..., None]
+    means = (sampled * in_sample).sum(axis=2) / counts[:, None, None]
+
+    lower, upper = np.quantile(means, quantiles, axis=1)
+    return lower, upper
+
+
+def attach_projection_bands(db: Session, game_id: int, rng: Optional[np.random.Generator] = None) -> int:
+    """
+    Compute bootstrap bands for every projected player of a game and store them
+    on the PlayerProjectionDB rows
+
+    Players without per-game lines are left untouched.
+
+    Args:
+        db: SQLAlchemy database session
+        game_id: Game ID
+        rng: numpy random generator (optional)
+
+    Returns:
+        Number of projections updated
+    """
+    projections = db.query(PlayerProjectionDB).filter(PlayerProjectionDB.game_id == game_id).all()
+    if not projections:
+        return 0
+
+    game_lines: Dict[int, List[List[float]]] = {}
+    for row in get_player_game_lines(db, [projection.player_id for projection in projections]):
+        game_lines.setdefault(row.player_id, []).append(game_line_values(row))
+
+    with_lines = [projection for projection in projections if projection.player_id in game_lines]
+    if not with_lines:
+        return 0
+
+    counts = np.array([len(game_lines[projection.player_id]) for projection in with_lines])
+    values = np.zeros((len(with_lines), counts.max(), len(BAND_STATS)))
+    for i, projection in enumerate(with_lines):
+        values[i, :counts[i]] = game_lines[projection.player_id]
+
+    lower, upper = bootstrap_bands(values, counts, rng=rng)
+    for i, projection in enumerate(with_lines):
+        projection.bootstrap_games = int(counts[i])
+        for j, stat in enumerate(BAND_STATS):
+            setattr(projection, f"{stat}_lower", round(float(lower[i, j]), 1))
+            setattr(projection, f"{stat}_upper", round(float(upper[i, j]), 1))
+    db.flush()
+
+    logger.info(f"Bootstrap bands stored for {len(with_lines)} of {len(projections)} projected players")
+    return len(with_lines)
@@ -0,0 +1,110 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.config import Config
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+class ReportCache:
+    """
+    In-process LRU cache of serialized completed reports, keyed by game UUID
+
+    Entries hold the response bytes together with the email of the game's
+    owner, so ownership is checked on every hit without touching the
+    database. The cache is bounded by the total size of the cached bytes;
+    least recently used entries are evicted first. Completed reports don't
+    change, so entries are only dropped when a report is regenerated.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _key(game_uuid: str) -> str:
+        return str(game_uuid).lower()
+
+    def get(self, game_uuid: str, user_email: str) -> Optional[bytes]:
+        """
+        Cached report of a game, if the user owns it
+
+        Args:
+            game_uuid: Game UUID
+            user_email: Email of the user requesting the report
+
+        Returns:
+            Serialized report, or None on a miss or if the user is not the owner
+        """
+        key = self._key(game_uuid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != user_email:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, game_uuid: str, user_email: str, report: bytes):
+        """
+        Cache a game's serialized report
+
+        Args:
+            game_uuid: Game UUID
+            user_email: Email of the game's owner
+            report: Serialized report
+        """
+        if len(report) > self.max_bytes:
+            return
+        key = self._key(game_uuid)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (user_email, report)
+            self._size += len(report)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self, game_uuid: str):
+        """Drop a game's cached report, e.g. after it was regenerated"""
+        with self._lock:
+            entry = self._entries.pop(self._key(game_uuid), None)
+            if entry is not None:
+                self._size -= len(entry[1])
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached report and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, eviction and invalidation counters and current size"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+report_cache = ReportCache(Config().report_cache_max_bytes)
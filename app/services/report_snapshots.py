@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+from sqlalchemy import and_, event, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import Config
+from app.database import async_connection
+from app.database.common import database_context, replica_configured
+from app.database.connection import (
+    REPORT_SNAPSHOT_VERSION,
+    find_overall_report,
+    get_report_snapshot,
+    upsert_report_snapshot,
+)
+from app.database.models import GameDB, ReportDB, ReportSnapshotDB, UserDB
+from app.services.report_cache import report_cache
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 100
+# Session.info key of the game UUIDs whose cached reports are dropped on commit
+PENDING_INVALIDATIONS = "report_snapshots_pending_invalidations"
+
+
+def write_report_snapshot(db: Session, game_id: int) -> Optional[str]:
+    """
+    Build a game's report from the source tables and store its snapshot
+
+    Args:
+        db: SQLAlchemy database session
+        game_id: Game ID
+
+    Returns:
+        Serialized OverallReport JSON, or None if the game does not exist
+    """
+    found = find_overall_report(db, GameDB.id == game_id)
+    if not found:
+        return None
+    game, report = found
+    report_json = upsert_report_snapshot(db, game, report)
+
+    _invalidate_on_commit(db, str(game.uuid))
+    return report_json
+
+
+def _invalidate_on_commit(db: Session, game_uuid: str):
+    """Drop cached copies of a regenerated report once its transaction commits"""
+    db.info.setdefault(PENDING_INVALIDATIONS, set()).add(game_uuid)
+    if not event.contains(db, "after_commit", _invalidate_pending):
+        event.listen(db, "after_commit", _invalidate_pending)
+        event.listen(db, "after_rollback", _discard_pending)
+
+
+def _invalidate_pending(session: Session):
+    # Releasing a savepoint fires after_commit too, but is not a commit
+    if session.in_nested_transaction():
+        return
+    for game_uuid in session.info.pop(PENDING_INVALIDATIONS, ()):
+        report_cache.invalidate(game_uuid)
+
+
+def _discard_pending(session: Session):
+    # A rolled back savepoint may not hold every pending write, so only a full
+    # rollback discards them
+    if session.in_nested_transaction():
+        return
+    session.info.pop(PENDING_INVALIDATIONS, None)
+
+
+def read_report(db: Session, game_uuid: str, user_email: str) -> Optional[bytes]:
+    """
+    Serialized report of a game owned by the user
+
+    Reports are served from the in-process cache, then from the snapshot.
+    Otherwise the report is built from the source tables and its snapshot is
+    stored, so games finished before snapshots existed are backfilled on
+    their first view.
+
+    Args:
+        db: SQLAlchemy database session
+        game_uuid: Game UUID
+        user_email: Email of the user requesting the report
+
+    Returns:
+        Serialized OverallReport JSON, or None if the user has no game with
+        this UUID or the UUID is malformed
+    """
+    try:
+        game_uuid = str(uuid.UUID(str(game_uuid)))
+    except ValueError:
+        return None
+
+    cached = report_cache.get(game_uuid, user_email)
+    if cached is not None:
+        return cached
+
+    report_json = get_report_snapshot(db, game_uuid, user_email)
+    if report_json is None:
+        found = find_overall_report(db, GameDB.uuid == game_uuid, UserDB.email == user_email)
+        if not found:
+            return None
+        report_json = upsert_report_snapshot(db, *found)
+        db.commit()
+
+    report = report_json.encode()
+    report_cache.put(game_uuid, user_email, report)
+    return report
+
+
+async def read_report_async(
+    db: AsyncSession, game_uuid: str, user_email: str, read_db: Optional[AsyncSession] = None
+) -> Optional[bytes]:
+    """
+    read_report for async routes
+
+    Cached reports and snapshots are served without blocking the event loop.
+    With a read replica configured, the snapshot is read from it unless it
+    was written within the replica lag guard, in which case the primary is
+    asked. Building a missing snapshot is rare and runs read_report in a
+    worker thread with its own session.
+
+    Args:
+        db: Async SQLAlchemy database session on the primary
+        game_uuid: Game UUID
+        user_email: Email of the user requesting the report
+        read_db: Async session on the read replica (optional)
+
+    Returns:
+        Serialized OverallReport JSON, or None if the user has no game with
+        this UUID
+    """
+    cached = report_cache.get(game_uuid, user_email)
+    if cached is not None:
+        return cached
+
+    report_json = None
+    if read_db is not None and replica_configured():
+        report_json = await async_connection.get_report_snapshot(
+            read_db, game_uuid, user_email, settled_seconds=Config().db_replica_lag_guard_seconds
+        )
+    if report_json is None:
+        report_json = await async_connection.get_report_snapshot(db, game_uuid, user_email)
+    if report_json is None:
+        return await asyncio.to_thread(_read_report_in_new_session, game_uuid, user_email)
+
+    report = report_json.encode()
+    report_cache.put(game_uuid, user_email, report)
+    return report
+
+
+def _read_report_in_new_session(game_uuid: str, user_email: str) -> Optional[bytes]:
+    with database_context() as db:
+        return read_report(db, game_uuid, user_email)
+
+
+def backfill_report_snapshots(db: Session, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Store snapshots for finished games that have none, or an outdated one
+
+    Games are processed in ID order, one committed batch at a time. A game
+    whose report can't be built is logged and skipped.
+
+    Args:
+        db: SQLAlchemy database session
+        batch_size: Games per batch
+
+    Returns:
+        Number of snapshots written
+    """
+    written = 0
+    last_game_id = 0
+    while True:
+        game_ids = [
+            game_id for (game_id,) in (
+                db.query(GameDB.id)
+                .join(ReportDB, and_(ReportDB.game_id == GameDB.id, ReportDB.report_type == "game_analysis"))
+                .outerjoin(ReportSnapshotDB, ReportSnapshotDB.game_id == GameDB.id)
+                .filter(
+                    GameDB.id > last_game_id,
+                    or_(ReportSnapshotDB.game_id.is_(None), ReportSnapshotDB.version < REPORT_SNAPSHOT_VERSION),
+                )
+                .distinct()
+                .order_by(GameDB.id)
+                .limit(batch_size)
+            )
+        ]
+        if not game_ids:
+            break
+
+        for game_id in game_ids:
+            savepoint = db.begin_nested()
+            try:
+                write_report_snapshot(db, game_id)
+                savepoint.commit()
+                written += 1
+            except Exception as e:
+                logger.warning(f"Could not snapshot the report of game {game_id}: {e}")
+                savepoint.rollback()
+        db.commit()
+        last_game_id = game_ids[-1]
+
+    logger.info(f"Report snapshots backfilled: {written}")
+    return written
+
+
+def run_backfill_job():
+    """Background job entry point: backfill report snapshots in their own session"""
+    with database_context() as db:
+        try:
+            backfill_report_snapshots(db)
+        except Exception as e:
+            logger.error(f"Report snapshot backfill failed: {e}")
+            db.rollback()
+            raise
+
+
+if __name__ == "__main__":
+    run_backfill_job()
@@ -0,0 +1,234 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database.connection import get_latest_team_stats_for_teams, get_schedule_games
+from app.database.models import TeamDB
+from app.services.simulation_engine import STAT_FIELDS, simulate_matchups, team_vector
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEASON_SIMULATIONS = 5000
+
+# Engine games simulated per distinct matchup to estimate its win probability
+MATCHUP_SIMULATIONS = 2000
+
+# Maximum number of matchup win probabilities kept in memory
+MATCHUP_CACHE_SIZE = 4096
+
+_matchup_cache: "OrderedDict[Tuple, float]" = OrderedDict()
+_matchup_cache_lock = threading.Lock()
+
+
+def _matchup_key(home: np.ndarray, away: np.ndarray, num_simulations: int) -> Tuple:
+    """Cache key of a matchup; changed team stats give a different key"""
+    return (
+        tuple(round(float(value), 4) for value in home),
+        tuple(round(float(value), 4) for value in away),
+        num_simulations,
+    )
+
+
+def matchup_win_probabilities(
+    vectors: np.ndarray,
+    pairs: np.ndarray,
+    num_simulations: int = MATCHUP_SIMULATIONS,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """
+    Home win probability of every (home, away) pair, memoized per matchup
+
+    Repeated pairs are simulated once, and matchups already simulated with the
+    same team vectors are served from the in-memory cache; the remaining ones
+    run through the engine in a single vectorized call.
+
+    Args:
+        vectors: Team vectors, shape (teams, len(STAT_FIELDS))
+        pairs: Row indices into vectors, shape (games, 2) as (home, away)
+        num_simulations: Engine games per matchup
+        rng: numpy random generator (optional)
+
+    Returns:
+        Array of shape (games,) with the home team's win probability
+    """
+    unique_pairs, inverse = np.unique(pairs, axis=0, return_inverse=True)
+    keys = [_matchup_key(vectors[home], vectors[away], num_simulations) for home, away in unique_pairs]
+
+    probabilities = np.empty(len(unique_pairs))
+    with _matchup_cache_lock:
+        cached = [_matchup_cache.get(key) for key in keys]
+    missing = [index for index, value in enumerate(cached) if value is None]
+    for index, value in enumerate(cached):
+        if value is not None:
+            probabilities[index] = value
+
+    if missing:
+        home, away = unique_pairs[missing, 0], unique_pairs[missing, 1]
+        probabilities[missing] = simulate_matchups(vectors[home], vectors[away], num_simulations, rng=rng)["win_prob"]
+
+    with _matchup_cache_lock:
+        for index, key in enumerate(keys):
+            _matchup_cache[key] = float(probabilities[index])
+            _matchup_cache.move_to_end(key)
+        while len(_matchup_cache) > MATCHUP_CACHE_SIZE:
+            _matchup_cache.popitem(last=False)
+
+    logger.info(f"Season matchups: {len(pairs)} games, {len(unique_pairs)} distinct, {len(missing)} simulated")
+    return probabilities[inverse.reshape(-1)]
+
+
+def clear_matchup_cache():
+    """Drop every memoized matchup win probability"""
+    with _matchup_cache_lock:
+        _matchup_cache.clear()
+
+
+def simulate_season(
+    home_win_probabilities: np.ndarray,
+    pairs: np.ndarray,
+    current_wins: np.ndarray,
+    num_seasons: int,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Play out the remaining schedule num_seasons times
+
+    Args:
+        home_win_probabilities: Home win probability of each remaining game
+        pairs: (home, away) team indices of each remaining game, shape (games, 2)
+        current_wins: Wins already recorded per team, shape (teams,)
+        num_seasons: Number of simulated seasons
+        rng: numpy random generator (optional)
+
+    Returns:
+        (wins, seeds), both of shape (num_seasons, teams); seeds start at 1 and
+        ties on wins are broken at random
+    """
+    rng = rng or np.random.default_rng()
+    num_teams = len(current_wins)
+
+    home_wins = (rng.random((num_seasons, len(pairs))) < home_win_probabilities).astype(float)
+    home_onehot = np.eye(num_teams)[pairs[:, 0]]
+    away_onehot = np.eye(num_teams)[pairs[:, 1]]
+    wins = current_wins + home_wins @ home_onehot + (1 - home_wins) @ away_onehot
+
+    tiebreak = rng.random((num_seasons, num_teams))
+    # Wins are whole numbers, so a tiebreak below 1 only reorders tied teams
+    order = np.argsort(-(wins + tiebreak * 0.5), axis=1)
+    seeds = np.empty_like(order)
+    np.put_along_axis(seeds, order, np.arange(1, num_teams + 1)[None, :], axis=1)
+    return wins.astype(int), seeds
+
+
+def _distribution(values: np.ndarray, key: str) -> List[Dict[str, Any]]:
+    """Share of simulated seasons ending on each value"""
+    counts = np.bincount(values)
+    return [
+        {key: value, "probability": round(float(count / len(values) * 100), 1)}
+        for value, count in enumerate(counts) if count
+    ]
+
+
+def project_season(
+    db: Session,
+    user_id: int,
+    team_id: int,
+    num_simulations: int = DEFAULT_SEASON_SIMULATIONS,
+    playoff_spots: Optional[int] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> Dict[str, Any]:
+    """
+    Project a team's final record and seeding from the user's schedule
+
+    Games with a score count toward the current record, except ties, which
+    count for neither team; every other game is simulated with the local
+    engine. Seeding ranks every team of the schedule
+    by final wins.
+
+    Args:
+        db: SQLAlchemy database session
+        user_id: User ID the schedule belongs to
+        team_id: TeamDB ID of the team to project
+        num_simulations: Number of simulated seasons
+        playoff_spots: Number of seeds that make the playoffs (optional)
+        rng: numpy random generator (optional)
+
+    Returns:
+        Dictionary with the current record, expected wins, record and seed
+        distributions, playoff probability and projected standings
+    """
+    rng = rng or np.random.default_rng()
+    schedule = get_schedule_games(db, user_id)
+    team_ids = sorted({game.home_team_id for game in schedule} | {game.away_team_id for game in schedule})
+    if team_id not in team_ids:
+        raise ValueError(f"Team {team_id} has no games in the schedule")
+    index = {schedule_team_id: position for position, schedule_team_id in enumerate(team_ids)}
+
+    current_wins = np.zeros(len(team_ids))
+    current_losses = np.zeros(len(team_ids))
+    remaining = []
+    for game in schedule:
+        home, away = index[game.home_team_id], index[game.away_team_id]
+        if game.home_score is None or game.away_score is None:
+            remaining.append((home, away))
+        elif game.home_score > game.away_score:
+            current_wins[home] += 1
+            current_losses[away] += 1
+        elif game.away_score > game.home_score:
+            current_wins[away] += 1
+            current_losses[home] += 1
+    pairs = np.array(remaining, dtype=int).reshape(-1, 2)
+
+    remaining_team_ids = sorted({team_ids[position] for position in pairs.ravel()})
+    latest_stats = get_latest_team_stats_for_teams(db, remaining_team_ids)
+    missing = [schedule_team_id for schedule_team_id in remaining_team_ids if schedule_team_id not in latest_stats]
+    if missing:
+        raise ValueError(f"No team stats found for teams {missing}")
+
+    vectors = np.zeros((len(team_ids), len(STAT_FIELDS)))
+    for schedule_team_id, stats in latest_stats.items():
+        vectors[index[schedule_team_id]] = team_vector(stats)
+
+    if len(pairs):
+        home_win_probabilities = matchup_win_probabilities(vectors, pairs, rng=rng)
+    else:
+        home_win_probabilities = np.zeros(0)
+    wins, seeds = simulate_season(home_win_probabilities, pairs, current_wins, num_simulations, rng=rng)
+
+    position = index[team_id]
+    team_games = int(current_wins[position] + current_losses[position] + (pairs == position).sum())
+    teams = {team.id: team for team in db.query(TeamDB.id, TeamDB.uuid, TeamDB.name).filter(TeamDB.id.in_(team_ids))}
+
+    return {
+        "team_id": team_id,
+        "team_uuid": str(teams[team_id].uuid),
+        "team_name": teams[team_id].name,
+        "current_wins": int(current_wins[position]),
+        "current_losses": int(current_losses[position]),
+        "remaining_games": int((pairs == position).sum()),
+        "num_simulations": num_simulations,
+        "expected_wins": round(float(wins[:, position].mean()), 1),
+        "records": [
+            {"wins": entry["wins"], "losses": team_games - entry["wins"], "probability": entry["probability"]}
+            for entry in _distribution(wins[:, position], "wins")
+        ],
+        "seeds": _distribution(seeds[:, position], "seed"),
+        "playoff_probability": (
+            round(float((seeds[:, position] <= playoff_spots).mean() * 100), 1) if playoff_spots else None
+        ),
+        "standings": [
+            {
+                "team_id": team_ids[team],
+                "team_uuid": str(teams[team_ids[team]].uuid),
+                "team_name": teams[team_ids[team]].name,
+                "expected_wins": round(float(wins[:, team].mean()), 1),
+                "average_seed": round(float(seeds[:, team].mean()), 2),
+            }
+            for team in np.argsort(seeds.mean(axis=0), kind="stable")
+        ],
+    }
@@ -0,0 +1,252 @@
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+
+# Order of the per-team statistics in every team vector
+STAT_FIELDS = ["ppg", "rpg", "fgPct", "threePct", "tpg", "apg", "spg", "bpg"]
+PPG, RPG, FG_PCT, THREE_PCT, TPG, APG, SPG, BPG = range(len(STAT_FIELDS))
+
+# Mapping from TeamStatsDB columns to team vector positions
+TEAM_STATS_COLUMNS = {
+    "ppg": PPG,
+    "rebounds": RPG,
+    "fg_pct": FG_PCT,
+    "fg3_pct": THREE_PCT,
+    "turnovers": TPG,
+    "assists": APG,
+    "steals": SPG,
+    "blocks": BPG,
+}
+PERCENT_COLUMNS = {"fg_pct", "fg3_pct"}
+
+# Points gained per unit of statistical advantage. These are the original
+# hand-picked coefficients; fitted versions replace them via set_effect_weights.
+DEFAULT_EFFECT_WEIGHTS = {
+    "rebounding": 0.7,
+    "fieldGoal": 0.25,
+    "threePoint": 0.15,
+    "turnovers": 1.0,
+    "assists": 0.5,
+    "steals": 1.0,
+    "blocks": 0.8,
+}
+EFFECT_NAMES = list(DEFAULT_EFFECT_WEIGHTS)
+
+# Weights currently used by the engine and by simulateGame
+EFFECT_WEIGHTS = dict(DEFAULT_EFFECT_WEIGHTS)
+
+# Random game variance (±12%) applied to each team's score
+VARIANCE_LOW = 0.88
+VARIANCE_RANGE = 0.24
+
+
+def _to_float(value: Any) -> float:
+    """Convert a numeric, Decimal or percentage string ("45.2%") to float"""
+    if value is None:
+        return 0.0
+    if isinstance(value, str):
+        value = value.strip().rstrip("%")
+        return float(value) if value else 0.0
+    return float(value)
+
+
+def team_vector(stats) -> np.ndarray:
+    """
+    Build a team vector from a TeamStatsDB row
+
+    Args:
+        stats: TeamStatsDB row (or any object with the same attributes)
+
+    Returns:
+        Array of shape (len(STAT_FIELDS),) in simulation units
+    """
+    vector = np.zeros(len(STAT_FIELDS))
+    for column, index in TEAM_STATS_COLUMNS.items():
+        value = _to_float(getattr(stats, column, None))
+        vector[index] = value / 100 if column in PERCENT_COLUMNS else value
+    return vector
+
+
+def team_vector_from_dict(team: Dict[str, Any]) -> np.ndarray:
+    """Build a team vector from the dictionaries used by simulateGame"""
+    return np.array([float(team.get(field, 0) or 0) for field in STAT_FIELDS])
+
+
+def apply_perturbation(vector: np.ndarray, stat: str, delta: float) -> np.ndarray:
+    """
+    Return a copy of a team vector with one TeamStatsDB column shifted
+
+    Args:
+        vector: Team vector
+        stat: TeamStatsDB column name (e.g. "fg3_pct", "turnovers")
+        delta: Change to apply; percentage columns are in percentage points
+
+    Returns:
+        Perturbed team vector
+    """
+    if stat not in TEAM_STATS_COLUMNS:
+        raise ValueError(f"Unknown stat '{stat}'")
+    perturbed = vector.copy()
+    perturbed[TEAM_STATS_COLUMNS[stat]] += delta / 100 if stat in PERCENT_COLUMNS else delta
+    return perturbed
+
+
+def set_effect_weights(weights: Dict[str, float]):
+    """
+    Replace the effect weights used by the engine
+
+    Args:
+        weights: Weight for every name in EFFECT_NAMES
+    """
+    missing = set(EFFECT_NAMES) - set(weights)
+    if missing:
+        raise ValueError(f"Missing effect weights {sorted(missing)}")
+    EFFECT_WEIGHTS.update({name: float(weights[name]) for name in EFFECT_NAMES})
+
+
+def matchup_diffs(team_a: np.ndarray, team_b: np.ndarray) -> np.ndarray:
+    """
+    Team A's statistical advantages over team B, before weighting
+
+    Args:
+        team_a: Array of shape (..., len(STAT_FIELDS))
+        team_b: Array of the same shape
+
+    Returns:
+        Array of shape (..., len(EFFECT_NAMES)) with one column per effect
+    """
+    return np.stack([
+        team_a[..., RPG] - team_b[..., RPG],
+        (team_a[..., FG_PCT] - team_b[..., FG_PCT]) * 100,
+        (team_a[..., THREE_PCT] - team_b[..., THREE_PCT]) * 100,
+        team_b[..., TPG] - team_a[..., TPG],
+        team_a[..., APG] - team_b[..., APG],
+        team_a[..., SPG] - team_b[..., SPG],
+        team_a[..., BPG] - team_b[..., BPG],
+    ], axis=-1)
+
+
+def matchup_effects(team_a: np.ndarray, team_b: np.ndarray) -> np.ndarray:
+    """
+    Point effects of team A's statistical advantages over team B
+
+    Args:
+        team_a: Array of shape (..., len(STAT_FIELDS))
+        team_b: Array of the same shape
+
+    Returns:
+        Array of shape (..., len(EFFECT_NAMES)) with one column per effect
+    """
+    weights = np.array([EFFECT_WEIGHTS[name] for name in EFFECT_NAMES])
+    return matchup_diffs(team_a, team_b) * weights
+
+
+def simulate_matchups(
+    team_a: np.ndarray,
+    team_b: np.ndarray,
+    num_simulations: int,
+    rng: Optional[np.random.Generator] = None,
+    common_random_numbers: bool = False,
+) -> Dict[str, np.ndarray]:
+    """
+    Simulate many matchups at once, num_simulations games each
+
+    Vectorized equivalent of running simulateGame num_simulations times for
+    every pair of rows in team_a/team_b.
+
+    Args:
+        team_a: Array of shape (S, len(STAT_FIELDS)) or (len(STAT_FIELDS),)
+        team_b: Array with the same shape as team_a
+        num_simulations: Number of games per matchup
+        rng: numpy random generator (optional)
+        common_random_numbers: Reuse the same variance draws for every matchup,
+            which makes differences between matchups much less noisy
+
+    Returns:
+        Dictionary of arrays of shape (S,): win_prob, avg_score_a, avg_score_b,
+        avg_margin, and effects of shape (S, len(EFFECT_NAMES))
+    """
+    rng = rng or np.random.default_rng()
+    team_a = np.atleast_2d(np.asarray(team_a, dtype=float))
+    team_b = np.atleast_2d(np.asarray(team_b, dtype=float))
+
+    effects = matchup_effects(team_a, team_b)
+    expected_a = team_a[:, PPG] + effects.sum(axis=1)
+    expected_b = team_b[:, PPG]
+
+    draw_rows = 1 if common_random_numbers else len(team_a)
+    variance_a = VARIANCE_LOW + rng.random((draw_rows, num_simulations)) * VARIANCE_RANGE
+    variance_b = VARIANCE_LOW + rng.random((draw_rows, num_simulations)) * VARIANCE_RANGE
+
+    scores_a = np.round(expected_a[:, None] * variance_a)
+    scores_b = np.round(expected_b[:, None] * variance_b)
+
+    return {
+        "win_prob": (scores_a > scores_b).mean(axis=1),
+        "avg_score_a": scores_a.mean(axis=1),
+        "avg_score_b": scores_b.mean(axis=1),
+        "avg_margin": (scores_a - scores_b).mean(axis=1),
+        "effects": effects,
+    }
+
+
+def simulate_scores(
+    team_a: np.ndarray,
+    team_b: np.ndarray,
+    num_simulations: int,
+    rng: Optional[np.random.Generator] = None,
+):
+    """
+    Simulate num_simulations games of a single matchup and keep every score
+
+    Args:
+        team_a: Team A vector
+        team_b: Team B vector
+        num_simulations: Number of games
+        rng: numpy random generator (optional)
+
+    Returns:
+        (scores_a, scores_b), integer arrays of shape (num_simulations,)
+    """
+    rng = rng or np.random.default_rng()
+    expected_a = team_a[PPG] + matchup_effects(team_a, team_b).sum()
+    expected_b = team_b[PPG]
+
+    variance_a = VARIANCE_LOW + rng.random(num_simulations) * VARIANCE_RANGE
+    variance_b = VARIANCE_LOW + rng.random(num_simulations) * VARIANCE_RANGE
+    return (
+        np.round(expected_a * variance_a).astype(int),
+        np.round(expected_b * variance_b).astype(int),
+    )
+
+
+def build_scenarios(
+    team: np.ndarray,
+    opponent: np.ndarray,
+    scenarios: List[List[Dict[str, Any]]],
+):
+    """
+    Stack a baseline matchup and one perturbed matchup per scenario
+
+    Args:
+        team: Our team vector
+        opponent: Opponent team vector
+        scenarios: One list of perturbations per scenario, each perturbation a
+            dict with "team" ("team" or "opponent"), "stat" and "delta"
+
+    Returns:
+        (team_matrix, opponent_matrix), row 0 being the unperturbed baseline
+    """
+    team_rows = [team]
+    opponent_rows = [opponent]
+    for perturbations in scenarios:
+        team_row, opponent_row = team, opponent
+        for perturbation in perturbations:
+            if perturbation["team"] == "team":
+                team_row = apply_perturbation(team_row, perturbation["stat"], perturbation["delta"])
+            else:
+                opponent_row = apply_perturbation(opponent_row, perturbation["stat"], perturbation["delta"])
+        team_rows.append(team_row)
+        opponent_rows.append(opponent_row)
+    return np.vstack(team_rows), np.vstack(opponent_rows)
@@ -0,0 +1,197 @@
+import bisect
+import math
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+# z-score of a two-sided 95% confidence interval
+Z_95 = 1.96
+
+
+class RunningStats:
+    """
+    Streaming mean/variance accumulator using Welford's algorithm.
+    Memory use is constant regardless of how many values are pushed.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, value: float):
+        """Add a single observation"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def push_many(self, values):
+        """Add a block of observations at once (e.g. one vectorized simulation batch)"""
+        values = np.asarray(values)
+        if values.size == 0:
+            return
+        block = RunningStats()
+        block.count = int(values.size)
+        block.mean = float(values.mean())
+        block._m2 = float(((values - block.mean) ** 2).sum())
+        block.min = values.min().item()
+        block.max = values.max().item()
+        self.merge(block)
+
+    def merge(self, other: "RunningStats"):
+        """Combine another accumulator into this one (Chan et al. parallel update)"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+            self.min, self.max = other.min, other.max
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0 when fewer than two observations)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 2),
+            "std": round(self.std, 2),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+
+class Histogram:
+    """
+    Fixed-bin histogram. `edges` are the inclusive upper bounds of every bin
+    except the last one, which collects everything above the final edge.
+    """
+
+    def __init__(self, edges: List[float], labels: Optional[List[str]] = None):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.labels = labels
+
+    def push(self, value: float):
+        self.counts[bisect.bisect_left(self.edges, value)] += 1
+
+    def push_many(self, values):
+        """Add a block of observations at once, with the same binning as push"""
+        indices = np.searchsorted(self.edges, np.asarray(values), side="left")
+        for index, count in enumerate(np.bincount(indices, minlength=len(self.counts))):
+            self.counts[index] += int(count)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"edges": self.edges, "counts": self.counts}
+
+    def to_distribution(self) -> Dict[str, Dict[str, float]]:
+        """Labelled counts and percentages, in the format used by marginDistribution"""
+        total = self.total
+        return {
+            label: {
+                "count": count,
+                "percentage": round((count / total) * 1000) / 10 if total else 0,
+            }
+            for label, count in zip(self.labels, self.counts)
+        }
+
+
+class QuantileSketch:
+    """
+    Quantile sketch for integer-valued samples such as final scores.
+    Keeps one counter per distinct value, so memory is bounded by the range of
+    possible scores rather than by the number of simulations, and quantiles are exact.
+    """
+
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+
+    def push(self, value: int):
+        value = int(value)
+        self._counts[value] = self._counts.get(value, 0) + 1
+        self.count += 1
+
+    def push_many(self, values):
+        """Add a block of integer observations at once"""
+        distinct, counts = np.unique(np.asarray(values).astype(int), return_counts=True)
+        for value, count in zip(distinct.tolist(), counts.tolist()):
+            self._counts[value] = self._counts.get(value, 0) + count
+            self.count += count
+
+    def quantile(self, q: float) -> Optional[int]:
+        """Return the smallest value whose cumulative frequency reaches q"""
+        if self.count == 0:
+            return None
+        target = q * self.count
+        cumulative = 0
+        for value in sorted(self._counts):
+            cumulative += self._counts[value]
+            if cumulative >= target:
+                return value
+        return max(self._counts)
+
+    def to_dict(self, quantiles=(0.05, 0.5, 0.95)) -> Dict[str, Optional[int]]:
+        return {f"p{round(q * 100)}": self.quantile(q) for q in quantiles}
+
+
+def proportion_interval(successes: int, count: int, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a proportion
+
+    Unlike the normal approximation it does not collapse to zero width when
+    every simulated game has the same winner, so lopsided matchups still get
+    an honest (but narrow) interval.
+
+    Args:
+        successes: Number of successes (e.g. games won)
+        count: Number of trials
+        z: z-score of the interval (1.96 for 95%)
+
+    Returns:
+        (lower, upper) bounds as proportions
+    """
+    if count == 0:
+        return 0.0, 1.0
+    p = successes / count
+    denominator = 1 + z * z / count
+    center = (p + z * z / (2 * count)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / count + z * z / (4 * count * count)) / denominator
+    return max(0.0, center - half_width), min(1.0, center + half_width)
+
+
+def mean_interval(stats: RunningStats, z: float = Z_95) -> Tuple[float, float]:
+    """
+    Normal-approximation confidence interval for the mean of a RunningStats
+
+    Returns:
+        (lower, upper) bounds, infinite when fewer than two observations
+    """
+    if stats.count < 2:
+        return -math.inf, math.inf
+    half_width = z * stats.std / math.sqrt(stats.count)
+    return stats.mean - half_width, stats.mean + half_width
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Optional, Set
+
+import asyncpg
+
+from app.database.common import get_sqlalchemy_database_url
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Channel the processing_tasks trigger notifies on, see migration 5860736cb1bd
+TASK_EVENTS_CHANNEL = "processing_task_events"
+
+# Put on every subscriber queue after the listening connection was reopened:
+# notifications sent while it was down are lost, so progress must be re-read
+RESYNC = object()
+
+RECONNECT_DELAY_SECONDS = 1
+MAX_RECONNECT_DELAY_SECONDS = 30
+
+
+class TaskEventHub:
+    """
+    Fans processing task notifications out to the event streams of this process
+
+    A single connection per process LISTENs on TASK_EVENTS_CHANNEL. Postgres
+    delivers every committed progress update to each listening connection, so
+    an update made by the pipeline on any API node reaches subscribers on all
+    of them. Each subscriber has its own queue, which receives the decoded
+    notifications of one task, and those of its children if it is a batch
+    task.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._connection: Optional[asyncpg.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(task_uuid: str) -> str:
+        return str(task_uuid).lower()
+
+    async def subscribe(self, task_uuid: str) -> asyncio.Queue:
+        """
+        Start receiving the notifications of a task
+
+        Subscribe before reading the task's current progress, so no update
+        committed in between is missed.
+
+        Args:
+            task_uuid: Task UUID
+
+        Returns:
+            Queue receiving a dict per notification, or RESYNC
+        """
+        await self._connect()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers[self._key(task_uuid)].add(queue)
+        return queue
+
+    def unsubscribe(self, task_uuid: str, queue: asyncio.Queue):
+        """Stop delivering a task's notifications to a queue returned by subscribe"""
+        key = self._key(task_uuid)
+        queues = self._subscribers.get(key)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[key]
+
+    def subscriber_count(self) -> int:
+        """Number of queues currently subscribed, over every task"""
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def _connect(self):
+        async with self._connect_lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return
+            connection = await asyncpg.connect(get_sqlalchemy_database_url())
+            connection.add_termination_listener(self._on_termination)
+            await connection.add_listener(TASK_EVENTS_CHANNEL, self._on_notification)
+            self._connection = connection
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str):
+        try:
+            event = json.loads(payload)
+            queues = set(self._subscribers.get(self._key(event["task_uuid"]), ()))
+            if event.get("parent_uuid") is not None:
+                queues |= self._subscribers.get(self._key(event["parent_uuid"]), set())
+        except (ValueError, KeyError) as e:
+            logger.warning(f"Ignoring malformed task notification {payload!r}: {e}")
+            return
+        for queue in queues:
+            queue.put_nowait(event)
+
+    def _on_termination(self, connection):
+        if connection is not self._connection:
+            return
+        self._connection = None
+        if self._subscribers and (self._reconnect_task is None or self._reconnect_task.done()):
+            logger.warning("Task event connection lost, reconnecting")
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self):
+        delay = RECONNECT_DELAY_SECONDS
+        while self._subscribers:
+            try:
+                await self._connect()
+                break
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning(f"Could not reconnect task events, retrying in {delay}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+        for queues in self._subscribers.values():
+            for queue in queues:
+                queue.put_nowait(RESYNC)
+
+    async def close(self):
+        """Close the listening connection, e.g. when the application stops"""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        connection, self._connection = self._connection, None
+        if connection is not None and not connection.is_closed():
+            await connection.close()
+
+
+task_event_hub = TaskEventHub()
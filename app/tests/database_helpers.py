@@ -0,0 +1,53 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import get_engine
+
+
+def database_available() -> bool:
+    """Whether the configured PostgreSQL database can be reached"""
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except OperationalError:
+        return False
+
+
+def make_team_stats(**overrides):
+    """Build an object shaped like a TeamStatsDB row"""
+    stats = {
+        "ppg": 68.0, "rebounds": 34.0, "fg_pct": "45.0%", "fg3_pct": "34.0%",
+        "turnovers": 12.0, "assists": 14.0, "steals": 7.0, "blocks": 3.0,
+        "fg_made": 99, "fg3_made": 27, "ft_made": 48,
+    }
+    stats.update(overrides)
+    return SimpleNamespace(**stats)
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Runs each test in a transaction that is rolled back afterwards
+
+    self.db joins the transaction through savepoints, so code under test can
+    commit without leaving rows behind.
+    """
+
+    def setUp(self):
+        self.connection = get_engine().connect()
+        self.transaction = self.connection.begin()
+        self.db = Session(bind=self.connection, join_transaction_mode="create_savepoint")
+
+    def tearDown(self):
+        self.db.close()
+        self.transaction.rollback()
+        self.connection.close()
@@ -0,0 +1,96 @@
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database import async_connection
+from app.database.common import get_async_database_url
+from app.database.connection import REPORT_SNAPSHOT_VERSION
+from app.database.models import GameDB, ReportDB, ReportSnapshotDB, TeamDB, UserDB
+from app.database.pagination import async_estimate_count
+from app.tests.database_helpers import database_available
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestAsyncConnection(unittest.IsolatedAsyncioTestCase):
+    """Test class for the async read helpers"""
+
+    async def asyncSetUp(self):
+        # asyncpg connections belong to one event loop, so every test gets
+        # its own unpooled engine
+        self.engine = create_async_engine(get_async_database_url(), poolclass=NullPool)
+        self.connection = await self.engine.connect()
+        self.transaction = await self.connection.begin()
+        self.db = AsyncSession(bind=self.connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+
+        self.email = f"async-{uuid.uuid4()}@example.com"
+        self.user = UserDB(email=self.email, name="Coach", password_hash="x")
+        team, opponent = TeamDB(name="Home"), TeamDB(name="Away")
+        self.db.add_all([self.user, team, opponent])
+        await self.db.flush()
+        self.games = [GameDB(user_id=self.user.id, home_team_id=team.id, away_team_id=opponent.id) for _ in range(3)]
+        self.db.add_all(self.games)
+        await self.db.flush()
+        for game in self.games:
+            self.db.add(ReportDB(game_id=game.id, report_type="game_analysis", file_path="/tmp/game.docx"))
+        self.db.add(ReportSnapshotDB(game_uuid=self.games[0].uuid, game_id=self.games[0].id, user_id=self.user.id,
+                                     version=REPORT_SNAPSHOT_VERSION, report='{"game": 1}'))
+        await self.db.flush()
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        await self.transaction.rollback()
+        await self.connection.close()
+        await self.engine.dispose()
+
+    async def test_get_user_by_email(self):
+        user = await async_connection.get_user_by_email(self.db, self.email)
+        self.assertEqual(user.id, self.user.id)
+        self.assertIsNone(await async_connection.get_public_user_by_email(self.db, "nobody@example.com"))
+
+    async def test_public_user_leaves_out_private_columns(self):
+        user = await async_connection.get_public_user_by_email(self.db, self.email)
+
+        self.assertEqual(user._asdict(), {"email": self.email, "name": "Coach", "phone_number": None, "school": None, "role": None})
+
+    async def test_get_report_snapshot(self):
+        game_uuid = str(self.games[0].uuid)
+        self.assertEqual(await async_connection.get_report_snapshot(self.db, game_uuid, self.email), '{"game": 1}')
+        self.assertIsNone(await async_connection.get_report_snapshot(self.db, game_uuid, "someone-else@example.com"))
+        self.assertIsNone(await async_connection.get_report_snapshot(self.db, "not-a-uuid", self.email))
+
+    async def test_report_summaries_pages(self):
+        first = await async_connection.get_report_summaries_by_user_id(self.db, self.user.id, limit=2)
+        second = await async_connection.get_report_summaries_by_user_id(self.db, self.user.id, limit=2, cursor=first.next_cursor)
+
+        self.assertEqual((len(first.items), first.total_estimate), (2, 3))
+        self.assertEqual((len(second.items), second.next_cursor), (1, None))
+        self.assertEqual(
+            {summary.game_uuid for summary in first.items + second.items},
+            {str(game.uuid) for game in self.games},
+        )
+
+    async def test_recent_analyses_pages(self):
+        first = await async_connection.get_recent_analyses(self.db, limit=2, user_id=self.user.id)
+        second = await async_connection.get_recent_analyses(self.db, limit=2, user_id=self.user.id, cursor=first.next_cursor)
+
+        self.assertEqual((len(first.items), first.total_estimate), (2, 3))
+        self.assertEqual((len(second.items), second.next_cursor, second.total_estimate), (1, None, None))
+        self.assertEqual([analysis.game_id for analysis in first.items + second.items], [game.id for game in reversed(self.games)])
+        self.assertEqual({analysis.report_path for analysis in first.items + second.items}, {"/tmp/game.docx"})
+
+    async def test_large_counts_are_estimated(self):
+        games = select(GameDB.id).where(GameDB.user_id == self.user.id)
+        self.assertEqual(await async_estimate_count(self.db, games, exact_limit=5), 3)
+        self.assertGreater(await async_estimate_count(self.db, games, exact_limit=1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
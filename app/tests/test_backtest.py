@@ -0,0 +1,68 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import func, literal, select
+
+from app.database.common import get_engine
+from app.services.backtest import OPPONENT_SCORE_PATTERN, TEAM_SCORE_PATTERN, parse_projection
+from app.tests.database_helpers import database_available
+
+# Projected scores with hyphens and digits in the team names, and the
+# (team, opponent) scores they hold
+NAMED_SCORES = {
+    "Winston-Salem 58 - Team B 52": (58.0, 52.0),
+    "Team A 58 - Winston-Salem 52": (58.0, 52.0),
+    "76ers 101 - Team B 99": (101.0, 99.0),
+    "Team A 101 - 76ers 99": (101.0, 99.0),
+    "Winston-Salem 78 - 72 76ers": (78.0, 72.0),
+    "Team 2 60.5 - Team 3 55.5.": (60.5, 55.5),
+}
+
+
+class TestBacktest(unittest.TestCase):
+    """Test class for parsing stored projections in the backtest"""
+
+    def test_parse_projection(self):
+        parsed = parse_projection(
+            "Team A has a 62% win probability based on 100 simulations.",
+            "Team A 58 - Team B 52",
+        )
+        self.assertEqual(parsed, {"win_probability": 0.62, "team_score": 58.0, "opponent_score": 52.0})
+
+    def test_parse_projection_alternative_formats(self):
+        parsed = parse_projection("Scarsdale: 57.5 % chance to win", "Scarsdale 78 - 72 Arlington")
+        self.assertAlmostEqual(parsed["win_probability"], 0.575)
+        self.assertEqual((parsed["team_score"], parsed["opponent_score"]), (78.0, 72.0))
+
+    def test_parse_projection_names_with_hyphens_and_digits(self):
+        for projected_score, scores in NAMED_SCORES.items():
+            parsed = parse_projection(None, projected_score)
+            self.assertEqual((parsed["team_score"], parsed["opponent_score"]), scores, projected_score)
+
+    def test_parse_projection_missing_values(self):
+        parsed = parse_projection("Too close to call", None)
+        self.assertEqual(parsed, {"win_probability": None, "team_score": None, "opponent_score": None})
+
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestBacktestQueryParsing(unittest.TestCase):
+    """Test class for parsing projected scores in SQL, as the backtest query does"""
+
+    def test_sql_parses_like_python(self):
+        with get_engine().connect() as connection:
+            for projected_score, scores in NAMED_SCORES.items():
+                query = select(
+                    func.substring(literal(projected_score), TEAM_SCORE_PATTERN),
+                    func.substring(literal(projected_score), OPPONENT_SCORE_PATTERN),
+                )
+                team_score, opponent_score = connection.execute(query).one()
+                self.assertEqual((float(team_score), float(opponent_score)), scores, projected_score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import asyncio
+import sys
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi import BackgroundTasks, HTTPException
+from sqlalchemy import delete
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import database_context
+from app.database.connection import get_child_task_progress, link_team_stats_to_game
+from app.database.models import GameDB, ProcessingTaskDB, TeamDB, TeamStatsDB, UserDB
+from app.routers import upload
+from app.routers.upload import PROCESSING_STEPS, get_status, process_batch, set_task_step, upload_batch
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestBatchTasks(DatabaseTestCase):
+    """Test class for sharing a team's stats between games and reading batch progress"""
+
+    def setUp(self):
+        super().setUp()
+
+        self.user = UserDB(email=f"batch-{uuid.uuid4()}@example.com", name="Coach", password_hash="x")
+        self.team = TeamDB(name="Home")
+        self.opponents = [TeamDB(name="Away 1"), TeamDB(name="Away 2")]
+        self.db.add_all([self.user, self.team, *self.opponents])
+        self.db.flush()
+        self.games = [GameDB(user_id=self.user.id, home_team_id=self.team.id, away_team_id=opponent.id) for opponent in self.opponents]
+        self.stats = TeamStatsDB(team_id=self.team.id, ppg=61.5, fg_pct="44.1%")
+        self.db.add_all([*self.games, self.stats])
+        self.db.flush()
+
+    def test_stats_are_linked_to_their_first_game(self):
+        stats_id = link_team_stats_to_game(self.db, self.stats.id, self.games[0].id)
+
+        self.db.refresh(self.stats)
+        self.assertEqual((stats_id, self.stats.game_id), (self.stats.id, self.games[0].id))
+
+    def test_stats_are_copied_for_later_games(self):
+        link_team_stats_to_game(self.db, self.stats.id, self.games[0].id)
+        copy_id = link_team_stats_to_game(self.db, self.stats.id, self.games[1].id)
+
+        self.assertNotEqual(copy_id, self.stats.id)
+        self.db.refresh(self.stats)
+        copy = self.db.get(TeamStatsDB, copy_id)
+        self.assertEqual(self.stats.game_id, self.games[0].id)
+        self.assertEqual((copy.team_id, copy.game_id, copy.ppg, copy.fg_pct), (self.team.id, self.games[1].id, self.stats.ppg, self.stats.fg_pct))
+
+    def test_batch_status_lists_its_children(self):
+        batch_uuid = str(uuid.uuid4())
+        batch = ProcessingTaskDB(task_uuid=batch_uuid, status="processing", step=1, total_steps=len(PROCESSING_STEPS))
+        self.db.add(batch)
+        self.db.flush()
+        child_uuids = [str(uuid.uuid4()) for _ in self.games]
+        self.db.add_all([
+            ProcessingTaskDB(task_uuid=child_uuids[0], parent_id=batch.id, status="completed", step=5,
+                             total_steps=len(PROCESSING_STEPS), game_id=self.games[0].id, opponent_file_path="/tmp/a.pdf"),
+            ProcessingTaskDB(task_uuid=child_uuids[1], parent_id=batch.id, status="processing", step=2,
+                             total_steps=len(PROCESSING_STEPS), game_id=self.games[1].id, opponent_file_path="/tmp/b.pdf"),
+        ])
+        self.db.flush()
+
+        rows = get_child_task_progress(self.db, batch_uuid)
+        status = get_status(batch_uuid, self.db)
+
+        self.assertEqual([str(row.task_uuid) for row in rows], child_uuids)
+        self.assertEqual(status.ready_sections, [])
+        self.assertEqual([child.task_uuid for child in status.children], child_uuids)
+        self.assertEqual([child.status for child in status.children], ["completed", "processing"])
+        self.assertEqual(status.children[1].game_uuid, str(self.games[1].uuid))
+        self.assertEqual(status.children[1].ready_sections, ["scouting"])
+
+    def test_single_task_has_no_children(self):
+        task_uuid = str(uuid.uuid4())
+        self.db.add(ProcessingTaskDB(task_uuid=task_uuid, status="processing", step=0,
+                                     total_steps=len(PROCESSING_STEPS), opponent_file_path="/tmp/a.pdf"))
+        self.db.flush()
+
+        self.assertEqual(get_child_task_progress(self.db, task_uuid), [])
+        self.assertEqual(get_child_task_progress(self.db, "not-a-uuid"), [])
+        self.assertEqual(get_status(task_uuid, self.db).children, [])
+
+    def test_batch_rejects_teams_of_other_users(self):
+        foreign = TeamDB(name="Foreign")
+        self.db.add(foreign)
+        self.db.flush()
+
+        with self.assertRaises(HTTPException) as raised:
+            asyncio.run(upload_batch(BackgroundTasks(), team_uuid=str(foreign.uuid), team_files=None, team_name=None,
+                                     opponent_files=[], opponent_names=[], use_local_simulation=False,
+                                     user_email=self.user.email, db=self.db))
+
+        self.assertEqual(raised.exception.status_code, 404)
+        self.assertEqual(self.db.query(ProcessingTaskDB).filter(ProcessingTaskDB.team_id == foreign.id).count(), 0)
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestProcessBatch(unittest.TestCase):
+    """Test class for running the games of a batch upload, which needs committed writes"""
+
+    def setUp(self):
+        self.batch_uuid = str(uuid.uuid4())
+        self.child_uuids = [str(uuid.uuid4()) for _ in range(3)]
+        with database_context() as db:
+            self.user = UserDB(email=f"batch-{uuid.uuid4()}@example.com", name="Coach", password_hash="x")
+            self.team = TeamDB(name="Home")
+            db.add_all([self.user, self.team])
+            db.flush()
+            batch = ProcessingTaskDB(task_uuid=self.batch_uuid, status="processing", team_id=self.team.id,
+                                     step=0, total_steps=len(PROCESSING_STEPS))
+            db.add(batch)
+            db.flush()
+            db.add_all([
+                ProcessingTaskDB(task_uuid=child_uuid, parent_id=batch.id, status="processing",
+                                 opponent_file_path=f"/tmp/{child_uuid}.pdf", step=0, total_steps=len(PROCESSING_STEPS))
+                for child_uuid in self.child_uuids
+            ])
+            db.commit()
+            self.user_id, self.team_id = self.user.id, self.team.id
+
+    def tearDown(self):
+        with database_context() as db:
+            db.execute(delete(ProcessingTaskDB).where(ProcessingTaskDB.task_uuid.in_(self.child_uuids)))
+            db.execute(delete(ProcessingTaskDB).where(ProcessingTaskDB.task_uuid == self.batch_uuid))
+            db.execute(delete(TeamDB).where(TeamDB.id == self.team_id))
+            db.execute(delete(UserDB).where(UserDB.id == self.user_id))
+            db.commit()
+
+    def tasks(self):
+        with database_context() as db:
+            rows = db.query(ProcessingTaskDB).filter(ProcessingTaskDB.task_uuid.in_([self.batch_uuid, *self.child_uuids])).all()
+            return {str(row.task_uuid): (row.status, row.step, row.team_id) for row in rows}
+
+    def run_batch(self, run_game):
+        with patch.object(upload, "process_files", side_effect=run_game) as process_files:
+            process_batch(self.batch_uuid, self.user_id, "Home", [(child_uuid, f"Away {i}") for i, child_uuid in enumerate(self.child_uuids)])
+        return process_files
+
+    def test_every_opponent_is_played_with_the_shared_team(self):
+        def run_game(task_uuid, user_id, team_name, opponent_name, use_local_simulation):
+            # The team is already set when the games start
+            with database_context() as db:
+                team_id = db.query(ProcessingTaskDB.team_id).filter(ProcessingTaskDB.task_uuid == task_uuid).scalar()
+                set_task_step(db, task_uuid, 5, status="completed" if team_id == self.team_id else "failed")
+                db.commit()
+
+        process_files = self.run_batch(run_game)
+
+        self.assertEqual(sorted(call.args[0] for call in process_files.call_args_list), sorted(self.child_uuids))
+        tasks = self.tasks()
+        self.assertEqual(tasks[self.batch_uuid], ("completed", 5, self.team_id))
+        self.assertEqual({tasks[child_uuid] for child_uuid in self.child_uuids}, {("completed", 5, self.team_id)})
+
+    def test_failed_games_dont_stop_the_others(self):
+        def run_game(task_uuid, user_id, team_name, opponent_name, use_local_simulation):
+            if opponent_name == "Away 1":
+                raise ValueError("User not found")
+            with database_context() as db:
+                set_task_step(db, task_uuid, 5, status="completed")
+                db.commit()
+
+        self.run_batch(run_game)
+
+        tasks = self.tasks()
+        self.assertEqual(tasks[self.batch_uuid][0], "completed")
+        self.assertEqual([tasks[child_uuid][0] for child_uuid in self.child_uuids], ["completed", "failed", "completed"])
+
+    def test_batch_fails_when_every_game_does(self):
+        def run_game(task_uuid, user_id, team_name, opponent_name, use_local_simulation):
+            with database_context() as db:
+                set_task_step(db, task_uuid, 3, status="failed")
+                db.commit()
+
+        self.run_batch(run_game)
+
+        self.assertEqual(self.tasks()[self.batch_uuid], ("failed", 5, self.team_id))
+
+
+if __name__ == '__main__':
+    unittest.main()
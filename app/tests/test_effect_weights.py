@@ -0,0 +1,56 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.services.effect_weights import fit_weights
+from app.services.simulation_engine import DEFAULT_EFFECT_WEIGHTS, EFFECT_NAMES, set_effect_weights
+from app.services.anthropic_api import simulateGame
+
+
+TRUE_WEIGHTS = {"rebounding": 0.9, "fieldGoal": 0.4, "threePoint": 0.1, "turnovers": 1.3,
+                "assists": 0.2, "steals": 0.6, "blocks": 0.5}
+
+
+class TestEffectWeights(unittest.TestCase):
+    """Test class for fitting the simulation effect weights"""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.X = rng.normal(0, [4, 4, 5, 3, 3, 2, 1.5], size=(2000, len(EFFECT_NAMES)))
+        true_vector = np.array([TRUE_WEIGHTS[name] for name in EFFECT_NAMES])
+        self.y = self.X @ true_vector + rng.normal(0, 8, size=2000)
+
+    def tearDown(self):
+        set_effect_weights(DEFAULT_EFFECT_WEIGHTS)
+
+    def test_fit_recovers_weights(self):
+        weights = fit_weights(self.X, self.y, regularization=1.0)
+        for name in EFFECT_NAMES:
+            self.assertAlmostEqual(weights[name], TRUE_WEIGHTS[name], delta=0.1)
+
+    def test_regularization_shrinks_towards_defaults(self):
+        weights = fit_weights(self.X[:20], self.y[:20], regularization=1e6)
+        for name in EFFECT_NAMES:
+            self.assertAlmostEqual(weights[name], DEFAULT_EFFECT_WEIGHTS[name], places=2)
+
+    def test_simulate_game_uses_loaded_weights(self):
+        team_a = {"name": "A", "ppg": 60.0, "rpg": 35.0, "fgPct": 0.45, "threePct": 0.34,
+                  "tpg": 12.0, "apg": 14.0, "spg": 7.0, "bpg": 3.0}
+        team_b = {**team_a, "name": "B", "rpg": 30.0}
+
+        self.assertEqual(simulateGame(team_a, team_b)["effects"]["rebounding"], 3.5)
+        set_effect_weights({**DEFAULT_EFFECT_WEIGHTS, "rebounding": 1.0})
+        self.assertEqual(simulateGame(team_a, team_b)["effects"]["rebounding"], 5.0)
+
+    def test_set_effect_weights_requires_every_effect(self):
+        with self.assertRaises(ValueError):
+            set_effect_weights({"rebounding": 1.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from fastapi import HTTPException
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.routers.simulation import LineupRequest, lineups as lineups_route
+from app.services.lineups import lineup_vectors, player_rates, rank_lineups, rotation
+from app.services.simulation_engine import FG_PCT, PPG, RPG, team_vector
+
+
+def make_player_stats(**overrides):
+    """Build an object shaped like a PlayerStatsDB row"""
+    stats = {
+        "ppg": 8.0, "rpg": 4.0, "apg": 2.0, "spg": 1.0, "bpg": 0.5, "topg": 1.5,
+        "fg_pct": "42.0%", "fg3_pct": "30.0%", "minutes": 16.0,
+    }
+    stats.update(overrides)
+    return SimpleNamespace(**stats)
+
+
+class TestLineups(unittest.TestCase):
+    """Test class for the vectorized lineup optimizer"""
+
+    def setUp(self):
+        self.opponent = team_vector(SimpleNamespace(
+            ppg=60.0, rebounds=30.0, fg_pct="42.0%", fg3_pct="32.0%",
+            turnovers=13.0, assists=12.0, steals=6.0, blocks=3.0,
+        ))
+
+    def test_player_rates_scale_to_full_game(self):
+        rates = player_rates([
+            make_player_stats(ppg=8.0, minutes=16.0),
+            make_player_stats(ppg=2.0, minutes=2.0),
+            make_player_stats(ppg=5.0, minutes=None),
+        ], 32)
+
+        self.assertAlmostEqual(rates[0, PPG], 16.0)
+        # Two minutes a game are treated as MINUTES_FLOOR
+        self.assertAlmostEqual(rates[1, PPG], 6.4)
+        self.assertAlmostEqual(rates[2, PPG], 5.0)
+        self.assertAlmostEqual(rates[0, FG_PCT], 0.42)
+
+    def test_lineup_vectors(self):
+        rates = player_rates([make_player_stats(ppg=10.0, fg_pct="50%")] + [make_player_stats(ppg=0.0)] * 4, 16)
+        vectors = lineup_vectors(rates, np.array([[0, 1, 2, 3, 4]]))
+
+        self.assertAlmostEqual(vectors[0, PPG], 10.0)
+        self.assertAlmostEqual(vectors[0, RPG], 20.0)
+        # Shooting is weighted by scoring, so only the scorer counts
+        self.assertAlmostEqual(vectors[0, FG_PCT], 0.5)
+
+    def test_best_lineup_uses_best_players(self):
+        players = [make_player_stats(ppg=12.0 + i) for i in range(5)] + [make_player_stats(ppg=3.0)] * 7
+        lineups = rank_lineups(player_rates(players, 32), self.opponent, num_results=5)
+
+        self.assertEqual(lineups[0]["players"], [0, 1, 2, 3, 4])
+        self.assertEqual(len(lineups), 5)
+        self.assertGreaterEqual(lineups[0]["net_rating"], lineups[-1]["net_rating"])
+        self.assertIsNone(lineups[0]["win_probability"])
+        self.assertEqual(rotation(lineups)[0]["lineup_share"], 100.0)
+
+    def test_refined_lineups(self):
+        players = [make_player_stats(ppg=6.0 + i, topg=1.0 + (i % 3)) for i in range(10)]
+        lineups = rank_lineups(player_rates(players, 32), self.opponent, top_k=10, num_simulations=2000,
+                               num_results=12, rng=np.random.default_rng(5))
+
+        refined = [lineup for lineup in lineups if lineup["win_probability"] is not None]
+        self.assertEqual(len(refined), 10)
+        self.assertEqual(lineups[:10], refined)
+        win_probabilities = [lineup["win_probability"] for lineup in refined]
+        self.assertEqual(win_probabilities, sorted(win_probabilities, reverse=True))
+
+    def test_fifteen_players_are_fast(self):
+        rng = np.random.default_rng(2)
+        players = [make_player_stats(ppg=float(ppg), minutes=float(minutes))
+                   for ppg, minutes in zip(rng.uniform(0, 20, 15), rng.uniform(2, 32, 15))]
+        start = time.perf_counter()
+        lineups = rank_lineups(player_rates(players, 32), self.opponent, top_k=50, num_simulations=5000)
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(len(lineups), 10)
+
+    def test_unknown_user_is_not_found(self):
+        with patch("app.routers.simulation.get_user_by_email", return_value=None):
+            with self.assertRaises(HTTPException) as raised:
+                lineups_route("game-uuid", LineupRequest(), "nobody@example.com", MagicMock())
+
+        self.assertEqual((raised.exception.status_code, raised.exception.detail), (404, "User not found"))
+
+
+if __name__ == '__main__':
+    unittest.main()
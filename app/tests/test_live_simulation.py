@@ -0,0 +1,84 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from fastapi import HTTPException
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.routers.simulation import LiveGameState, live_win_probability
+from app.services.live_simulation import (
+    RATE_TABLE_CACHE_SIZE,
+    build_rate_table,
+    cache_rate_table,
+    clear_rate_tables,
+    get_cached_rate_table,
+    points_per_score,
+    simulate_remaining,
+)
+from app.tests.database_helpers import make_team_stats
+
+
+class TestLiveSimulation(unittest.TestCase):
+    """Test class for the in-game win probability simulation"""
+
+    def setUp(self):
+        self.rates = build_rate_table(make_team_stats(), make_team_stats(), 32)
+        self.rng = np.random.default_rng(7)
+
+    def test_rate_table(self):
+        self.assertAlmostEqual(self.rates[0, 0], 68 / 32)
+        self.assertAlmostEqual(self.rates[0, 1], (2 * 72 + 3 * 27 + 48) / 147)
+        self.assertEqual(points_per_score(make_team_stats(fg_made=None, ft_made=None)), 2.0)
+
+    def test_game_state_drives_win_probability(self):
+        start = simulate_remaining(self.rates, 0, 0, 32, 4, 20000, self.rng)
+        self.assertAlmostEqual(start["win_prob"], 0.5, delta=0.02)
+
+        late_lead = simulate_remaining(self.rates, 60, 50, 1, 4, 20000, self.rng)
+        self.assertGreater(late_lead["win_prob"], 0.99)
+
+        early_lead = simulate_remaining(self.rates, 12, 2, 24, 4, 20000, self.rng)
+        self.assertLess(early_lead["win_prob"], late_lead["win_prob"])
+        self.assertGreater(early_lead["win_prob"], start["win_prob"])
+
+    def test_tied_at_the_buzzer_goes_to_overtime(self):
+        results = simulate_remaining(self.rates, 50, 50, 0, 4, 5000, self.rng)
+        self.assertEqual(results["overtime_prob"], 1.0)
+        self.assertAlmostEqual(results["win_prob"], 0.5, delta=0.05)
+
+    def test_latency(self):
+        timings = []
+        for _ in range(200):
+            start = time.perf_counter()
+            simulate_remaining(self.rates, 30, 28, 10.5, 4, 5000)
+            timings.append(time.perf_counter() - start)
+        self.assertLess(np.percentile(timings, 99), 0.05)
+
+    def test_rate_table_cache(self):
+        clear_rate_tables()
+        cache_rate_table("game-0", "coach@example.com", self.rates)
+        self.assertEqual(get_cached_rate_table("game-0")["user_email"], "coach@example.com")
+
+        for i in range(1, RATE_TABLE_CACHE_SIZE + 1):
+            cache_rate_table(f"game-{i}", "coach@example.com", self.rates)
+        self.assertIsNone(get_cached_rate_table("game-0"))
+        self.assertIsNotNone(get_cached_rate_table(f"game-{RATE_TABLE_CACHE_SIZE}"))
+        clear_rate_tables()
+
+    def test_unknown_user_is_not_found(self):
+        clear_rate_tables()
+        state = LiveGameState(team_score=30, opponent_score=28, period=4, minutes_remaining=5.0)
+        with patch("app.routers.simulation.get_user_by_email", return_value=None):
+            with self.assertRaises(HTTPException) as raised:
+                live_win_probability("game-uuid", state, "nobody@example.com", MagicMock())
+
+        self.assertEqual((raised.exception.status_code, raised.exception.detail), (404, "User not found"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,8 +12,11 @@ load_dotenv()
 # Add the parent directory to sys.path to import app modules
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
+from app.config import Config
 from app.services.anthropic_api import simulate_game, simulate_game_locally
 
+config = Config()
+
 
 class TestSimulation(unittest.TestCase):
     """Test class for basketball game simulation functions"""
@@ -56,8 +59,11 @@ class TestSimulation(unittest.TestCase):
         self.assertIn("avgScoreA", simulation_results)
         self.assertIn("avgScoreB", simulation_results)
         
-        # Verify the simulation ran the expected number of times
-        self.assertEqual(simulation_results["numSimulations"], 100)
+        # Verify the adaptive simulation stayed within the configured cap
+        self.assertGreater(simulation_results["numSimulations"], 0)
+        self.assertLessEqual(simulation_results["numSimulations"], config.simulation_max_games)
+        self.assertLessEqual(simulation_results["winPctCI"]["lower"], simulation_results["teamAWinPct"])
+        self.assertGreaterEqual(simulation_results["winPctCI"]["upper"], simulation_results["teamAWinPct"])
         
         # Verify that the total wins equals the number of simulations
         self.assertEqual(
@@ -147,7 +153,7 @@ class TestSimulation(unittest.TestCase):
         team_win_pct = local_results["teamAWinPct"]
         opponent_win_pct = local_results["teamBWinPct"]
         
-        local_win_probability = f"{team_name} has a {team_win_pct}% win probability based on 100 simulations."
+        local_win_probability = f"{team_name} has a {team_win_pct}% win probability based on {local_results['numSimulations']} simulations."
         local_projected_score = f"{team_name} {local_results['avgScoreA']} - {opponent_name} {local_results['avgScoreB']}"
         
         # Patch the simulate_game function to use our temporary prompt file
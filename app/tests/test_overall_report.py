@@ -0,0 +1,197 @@
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+from sqlalchemy import event, text
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.connection import REPORT_SNAPSHOT_VERSION, get_overall_report, get_scouting_report
+from app.database.models import (
+    GameDB,
+    GameSimulationDB,
+    PlayerDB,
+    PlayerProjectionDB,
+    PlayerStatsDB,
+    ReportDB,
+    ReportSnapshotDB,
+    TeamAnalysisDB,
+    TeamDB,
+    TeamStatsDB,
+    UserDB,
+)
+from app.services.report_cache import report_cache
+from app.services.report_snapshots import backfill_report_snapshots, read_report, write_report_snapshot
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+ANALYSIS_LISTS = [
+    "strengths", "weaknesses", "key_players", "offensive_keys", "defensive_keys",
+    "game_factors", "rotation_plan", "situational_adjustments", "game_keys",
+]
+PLAYBOOK_LISTS = [
+    "sim_situational_adjustments", "playbook_offensive_plays", "playbook_defensive_plays",
+    "playbook_special_situations", "playbook_inbound_plays", "playbook_after_timeout_special_plays",
+]
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestOverallReport(DatabaseTestCase):
+    """Test class for loading a game's full report and its snapshots, pinning query counts"""
+
+    def setUp(self):
+        super().setUp()
+        self.email = f"report-{uuid.uuid4()}@example.com"
+        report_cache.clear()
+
+        user = UserDB(email=self.email, name="Coach", password_hash="x")
+        team = TeamDB(name="Home", record="10-2", ranking="3")
+        opponent = TeamDB(name="Away", record="8-4", ranking="7")
+        self.db.add_all([user, team, opponent])
+        self.db.flush()
+        self.game = GameDB(user_id=user.id, home_team_id=team.id, away_team_id=opponent.id)
+        self.db.add(self.game)
+        self.db.flush()
+
+        for side in (team, opponent):
+            self.db.add(TeamStatsDB(team_id=side.id, game_id=self.game.id, ppg=50 + side.id % 10))
+            for style in ("old style", f"{side.name} style"):
+                self.db.add(TeamAnalysisDB(team_id=side.id, playing_style=style, **{name: [] for name in ANALYSIS_LISTS}))
+                self.db.flush()
+            for number in (1, 2):
+                player = PlayerDB(team_id=side.id, name=f"{side.name} {number}", number=str(number), strengths=[], weaknesses=[])
+                self.db.add(player)
+                self.db.flush()
+                for ppg in (1, 10 + number):
+                    self.db.add(PlayerStatsDB(player_id=player.id, ppg=ppg, rpg=1, apg=1, fg_pct="40", fg3_pct="30",
+                                              ft_pct="70", spg=1, bpg=1, topg=1, minutes=20, is_season_average=True))
+                    self.db.flush()
+                self.db.add(PlayerProjectionDB(player_id=player.id, team_id=side.id, game_id=self.game.id,
+                                               is_home_team=side is team, ppg=12, rpg=4, apg=2,
+                                               fg_pct="45%", fg3_pct="33%", role="Starter"))
+        self.db.add(GameSimulationDB(game_id=self.game.id, win_probability="60%", sim_keys_to_victory=[],
+                                     **{name: [] for name in PLAYBOOK_LISTS}))
+        self.db.flush()
+        self.db.expunge_all()
+
+    def test_report_loads_in_two_queries(self):
+        statements = []
+        event.listen(self.connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        report = get_overall_report(self.db, str(self.game.uuid), self.email)
+
+        self.assertEqual(len(statements), 2, statements)
+        self.assertEqual((report.team.name, report.opponent.name), ("Home", "Away"))
+        self.assertEqual(report.game_simulation.win_probability, "60%")
+        self.assertEqual(report.team_analysis.playing_style, "Home style")
+        self.assertEqual(report.opponent_analysis.playing_style, "Away style")
+        self.assertEqual([player.name for player in report.team_player_analysis], ["Home 1", "Home 2"])
+        self.assertEqual([player.name for player in report.opponent_player_analysis], ["Away 1", "Away 2"])
+        self.assertEqual([player.actual_ppg for player in report.team_player_analysis], [11, 12])
+
+    def test_report_of_another_user_is_not_found(self):
+        self.assertIsNone(get_overall_report(self.db, str(self.game.uuid), "someone-else@example.com"))
+        self.assertIsNone(get_overall_report(self.db, str(uuid.uuid4()), self.email))
+
+    def test_scouting_report_is_readable_before_the_simulation(self):
+        self.db.query(GameSimulationDB).filter(GameSimulationDB.game_id == self.game.id).delete()
+        self.db.flush()
+
+        scouting = get_scouting_report(self.db, str(self.game.uuid), self.email)
+
+        self.assertEqual((scouting.team.name, scouting.opponent.name), ("Home", "Away"))
+        self.assertEqual(scouting.opponent_analysis.playing_style, "Away style")
+        self.assertIsNone(get_overall_report(self.db, str(self.game.uuid), self.email))
+        self.assertIsNone(read_report(self.db, str(self.game.uuid), self.email))
+        self.assertIsNone(get_scouting_report(self.db, str(self.game.uuid), "someone-else@example.com"))
+        self.assertIsNone(get_scouting_report(self.db, "not-a-uuid", self.email))
+
+    def test_first_read_stores_a_snapshot_served_in_one_query(self):
+        built = read_report(self.db, str(self.game.uuid), self.email)
+        self.assertEqual(built.decode(), get_overall_report(self.db, str(self.game.uuid), self.email).model_dump_json())
+
+        report_cache.clear()
+        statements = []
+        event.listen(self.connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        self.assertEqual(read_report(self.db, str(self.game.uuid), self.email), built)
+        self.assertEqual(len(statements), 1, statements)
+
+        self.assertIsNone(read_report(self.db, str(self.game.uuid), "someone-else@example.com"))
+
+    def test_cached_reads_skip_the_database(self):
+        built = read_report(self.db, str(self.game.uuid), self.email)
+
+        statements = []
+        event.listen(self.connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        self.assertEqual(read_report(self.db, str(self.game.uuid).upper(), self.email), built)
+        self.assertEqual(statements, [])
+
+        self.assertIsNone(read_report(self.db, str(self.game.uuid), "someone-else@example.com"))
+        self.assertEqual(report_cache.stats()["hits"], 1)
+
+    def test_regenerated_reports_are_invalidated_on_commit(self):
+        read_report(self.db, str(self.game.uuid), self.email)
+
+        with self.db.begin_nested():
+            write_report_snapshot(self.db, self.game.id)
+        self.assertEqual(report_cache.stats()["entries"], 1)
+        self.db.commit()
+
+        self.assertEqual(report_cache.stats()["entries"], 0)
+        self.assertEqual(report_cache.stats()["invalidations"], 1)
+
+    def test_repeated_writes_share_one_listener(self):
+        listeners = len(self.db.dispatch.after_commit)
+
+        for _ in range(3):
+            read_report(self.db, str(self.game.uuid), self.email)
+            write_report_snapshot(self.db, self.game.id)
+            self.db.commit()
+
+        self.assertEqual(len(self.db.dispatch.after_commit), listeners + 1)
+        self.assertEqual(report_cache.stats()["invalidations"], 3)
+
+    def test_rolled_back_writes_are_not_invalidated(self):
+        read_report(self.db, str(self.game.uuid), self.email)
+
+        write_report_snapshot(self.db, self.game.id)
+        self.db.rollback()
+        self.db.commit()
+
+        self.assertEqual(report_cache.stats()["entries"], 1)
+        self.assertEqual(report_cache.stats()["invalidations"], 0)
+
+    def test_outdated_snapshots_are_rebuilt(self):
+        read_report(self.db, str(self.game.uuid), self.email)
+        report_cache.clear()
+        snapshot = self.db.get(ReportSnapshotDB, self.game.uuid)
+        snapshot.version, snapshot.report = REPORT_SNAPSHOT_VERSION - 1, "{}"
+        self.db.flush()
+
+        self.assertNotEqual(read_report(self.db, str(self.game.uuid), self.email), b"{}")
+        self.db.refresh(snapshot)
+        self.assertEqual(snapshot.version, REPORT_SNAPSHOT_VERSION)
+
+    def test_rewritten_snapshots_are_stamped_in_utc(self):
+        self.db.execute(text("SET LOCAL TimeZone = 'Asia/Tokyo'"))
+        write_report_snapshot(self.db, self.game.id)
+        write_report_snapshot(self.db, self.game.id)
+
+        snapshot = self.db.get(ReportSnapshotDB, self.game.uuid)
+        self.db.refresh(snapshot)
+        self.assertEqual(snapshot.updated_at, snapshot.created_at)
+
+    def test_backfill_snapshots_finished_games(self):
+        self.db.add(ReportDB(game_id=self.game.id, report_type="game_analysis", file_path="/tmp/report.docx"))
+        self.db.flush()
+
+        backfill_report_snapshots(self.db)
+
+        snapshot = self.db.get(ReportSnapshotDB, self.game.uuid)
+        self.assertIsNotNone(snapshot)
+        self.assertEqual(snapshot.version, REPORT_SNAPSHOT_VERSION)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import datetime
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+from sqlalchemy import select
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.connection import get_recent_analyses, get_report_summaries_by_user_id
+from app.database.models import GameDB, GameSimulationDB, ReportDB, TeamDB, UserDB
+from app.database.pagination import MAX_PAGE_SIZE, clamp_page_size, decode_cursor, encode_cursor, estimate_count
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+
+class TestCursors(unittest.TestCase):
+    """Test class for keyset pagination cursors and page sizes"""
+
+    def test_cursor_round_trip(self):
+        created_at = datetime.datetime(2025, 1, 2, 3, 4, 5, 678, tzinfo=datetime.timezone.utc)
+        self.assertEqual(decode_cursor(encode_cursor(created_at, 42)), (created_at, 42))
+
+    def test_malformed_cursors_are_rejected(self):
+        for cursor in ("", "not a cursor", encode_cursor(datetime.datetime.now(), 1)[:-3]):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_page_sizes_are_clamped(self):
+        self.assertEqual(clamp_page_size(None), 20)
+        self.assertEqual(clamp_page_size(-5), 1)
+        self.assertEqual(clamp_page_size(10_000), MAX_PAGE_SIZE)
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestKeysetPages(DatabaseTestCase):
+    """Test class for paging through a user's report summaries and analyses"""
+
+    def setUp(self):
+        super().setUp()
+
+        self.user = UserDB(email=f"pages-{uuid.uuid4()}@example.com", name="Coach", password_hash="x")
+        team = TeamDB(name="Home")
+        opponent = TeamDB(name="Away")
+        self.db.add_all([self.user, team, opponent])
+        self.db.flush()
+
+        # Pairs of games share a creation time, so pages have to break ties on the ID
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.games = [
+            GameDB(user_id=self.user.id, home_team_id=team.id, away_team_id=opponent.id,
+                   created_at=now - datetime.timedelta(minutes=n // 2))
+            for n in range(7)
+        ]
+        self.db.add_all(self.games)
+        self.db.flush()
+        for game in self.games[:6]:
+            self.db.add(ReportDB(game_id=game.id, report_type="game_analysis", file_path="/tmp/game.docx"))
+        self.db.add(ReportDB(game_id=self.games[0].id, report_type="team_analysis", file_path="/tmp/team.docx"))
+        self.db.flush()
+
+    def test_report_summaries_pages(self):
+        pages = [get_report_summaries_by_user_id(self.db, self.user.id, limit=4)]
+        while pages[-1].next_cursor:
+            pages.append(get_report_summaries_by_user_id(self.db, self.user.id, limit=4, cursor=pages[-1].next_cursor))
+
+        self.assertEqual([len(page.items) for page in pages], [4, 2])
+        self.assertEqual([page.total_estimate for page in pages], [6, None])
+        newest_first = sorted(self.games[:6], key=lambda game: (game.created_at, game.id), reverse=True)
+        self.assertEqual(
+            [summary.game_uuid for page in pages for summary in page.items],
+            [str(game.uuid) for game in newest_first],
+        )
+
+    def test_analyses_pages(self):
+        first = get_recent_analyses(self.db, limit=5, user_id=self.user.id)
+        second = get_recent_analyses(self.db, limit=5, user_id=self.user.id, cursor=first.next_cursor)
+
+        self.assertEqual((len(first.items), len(second.items), second.next_cursor), (5, 2, None))
+        self.assertEqual(first.total_estimate, 7)
+        analyses = {analysis.game_id: analysis for analysis in first.items + second.items}
+        self.assertEqual(len(analyses), 7)
+        self.assertEqual(analyses[self.games[0].id].team_report_path, "/tmp/team.docx")
+        self.assertEqual(analyses[self.games[0].id].report_path, "/tmp/game.docx")
+        self.assertIsNone(analyses[self.games[6].id].report_path)
+
+    def test_games_with_several_simulations_are_listed_once(self):
+        game = self.games[0]
+        self.db.add_all([
+            GameSimulationDB(game_id=game.id, projected_score="Home 60 - Away 50"),
+            GameSimulationDB(game_id=game.id, projected_score="Home 62 - Away 55"),
+            ReportDB(game_id=game.id, report_type="game_analysis", file_path="/tmp/game-2.docx"),
+        ])
+        self.db.flush()
+
+        pages = [get_recent_analyses(self.db, limit=3, user_id=self.user.id)]
+        while pages[-1].next_cursor:
+            pages.append(get_recent_analyses(self.db, limit=3, user_id=self.user.id, cursor=pages[-1].next_cursor))
+
+        analyses = [analysis for page in pages for analysis in page.items]
+        self.assertEqual([len(page.items) for page in pages], [3, 3, 1])
+        self.assertEqual(pages[0].total_estimate, 7)
+        self.assertEqual(sorted(analysis.game_id for analysis in analyses), sorted(game.id for game in self.games))
+        latest = next(analysis for analysis in analyses if analysis.game_id == game.id)
+        self.assertEqual((latest.projected_score, latest.report_path), ("Home 62 - Away 55", "/tmp/game-2.docx"))
+
+    def test_large_counts_are_estimated(self):
+        games = select(GameDB.id).where(GameDB.user_id == self.user.id)
+        self.assertEqual(estimate_count(self.db, games, exact_limit=10), 7)
+        self.assertGreater(estimate_count(self.db, games, exact_limit=3), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
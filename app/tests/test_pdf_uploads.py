@@ -0,0 +1,101 @@
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PyPDF2 import PdfWriter
+from starlette.datastructures import UploadFile
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.services import pdf_uploads
+from app.services.pdf_uploads import UploadTooLarge, store_pdf_upload
+
+
+def make_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def upload_of(content: bytes, filename: str = "team.pdf", with_size: bool = True) -> UploadFile:
+    return UploadFile(io.BytesIO(content), filename=filename, size=len(content) if with_size else None)
+
+
+class TestStorePdfUpload(unittest.IsolatedAsyncioTestCase):
+    """Test class for streaming uploaded PDFs to disk"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.pdf = make_pdf(3)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def stored_files(self):
+        return sorted(os.listdir(self.directory.name))
+
+    async def test_pdf_is_stored_under_its_hash(self):
+        stored = await store_pdf_upload(upload_of(self.pdf), self.directory.name)
+
+        sha256 = hashlib.sha256(self.pdf).hexdigest()
+        self.assertEqual((stored.sha256, stored.size, stored.pages), (sha256, len(self.pdf), 3))
+        self.assertEqual(stored.path, os.path.join(self.directory.name, f"{sha256}.pdf"))
+        self.assertEqual(Path(stored.path).read_bytes(), self.pdf)
+
+    async def test_same_pdf_is_kept_once(self):
+        first = await store_pdf_upload(upload_of(self.pdf, "a.pdf"), self.directory.name)
+        second = await store_pdf_upload(upload_of(self.pdf, "b.pdf"), self.directory.name)
+
+        self.assertEqual(first.path, second.path)
+        self.assertEqual(self.stored_files(), [f"{first.sha256}.pdf"])
+
+    async def test_file_is_read_in_chunks(self):
+        reads = []
+        upload = upload_of(self.pdf)
+        read = upload.read
+
+        async def recording_read(size: int = -1) -> bytes:
+            reads.append(size)
+            return await read(size)
+
+        upload.read = recording_read
+        with patch.object(pdf_uploads, "UPLOAD_CHUNK_BYTES", 100):
+            await store_pdf_upload(upload, self.directory.name)
+
+        self.assertGreater(len(reads), 1)
+        self.assertTrue(all(size == 100 for size in reads))
+
+    async def test_non_pdf_is_rejected_on_its_first_bytes(self):
+        for content in (b"PK\x03\x04" + b"x" * 1000, b"", b"%PD"):
+            with self.assertRaisesRegex(ValueError, "not a PDF"):
+                await store_pdf_upload(upload_of(content, "team.docx"), self.directory.name)
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_unreadable_pdf_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Not a readable PDF"):
+            await store_pdf_upload(upload_of(b"%PDF-1.7\n" + b"garbage" * 100), self.directory.name)
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_oversized_pdf_is_rejected(self):
+        for with_size in (True, False):
+            with self.assertRaises(UploadTooLarge):
+                await store_pdf_upload(upload_of(self.pdf, with_size=with_size), self.directory.name, max_bytes=len(self.pdf) - 1)
+        self.assertEqual(self.stored_files(), [])
+
+    async def test_too_many_pages_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "3 pages"):
+            await store_pdf_upload(upload_of(self.pdf), self.directory.name, max_pages=2)
+        self.assertEqual(self.stored_files(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy.orm import Session
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import get_engine
+from app.database.connection import find_similar_player, trigram_search_available
+from app.database.models import PlayerDB, TeamDB
+from app.services.player_names import build_roster, match_name, normalize_name, resolve_player_ids
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+ROSTER = build_roster(
+    SimpleNamespace(id=player_id, name=name)
+    for player_id, name in [
+        (1, "Jake Sussberg"),
+        (2, "Ryan Sussberg"),
+        (3, "José O'Neil Jr."),
+        (4, "Grant Shigekawa"),
+        (5, "Jason Ling"),
+    ]
+)
+
+
+class TestPlayerNames(unittest.TestCase):
+    """Test class for resolving projected player names against rosters"""
+
+    def test_normalize_name(self):
+        self.assertEqual(normalize_name("#23 José O'Neil Jr."), "jose oneil jr")
+        self.assertEqual(normalize_name("Grant Shigekawa (12)"), "grant shigekawa")
+        self.assertEqual(normalize_name("  JASON   LING #5 "), "jason ling")
+        self.assertEqual(normalize_name("Mary-Kate Smith"), "mary kate smith")
+
+    def test_exact_and_substring_matches(self):
+        self.assertEqual(match_name("Grant Shigekawa #12", ROSTER), 4)
+        self.assertEqual(match_name("Jose O'Neil", ROSTER), 3)
+        self.assertEqual(match_name("Ling", ROSTER), 5)
+
+    def test_initial_and_fuzzy_matches(self):
+        self.assertEqual(match_name("J. Ling", ROSTER), 5)
+        self.assertEqual(match_name("Grant Shigekowa", ROSTER), 4)
+        self.assertIsNone(match_name("Completely Different", ROSTER))
+
+    def test_ambiguous_names_are_not_matched(self):
+        self.assertIsNone(match_name("Sussberg", ROSTER))
+        self.assertEqual(match_name("R. Sussberg", ROSTER), 2)
+
+    def test_number_only_roster_names_are_skipped(self):
+        roster = build_roster([SimpleNamespace(id=0, name="#23"), SimpleNamespace(id=6, name="00"),
+                               SimpleNamespace(id=1, name="John Smith")])
+
+        self.assertEqual(roster, {"john smith": {1}})
+        self.assertEqual(match_name("J. Smith", roster), 1)
+        self.assertIsNone(match_name("J. Smyth", roster))
+
+    def test_players_with_the_same_name_are_ambiguous(self):
+        roster = build_roster([SimpleNamespace(id=1, name="Chris Lee #4"), SimpleNamespace(id=2, name="Chris Lee #15"),
+                               SimpleNamespace(id=3, name="Jason Ling")])
+
+        self.assertEqual(roster["chris lee"], {1, 2})
+        self.assertIsNone(match_name("Chris Lee", roster))
+        self.assertIsNone(match_name("C. Lee", roster))
+        self.assertEqual(match_name("Jason Ling", roster), 3)
+
+    def test_resolve_player_ids_loads_rosters_once(self):
+        rosters = {
+            10: [SimpleNamespace(id=1, name="Jake Sussberg"), SimpleNamespace(id=2, name="Ryan Sussberg")],
+            20: [SimpleNamespace(id=7, name="Jason Ling")],
+        }
+        with patch("app.services.player_names.get_team_rosters", return_value=rosters) as get_team_rosters, \
+                patch("app.services.player_names.trigram_search_available", return_value=False):
+            player_ids = resolve_player_ids(None, {10: ["Jake Sussberg #3", "Unknown"], 20: ["J. Ling"]})
+
+        get_team_rosters.assert_called_once_with(None, [10, 20])
+        self.assertEqual(player_ids, {10: {"Jake Sussberg #3": 1}, 20: {"J. Ling": 7}})
+
+    def test_unmatched_names_fall_back_to_a_trigram_lookup(self):
+        rosters = {10: [SimpleNamespace(id=1, name="Jonathan Smithers"), SimpleNamespace(id=2, name="Jason Ling")]}
+        with patch("app.services.player_names.get_team_rosters", return_value=rosters), \
+                patch("app.services.player_names.trigram_search_available", return_value=True) as available, \
+                patch("app.services.player_names.find_similar_player", side_effect=[1, None]) as find_similar_player:
+            player_ids = resolve_player_ids(None, {10: ["Jason Ling", "Johnny Smithe #4", "Unknown"]})
+
+        available.assert_called_once_with(None)
+        self.assertEqual([call.args[1:] for call in find_similar_player.call_args_list], [(10, "johnny smithe"), (10, "unknown")])
+        self.assertEqual(player_ids, {10: {"Jason Ling": 2, "Johnny Smithe #4": 1}})
+
+    def test_trigram_lookup_is_skipped_without_pg_trgm(self):
+        rosters = {10: [SimpleNamespace(id=1, name="Jonathan Smithers")]}
+        with patch("app.services.player_names.get_team_rosters", return_value=rosters), \
+                patch("app.services.player_names.trigram_search_available", return_value=False), \
+                patch("app.services.player_names.find_similar_player") as find_similar_player:
+            player_ids = resolve_player_ids(None, {10: ["Johnny Smithe", "Unknown"]})
+
+        find_similar_player.assert_not_called()
+        self.assertEqual(player_ids, {10: {}})
+
+
+def trigram_search_installed() -> bool:
+    if not database_available():
+        return False
+    with Session(get_engine()) as db:
+        return trigram_search_available(db)
+
+
+@unittest.skipUnless(trigram_search_installed(), "pg_trgm is not installed")
+class TestFindSimilarPlayer(DatabaseTestCase):
+    """Test class for the trigram name lookup on the players table"""
+
+    def setUp(self):
+        super().setUp()
+        self.team = TeamDB(name="Home")
+        self.db.add(self.team)
+        self.db.flush()
+        self.players = [PlayerDB(team_id=self.team.id, name=name) for name in ("Jonathan Smithers #4", "Jason Ling", "Chris Lee", "Chris Lee")]
+        self.db.add_all(self.players)
+        self.db.flush()
+
+    def test_most_similar_name_of_the_team(self):
+        self.assertEqual(find_similar_player(self.db, self.team.id, "jonathon smither"), self.players[0].id)
+        self.assertIsNone(find_similar_player(self.db, self.team.id, "completely different"))
+        self.assertIsNone(find_similar_player(self.db, self.team.id + 1, "jonathon smither"))
+
+    def test_equally_similar_players_are_ambiguous(self):
+        self.assertIsNone(find_similar_player(self.db, self.team.id, "chris lee"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.llmmodels import Player
+from app.services.projection_bands import bootstrap_bands, game_line_values
+
+
+class TestProjectionBands(unittest.TestCase):
+    """Test class for bootstrap confidence bands on player projections"""
+
+    def test_game_line_values(self):
+        row = SimpleNamespace(fgm=7, fg3m=2, ftm=3, total_rebounds=6, total_assists=4)
+        self.assertEqual(game_line_values(row), [19, 6, 4])
+
+    def test_bands_contain_average(self):
+        values = np.zeros((2, 5, 3))
+        values[0] = [[10, 4, 2], [14, 6, 3], [8, 5, 1], [20, 7, 4], [12, 3, 2]]
+        values[1, :3] = [[5, 2, 1], [5, 2, 1], [5, 2, 1]]
+        counts = np.array([5, 3])
+
+        lower, upper = bootstrap_bands(values, counts, rng=np.random.default_rng(2))
+
+        averages = values[0].mean(axis=0)
+        self.assertTrue(np.all(lower[0] <= averages) and np.all(averages <= upper[0]))
+        self.assertTrue(np.all(lower[0] >= values[0].min(axis=0)))
+        self.assertTrue(np.all(upper[0] <= values[0].max(axis=0)))
+        # Padding games are never sampled: identical lines give a zero-width band
+        np.testing.assert_allclose(lower[1], [5, 2, 1])
+        np.testing.assert_allclose(upper[1], [5, 2, 1])
+
+    def test_full_roster_is_fast(self):
+        rng = np.random.default_rng(4)
+        values = rng.integers(0, 25, size=(15, 5, 3)).astype(float)
+        counts = rng.integers(1, 6, size=15)
+        start = time.perf_counter()
+        bootstrap_bands(values, counts, rng=rng)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_player_without_game_lines(self):
+        stats = {field: 0 for field in ["GP", "FGM", "FGA", "FGM2", "FGA2", "FGM3", "FGA3", "FTM", "FTA",
+                                        "AST", "TO", "STL", "BLK", "REB", "OREB", "DREB"]}
+        stats.update({field: 0.0 for field in ["PPG", "RPG", "APG", "SPG", "BPG", "TOPG", "MINS"]})
+        stats.update({"FG_percent": "0%", "FG3_percent": "0%", "FT_percent": "0%"})
+        player = Player.model_validate({"name": "A", "number": "1", "position": "G", "stats": stats,
+                                        "strengths": [], "weaknesses": []})
+        self.assertEqual(player.game_lines, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+import sys
+import unittest
+from pathlib import Path
+
+from sqlalchemy import desc, func, select, text, tuple_
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import get_engine
+from app.database.models import (
+    GameDB,
+    PlayerDB,
+    PlayerProjectionDB,
+    PlayerStatsDB,
+    ReportDB,
+    TeamAnalysisDB,
+    TeamStatsDB,
+    UserDB,
+)
+from app.tests.database_helpers import database_available
+
+SEED_TABLES = [
+    "users", "teams", "games", "players", "team_stats", "team_analysis",
+    "player_stats", "player_projections", "reports",
+]
+
+# Rows are generated relative to the current maximum IDs, so the seed works on
+# a database that already holds data. Everything is rolled back afterwards.
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (email, name, password_hash)
+    SELECT 'plan-' || n || '@example.com', 'Plan user ' || n, 'x' FROM generate_series(1, 20000) AS n
+    """,
+    "INSERT INTO teams (name) SELECT 'Plan team ' || n FROM generate_series(1, 2000) AS n",
+    """
+    INSERT INTO games (user_id, home_team_id, away_team_id, created_at)
+    SELECT u.max_id - n % 20000, t.max_id - n % 2000, t.max_id - (n + 1) % 2000,
+           now() - n * interval '1 minute'
+    FROM generate_series(1, 100000) AS n,
+         (SELECT max(id) AS max_id FROM users) AS u,
+         (SELECT max(id) AS max_id FROM teams) AS t
+    """,
+    """
+    INSERT INTO players (team_id, name)
+    SELECT t.max_id - n % 2000, 'Plan player ' || n
+    FROM generate_series(1, 30000) AS n, (SELECT max(id) AS max_id FROM teams) AS t
+    """,
+    """
+    INSERT INTO team_stats (team_id, is_season_average)
+    SELECT t.max_id - n % 2000, n % 10 = 0
+    FROM generate_series(1, 100000) AS n, (SELECT max(id) AS max_id FROM teams) AS t
+    """,
+    """
+    INSERT INTO team_analysis (team_id)
+    SELECT t.max_id - n % 2000
+    FROM generate_series(1, 100000) AS n, (SELECT max(id) AS max_id FROM teams) AS t
+    """,
+    """
+    INSERT INTO player_stats (player_id, is_season_average)
+    SELECT p.max_id - n % 30000, n % 10 = 0
+    FROM generate_series(1, 100000) AS n, (SELECT max(id) AS max_id FROM players) AS p
+    """,
+    """
+    INSERT INTO player_projections (game_id, team_id, player_id)
+    SELECT g.max_id - n % 100000, t.max_id - n % 2000, p.max_id - n % 30000
+    FROM generate_series(1, 100000) AS n,
+         (SELECT max(id) AS max_id FROM games) AS g,
+         (SELECT max(id) AS max_id FROM teams) AS t,
+         (SELECT max(id) AS max_id FROM players) AS p
+    """,
+    """
+    INSERT INTO reports (game_id, report_type, file_path)
+    SELECT g.max_id - n / 3, (ARRAY['game_analysis', 'team_analysis', 'opponent_analysis'])[n % 3 + 1], '/tmp/plan.docx'
+    FROM generate_series(1, 100000) AS n, (SELECT max(id) AS max_id FROM games) AS g
+    """,
+]
+
+
+def plan_nodes(plan: dict):
+    """Every node of an EXPLAIN (FORMAT JSON) plan tree"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestQueryPlans(unittest.TestCase):
+    """
+    Query-plan regression test for the report and pipeline lookups
+
+    The tables are seeded with 100k-row datasets inside a transaction, so the
+    planner statistics reflect realistic sizes, and each hot lookup must be
+    answered from its index rather than a sequential scan.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.connection = get_engine().connect()
+        cls.transaction = cls.connection.begin()
+        for statement in SEED_STATEMENTS:
+            cls.connection.execute(text(statement))
+        for table in SEED_TABLES:
+            cls.connection.execute(text(f"ANALYZE {table}"))
+        cls.ids = cls.connection.execute(text(
+            "SELECT (SELECT max(id) FROM users) AS user_id, (SELECT max(id) FROM teams) AS team_id, "
+            "(SELECT max(id) FROM players) AS player_id, (SELECT max(id) FROM games) AS game_id"
+        )).mappings().one()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.transaction.rollback()
+        cls.connection.close()
+        # Row estimates are updated outside the transaction; refresh them
+        with get_engine().connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for table in SEED_TABLES:
+                connection.execute(text(f"ANALYZE {table}"))
+
+    def assertUsesIndex(self, query, index_name: str):
+        compiled = query.compile(get_engine(), compile_kwargs={"literal_binds": True})
+        plan = self.connection.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()[0]["Plan"]
+        nodes = list(plan_nodes(plan))
+        self.assertIn(index_name, [node.get("Index Name") for node in nodes], plan)
+        self.assertNotIn("Seq Scan", [node["Node Type"] for node in nodes], plan)
+
+    def test_users_by_email(self):
+        query = select(UserDB).where(UserDB.email == "plan-42@example.com")
+        self.assertUsesIndex(query, "ix_users_email")
+
+    def test_recent_games_of_user(self):
+        query = (
+            select(GameDB)
+            .where(GameDB.user_id == self.ids["user_id"])
+            .order_by(desc(GameDB.created_at), desc(GameDB.id))
+            .limit(10)
+        )
+        self.assertUsesIndex(query, "ix_games_user_id_created_at_id")
+
+    def test_next_page_of_recent_games_of_user(self):
+        query = (
+            select(GameDB)
+            .where(
+                GameDB.user_id == self.ids["user_id"],
+                tuple_(GameDB.created_at, GameDB.id) < tuple_(func.now(), self.ids["game_id"]),
+            )
+            .order_by(desc(GameDB.created_at), desc(GameDB.id))
+            .limit(10)
+        )
+        self.assertUsesIndex(query, "ix_games_user_id_created_at_id")
+
+    def test_players_of_team(self):
+        query = select(PlayerDB).where(PlayerDB.team_id == self.ids["team_id"])
+        self.assertUsesIndex(query, "ix_players_team_id")
+
+    def test_latest_team_stats(self):
+        query = (
+            select(TeamStatsDB)
+            .where(TeamStatsDB.team_id == self.ids["team_id"], TeamStatsDB.is_season_average.is_(True))
+            .order_by(desc(TeamStatsDB.id))
+            .limit(1)
+        )
+        self.assertUsesIndex(query, "ix_team_stats_team_id_id")
+
+    def test_latest_team_analysis(self):
+        query = (
+            select(TeamAnalysisDB)
+            .where(TeamAnalysisDB.team_id == self.ids["team_id"])
+            .order_by(desc(TeamAnalysisDB.id))
+            .limit(1)
+        )
+        self.assertUsesIndex(query, "ix_team_analysis_team_id_id")
+
+    def test_player_stats_of_player(self):
+        query = select(PlayerStatsDB).where(PlayerStatsDB.player_id == self.ids["player_id"])
+        self.assertUsesIndex(query, "ix_player_stats_player_id")
+
+    def test_player_projections_of_game_team(self):
+        query = select(PlayerProjectionDB).where(
+            PlayerProjectionDB.game_id == self.ids["game_id"],
+            PlayerProjectionDB.team_id == self.ids["team_id"],
+        )
+        self.assertUsesIndex(query, "ix_player_projections_game_id_team_id")
+
+    def test_reports_of_game_by_type(self):
+        query = select(ReportDB).where(
+            ReportDB.game_id == self.ids["game_id"], ReportDB.report_type == "team_analysis"
+        )
+        self.assertUsesIndex(query, "ix_reports_game_id_report_type")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import sys
+import unittest
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import get_engine, read_only_connection
+from app.database.connection import execute_query, stream_query
+from app.tests.database_helpers import database_available
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestReadOnlyQueries(unittest.TestCase):
+    """Test the pooled read-only raw SQL helpers against the configured database"""
+
+    def test_execute_query_returns_dictionaries(self):
+        rows = execute_query("SELECT :value AS value, 'a' AS label", {"value": 3})
+        self.assertEqual(rows, [{"value": 3, "label": "a"}])
+
+    def test_writes_are_rejected(self):
+        with self.assertRaises(DBAPIError) as context:
+            execute_query("CREATE TEMPORARY TABLE read_only_check (id int)")
+        self.assertEqual(type(context.exception.orig).__name__, "ReadOnlySqlTransaction")
+
+    def test_statement_timeout_cancels_slow_queries(self):
+        with self.assertRaises(DBAPIError) as context:
+            execute_query("SELECT pg_sleep(1)", statement_timeout_ms=50)
+        self.assertEqual(type(context.exception.orig).__name__, "QueryCanceled")
+
+    def test_settings_do_not_leak_into_the_pool(self):
+        with read_only_connection(1234) as connection:
+            self.assertEqual(connection.execute(text("SHOW statement_timeout")).scalar(), "1234ms")
+        with get_engine().connect() as connection:
+            self.assertEqual(connection.execute(text("SHOW transaction_read_only")).scalar(), "off")
+            self.assertEqual(connection.execute(text("SHOW statement_timeout")).scalar(), "0")
+
+    def test_stream_query_yields_every_row(self):
+        rows = stream_query("SELECT generate_series(1, :count) AS n", {"count": 2500}, batch_size=100)
+        self.assertEqual([row["n"] for row in rows], list(range(1, 2501)))
+
+
+if __name__ == "__main__":
+    unittest.main()
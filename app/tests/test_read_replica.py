@@ -0,0 +1,167 @@
+import datetime
+import sys
+import time
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy import create_engine, event, func, select, text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import get_async_database_url, get_engine, get_replica_database_url
+from app.database.connection import REPORT_SNAPSHOT_VERSION, has_recent_report, report_snapshot_statement
+from app.database.models import GameDB, ReportSnapshotDB, TeamDB, UserDB
+from app.database.replica import read_session_for_user
+from app.services.report_cache import report_cache
+from app.services.report_snapshots import read_report_async
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+
+def replica_available() -> bool:
+    """A replica of the test database is configured (DB_REPLICA_HOST) and reachable"""
+    replica_url = get_replica_database_url()
+    if replica_url is None:
+        return False
+    try:
+        with create_engine(replica_url, poolclass=NullPool).connect() as connection:
+            return connection.execute(text("SELECT pg_is_in_recovery()")).scalar()
+    except OperationalError:
+        return False
+
+
+class TestReadSessionForUser(unittest.TestCase):
+    """Test class for choosing between the primary and the replica"""
+
+    def setUp(self):
+        self.db, self.read_db = MagicMock(name="primary"), MagicMock(name="replica")
+
+    def test_primary_without_replica(self):
+        with patch("app.database.replica.replica_configured", return_value=False):
+            self.assertIs(read_session_for_user(self.db, self.read_db, "coach@example.com"), self.db)
+
+    def test_replica_unless_a_game_just_completed(self):
+        with patch("app.database.replica.replica_configured", return_value=True), \
+                patch("app.database.replica.has_recent_report", side_effect=[False, True]) as has_recent_report:
+            self.assertIs(read_session_for_user(self.db, self.read_db, "coach@example.com"), self.read_db)
+            self.assertIs(read_session_for_user(self.db, self.read_db, "coach@example.com"), self.db)
+        self.assertIs(has_recent_report.call_args.args[0], self.db)
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestReplicaLagGuard(DatabaseTestCase):
+    """Test class for telling recent report snapshots from settled ones, whatever the session time zone"""
+
+    def setUp(self):
+        super().setUp()
+        self.email = f"lag-{uuid.uuid4()}@example.com"
+        user = UserDB(email=self.email, name="Coach", password_hash="x")
+        team, opponent = TeamDB(name="Home"), TeamDB(name="Away")
+        self.db.add_all([user, team, opponent])
+        self.db.flush()
+        self.game = GameDB(user_id=user.id, home_team_id=team.id, away_team_id=opponent.id)
+        self.db.add(self.game)
+        self.db.flush()
+        self.db.add(ReportSnapshotDB(game_uuid=self.game.uuid, game_id=self.game.id, user_id=user.id,
+                                     version=REPORT_SNAPSHOT_VERSION, report="{}"))
+        self.db.flush()
+
+    def written(self, age: int):
+        # Stamped on the server, like the snapshot writes
+        self.db.execute(update(ReportSnapshotDB).where(ReportSnapshotDB.game_uuid == self.game.uuid)
+                        .values(updated_at=func.timezone("utc", func.now()) - datetime.timedelta(seconds=age)))
+        settled = self.db.execute(report_snapshot_statement(str(self.game.uuid), self.email, settled_seconds=30)).scalar()
+        return has_recent_report(self.db, self.email, 30), settled is not None
+
+    def test_guard_ignores_the_session_time_zone(self):
+        for time_zone in ("UTC", "Asia/Tokyo", "America/New_York"):
+            with self.subTest(time_zone=time_zone):
+                self.db.execute(text(f"SET LOCAL TimeZone = '{time_zone}'"))
+
+                self.assertEqual(self.written(0), (True, False))
+                self.assertEqual(self.written(3600), (False, True))
+
+
+@unittest.skipUnless(replica_available(), "No streaming replica configured (DB_REPLICA_HOST)")
+class TestReplicaRouting(unittest.IsolatedAsyncioTestCase):
+    """
+    Test class for report reads against a real primary and streaming replica
+
+    Rows are committed on the primary, so the replica can see them, and
+    deleted afterwards.
+    """
+
+    def setUp(self):
+        report_cache.clear()
+        self.email = f"replica-{uuid.uuid4()}@example.com"
+        with Session(get_engine()) as db:
+            user = UserDB(email=self.email, name="Coach", password_hash="x")
+            team, opponent = TeamDB(name="Home"), TeamDB(name="Away")
+            db.add_all([user, team, opponent])
+            db.flush()
+            self.games = [GameDB(user_id=user.id, home_team_id=team.id, away_team_id=opponent.id) for _ in range(2)]
+            db.add_all(self.games)
+            db.flush()
+            # The first report was completed an hour ago, the second one just now
+            for game, age, report in ((self.games[0], 3600, '{"settled": true}'), (self.games[1], 0, '{"settled": false}')):
+                db.add(ReportSnapshotDB(game_uuid=game.uuid, game_id=game.id, user_id=user.id, version=REPORT_SNAPSHOT_VERSION,
+                                        report=report, updated_at=datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(seconds=age)))
+            db.commit()
+            self.ids = {"user": user.id, "teams": [team.id, opponent.id], "games": [game.id for game in self.games]}
+
+        # Wait for the replica to catch up
+        with create_engine(get_replica_database_url(), poolclass=NullPool).connect() as connection:
+            deadline = time.monotonic() + 10
+            while connection.execute(select(UserDB.id).where(UserDB.email == self.email)).first() is None:
+                self.assertLess(time.monotonic(), deadline, "replica did not catch up")
+                time.sleep(0.1)
+                connection.rollback()
+
+    def tearDown(self):
+        report_cache.clear()
+        with Session(get_engine()) as db:
+            db.query(ReportSnapshotDB).filter(ReportSnapshotDB.user_id == self.ids["user"]).delete()
+            db.query(GameDB).filter(GameDB.id.in_(self.ids["games"])).delete()
+            db.query(TeamDB).filter(TeamDB.id.in_(self.ids["teams"])).delete()
+            db.query(UserDB).filter(UserDB.id == self.ids["user"]).delete()
+            db.commit()
+
+    async def asyncSetUp(self):
+        self.engines = {
+            "primary": create_async_engine(get_async_database_url(), poolclass=NullPool),
+            "replica": create_async_engine(get_replica_database_url().replace("postgresql://", "postgresql+asyncpg://", 1), poolclass=NullPool),
+        }
+        self.statements = {name: [] for name in self.engines}
+        for name, engine in self.engines.items():
+            event.listen(engine.sync_engine, "before_cursor_execute",
+                         lambda *args, name=name: self.statements[name].append(args[2]))
+        self.db = AsyncSession(self.engines["primary"])
+        self.read_db = AsyncSession(self.engines["replica"])
+
+    async def asyncTearDown(self):
+        await self.db.close()
+        await self.read_db.close()
+        for engine in self.engines.values():
+            await engine.dispose()
+
+    async def test_settled_reports_are_read_from_the_replica(self):
+        report = await read_report_async(self.db, str(self.games[0].uuid), self.email, read_db=self.read_db)
+
+        self.assertEqual(report, b'{"settled": true}')
+        self.assertEqual((len(self.statements["replica"]), len(self.statements["primary"])), (1, 0))
+
+    async def test_recent_reports_fall_back_to_the_primary(self):
+        report = await read_report_async(self.db, str(self.games[1].uuid), self.email, read_db=self.read_db)
+
+        self.assertEqual(report, b'{"settled": false}')
+        self.assertEqual((len(self.statements["replica"]), len(self.statements["primary"])), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
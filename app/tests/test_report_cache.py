@@ -0,0 +1,53 @@
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.services.report_cache import ReportCache
+
+
+class TestReportCache(unittest.TestCase):
+    """Test class for the in-process LRU cache of completed reports"""
+
+    def setUp(self):
+        self.cache = ReportCache(max_bytes=10)
+
+    def test_hits_require_the_owner(self):
+        self.cache.put("ABC", "coach@example.com", b"report")
+
+        self.assertEqual(self.cache.get("abc", "coach@example.com"), b"report")
+        self.assertIsNone(self.cache.get("abc", "other@example.com"))
+        self.assertIsNone(self.cache.get("missing", "coach@example.com"))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_least_recently_used_reports_are_evicted_by_size(self):
+        self.cache.put("a", "coach", b"1234")
+        self.cache.put("b", "coach", b"1234")
+        self.cache.get("a", "coach")
+        self.cache.put("c", "coach", b"1234")
+
+        self.assertIsNone(self.cache.get("b", "coach"))
+        self.assertEqual(self.cache.get("a", "coach"), b"1234")
+        self.assertEqual(self.cache.stats()["bytes"], 8)
+        self.assertEqual(self.cache.evictions, 1)
+
+    def test_reports_larger_than_the_budget_are_not_cached(self):
+        self.cache.put("a", "coach", b"x" * 11)
+
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    def test_invalidate(self):
+        self.cache.put("a", "coach", b"1234")
+        self.cache.put("a", "coach", b"12")
+        self.cache.invalidate("A")
+        self.cache.invalidate("missing")
+
+        self.assertIsNone(self.cache.get("a", "coach"))
+        self.assertEqual(self.cache.stats()["bytes"], 0)
+        self.assertEqual(self.cache.invalidations, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import sys
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.models import ScheduleGameDB, TeamDB, UserDB
+from app.services import season
+from app.services.season import clear_matchup_cache, matchup_win_probabilities, project_season, simulate_season
+from app.services.simulation_engine import simulate_matchups
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+
+class TestSeasonProjection(unittest.TestCase):
+    """Test class for the remaining-season simulation"""
+
+    def setUp(self):
+        clear_matchup_cache()
+        self.rng = np.random.default_rng(3)
+        # ppg, rpg, fgPct, threePct, tpg, apg, spg, bpg
+        self.vectors = np.array([
+            [72.0, 36.0, 0.47, 0.36, 11.0, 15.0, 8.0, 4.0],
+            [64.0, 32.0, 0.43, 0.33, 13.0, 13.0, 7.0, 3.0],
+            [58.0, 29.0, 0.40, 0.30, 15.0, 11.0, 6.0, 2.0],
+        ])
+
+    def test_repeated_matchups_are_simulated_once(self):
+        pairs = np.array([[0, 1], [1, 2], [0, 1], [2, 0], [0, 1], [1, 2]])
+        with patch.object(season, "simulate_matchups", wraps=simulate_matchups) as engine:
+            first = matchup_win_probabilities(self.vectors, pairs, rng=self.rng)
+            second = matchup_win_probabilities(self.vectors, pairs[:2], rng=self.rng)
+
+        self.assertEqual(engine.call_count, 1)
+        self.assertEqual(len(engine.call_args.args[0]), 3)
+        self.assertEqual(first[0], first[2])
+        np.testing.assert_array_equal(second, first[:2])
+        self.assertGreater(first[0], 0.5)
+
+    def test_changed_stats_are_simulated_again(self):
+        pairs = np.array([[0, 1]])
+        matchup_win_probabilities(self.vectors, pairs, rng=self.rng)
+        self.vectors[1, 0] += 5
+        with patch.object(season, "simulate_matchups", wraps=simulate_matchups) as engine:
+            matchup_win_probabilities(self.vectors, pairs, rng=self.rng)
+        self.assertEqual(engine.call_count, 1)
+
+    def test_certain_outcomes(self):
+        pairs = np.array([[0, 1], [1, 2], [2, 0]])
+        wins, seeds = simulate_season(np.array([1.0, 1.0, 0.0]), pairs, np.array([2.0, 0.0, 1.0]), 100, rng=self.rng)
+
+        np.testing.assert_array_equal(wins, np.tile([4, 1, 1], (100, 1)))
+        np.testing.assert_array_equal(seeds[:, 0], 1)
+        # Teams 1 and 2 finish tied, so each takes the second seed about half the time
+        self.assertEqual(set(seeds[:, 1]), {2, 3})
+        np.testing.assert_array_equal(np.sort(seeds, axis=1), np.tile([1, 2, 3], (100, 1)))
+
+    def test_record_distribution(self):
+        pairs = np.array([[0, 1]] * 10)
+        wins, _ = simulate_season(np.full(10, 0.7), pairs, np.zeros(2), 20000, rng=self.rng)
+        np.testing.assert_array_equal(wins.sum(axis=1), 10)
+        self.assertAlmostEqual(wins[:, 0].mean(), 7.0, delta=0.1)
+
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestSeasonRecord(DatabaseTestCase):
+    """Test class for the current record of a projected season"""
+
+    def test_tied_games_count_for_neither_team(self):
+        user = UserDB(email=f"season-{uuid.uuid4()}@example.com", name="Coach", password_hash="x")
+        home, away = TeamDB(name="Home"), TeamDB(name="Away")
+        self.db.add_all([user, home, away])
+        self.db.flush()
+        self.db.add_all([
+            ScheduleGameDB(user_id=user.id, home_team_id=home.id, away_team_id=away.id, home_score=60, away_score=55),
+            ScheduleGameDB(user_id=user.id, home_team_id=away.id, away_team_id=home.id, home_score=50, away_score=50),
+        ])
+        self.db.flush()
+
+        projection = project_season(self.db, user.id, away.id, num_simulations=100)
+
+        self.assertEqual((projection["current_wins"], projection["current_losses"]), (0, 1))
+        self.assertEqual(projection["records"], [{"wins": 0, "losses": 1, "probability": 100.0}])
+        self.assertEqual(projection["team_uuid"], str(away.uuid))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from fastapi import HTTPException
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.routers.simulation import WhatIfRequest, WhatIfScenario, what_if
+from app.services.simulation_engine import (
+    build_scenarios,
+    simulate_matchups,
+    team_vector,
+    team_vector_from_dict,
+)
+from app.services.anthropic_api import simulateGame
+from app.services.league import rank_teams
+from app.tests.database_helpers import make_team_stats
+
+
+class TestSimulationEngine(unittest.TestCase):
+    """Test class for the vectorized local simulation engine"""
+
+    def setUp(self):
+        self.team = team_vector(make_team_stats())
+        self.opponent = team_vector(make_team_stats(ppg=64.0, rebounds=31.0, fg_pct="42.5%", turnovers=14.0))
+
+    def test_team_vector_parses_percentages(self):
+        self.assertAlmostEqual(self.opponent[2], 0.425)
+        self.assertAlmostEqual(self.opponent[3], 0.34)
+
+    def test_matches_scalar_simulation(self):
+        """The vectorized engine applies the same effects as simulateGame"""
+        team_a = {"name": "A", "ppg": 68.0, "rpg": 34.0, "fgPct": 0.45, "threePct": 0.34,
+                  "tpg": 12.0, "apg": 14.0, "spg": 7.0, "bpg": 3.0}
+        team_b = {"name": "B", "ppg": 64.0, "rpg": 31.0, "fgPct": 0.425, "threePct": 0.34,
+                  "tpg": 14.0, "apg": 14.0, "spg": 7.0, "bpg": 3.0}
+
+        results = simulate_matchups(team_vector_from_dict(team_a), team_vector_from_dict(team_b), 1)
+        scalar_effects = simulateGame(team_a, team_b)["effects"]
+        self.assertAlmostEqual(results["effects"].sum(), scalar_effects["total"], places=1)
+
+    def test_what_if_deltas(self):
+        team_matrix, opponent_matrix = build_scenarios(self.team, self.opponent, [
+            [{"team": "opponent", "stat": "ppg", "delta": 10}],
+            [{"team": "team", "stat": "turnovers", "delta": -3}],
+        ])
+        results = simulate_matchups(team_matrix, opponent_matrix, 20000,
+                                    rng=np.random.default_rng(1), common_random_numbers=True)
+
+        baseline, stronger_opponent, fewer_turnovers = results["win_prob"]
+        self.assertLess(stronger_opponent, baseline)
+        self.assertGreater(fewer_turnovers, baseline)
+
+    def test_fifty_scenarios_are_fast(self):
+        scenarios = [[{"team": "opponent", "stat": "fg3_pct", "delta": -i / 10}] for i in range(50)]
+        start = time.perf_counter()
+        team_matrix, opponent_matrix = build_scenarios(self.team, self.opponent, scenarios)
+        simulate_matchups(team_matrix, opponent_matrix, 10000, common_random_numbers=True)
+        self.assertLess(time.perf_counter() - start, 0.2)
+
+    def test_league_rankings(self):
+        strong = team_vector(make_team_stats(ppg=75.0, rebounds=38.0))
+        weak = team_vector(make_team_stats(ppg=60.0, turnovers=16.0))
+        vectors = np.vstack([self.opponent, strong, weak])
+        rows, cols = np.nonzero(~np.eye(3, dtype=bool))
+
+        matrix = np.full((3, 3), np.nan)
+        matrix[rows, cols] = simulate_matchups(vectors[rows], vectors[cols], 5000)["win_prob"] * 100
+        rankings = rank_teams(matrix, [10, 20, 30], {10: "Mid", 20: "Strong", 30: "Weak"})
+
+        self.assertEqual([ranking["team_name"] for ranking in rankings], ["Strong", "Mid", "Weak"])
+        self.assertEqual(rankings[0]["rank"], 1)
+
+    def test_what_if_unknown_user_is_not_found(self):
+        request = WhatIfRequest(scenarios=[WhatIfScenario(perturbations=[])])
+        with patch("app.routers.simulation.get_user_by_email", return_value=None):
+            with self.assertRaises(HTTPException) as raised:
+                what_if("game-uuid", request, "nobody@example.com", MagicMock())
+
+        self.assertEqual((raised.exception.status_code, raised.exception.detail), (404, "User not found"))
+
+
+if __name__ == '__main__':
+    unittest.main()
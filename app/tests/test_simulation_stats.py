@@ -0,0 +1,143 @@
+import random
+import statistics
+import sys
+import unittest
+from pathlib import Path
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+
+from app.services.simulation_stats import (
+    Histogram,
+    QuantileSketch,
+    RunningStats,
+    mean_interval,
+    proportion_interval,
+)
+from app.services.anthropic_api import runAdaptiveSimulations, runSimulations
+
+
+TEAM_A = {"name": "Team A", "ppg": 68.0, "rpg": 34.0, "fgPct": 0.45, "threePct": 0.34,
+          "tpg": 12.0, "apg": 14.0, "spg": 7.0, "bpg": 3.0}
+TEAM_B = {"name": "Team B", "ppg": 62.0, "rpg": 31.0, "fgPct": 0.42, "threePct": 0.31,
+          "tpg": 14.0, "apg": 12.0, "spg": 6.0, "bpg": 2.5}
+
+
+class TestSimulationStats(unittest.TestCase):
+    """Test class for the streaming simulation accumulators"""
+
+    def test_running_stats_matches_batch_statistics(self):
+        values = [random.gauss(70, 9) for _ in range(1000)]
+        stats = RunningStats()
+        for value in values:
+            stats.push(value)
+
+        self.assertEqual(stats.count, 1000)
+        self.assertAlmostEqual(stats.mean, statistics.fmean(values), places=9)
+        self.assertAlmostEqual(stats.variance, statistics.variance(values), places=6)
+        self.assertEqual(stats.min, min(values))
+        self.assertEqual(stats.max, max(values))
+
+    def test_running_stats_merge(self):
+        values = [random.uniform(40, 100) for _ in range(500)]
+        left, right, combined = RunningStats(), RunningStats(), RunningStats()
+        for value in values[:200]:
+            left.push(value)
+        for value in values[200:]:
+            right.push(value)
+        for value in values:
+            combined.push(value)
+
+        left.merge(right)
+        self.assertEqual(left.count, combined.count)
+        self.assertAlmostEqual(left.mean, combined.mean, places=9)
+        self.assertAlmostEqual(left.variance, combined.variance, places=6)
+
+    def test_push_many_matches_push(self):
+        values = np.random.default_rng(3).integers(-30, 30, 400)
+        single, block = RunningStats(), RunningStats()
+        single_histogram, block_histogram = Histogram([-10, 0, 10]), Histogram([-10, 0, 10])
+        single_sketch, block_sketch = QuantileSketch(), QuantileSketch()
+        for value in values.tolist():
+            single.push(value)
+            single_histogram.push(value)
+            single_sketch.push(value)
+        block.push_many(values[:150])
+        block.push_many(values[150:])
+        block_histogram.push_many(values)
+        block_sketch.push_many(values)
+
+        self.assertAlmostEqual(single.mean, block.mean, places=9)
+        self.assertAlmostEqual(single.variance, block.variance, places=6)
+        self.assertEqual((single.min, single.max), (block.min, block.max))
+        self.assertEqual(single_histogram.counts, block_histogram.counts)
+        self.assertEqual(single_sketch.to_dict(), block_sketch.to_dict())
+
+    def test_confidence_intervals(self):
+        lower, upper = proportion_interval(500, 500)
+        self.assertAlmostEqual(upper, 1.0)
+        self.assertGreater(lower, 0.99)
+
+        lower, upper = proportion_interval(50, 100)
+        self.assertAlmostEqual((lower + upper) / 2, 0.5)
+        self.assertAlmostEqual(upper - lower, 2 * 1.96 * 0.05, delta=0.01)
+
+        stats = RunningStats()
+        stats.push_many(np.array([1.0, 3.0]))
+        lower, upper = mean_interval(stats)
+        self.assertAlmostEqual((lower + upper) / 2, 2.0)
+
+    def test_histogram_bucket_boundaries(self):
+        histogram = Histogram([5, 10], labels=["1-5", "6-10", "11+"])
+        for value in [0, 5, 6, 10, 11, 40]:
+            histogram.push(value)
+
+        self.assertEqual(histogram.counts, [2, 2, 2])
+        self.assertEqual(histogram.to_distribution()["11+"], {"count": 2, "percentage": 33.3})
+
+    def test_quantile_sketch(self):
+        sketch = QuantileSketch()
+        for value in range(1, 101):
+            sketch.push(value)
+
+        self.assertEqual(sketch.to_dict(), {"p5": 5, "p50": 50, "p95": 95})
+
+    def test_run_simulations_aggregates(self):
+        results = runSimulations(TEAM_A, TEAM_B, 2000)
+
+        self.assertEqual(results["teamAWins"] + results["teamBWins"], 2000)
+        self.assertEqual(sum(bucket["count"] for bucket in results["marginDistribution"].values()), 2000)
+        self.assertEqual(sum(results["marginHistogram"]["counts"]), 2000)
+
+        score_a = results["scoreDistribution"]["teamA"]
+        self.assertLessEqual(score_a["p5"], score_a["p50"])
+        self.assertLessEqual(score_a["p50"], score_a["p95"])
+        self.assertAlmostEqual(score_a["mean"], results["avgScoreA"], delta=0.1)
+        self.assertEqual(results["effectStats"]["total"]["std"], 0)
+
+    def test_adaptive_simulations_stop_early_for_lopsided_games(self):
+        weak = {**TEAM_B, "name": "Weak", "ppg": 40.0, "tpg": 20.0}
+        results = runAdaptiveSimulations(TEAM_A, weak, blockSize=500, maxSimulations=20000,
+                                         winPctTolerance=1.0, marginTolerance=1.0,
+                                         rng=np.random.default_rng(5))
+
+        self.assertTrue(results["converged"])
+        self.assertLessEqual(results["numSimulations"], 1000)
+        self.assertEqual(results["teamAWins"] + results["teamBWins"], results["numSimulations"])
+        self.assertEqual(sum(results["marginHistogram"]["counts"]), results["numSimulations"])
+
+    def test_adaptive_simulations_sample_close_games(self):
+        results = runAdaptiveSimulations(TEAM_A, {**TEAM_A, "name": "Mirror"}, blockSize=500,
+                                         maxSimulations=20000, winPctTolerance=1.0, marginTolerance=1.0,
+                                         rng=np.random.default_rng(5))
+
+        self.assertGreater(results["numSimulations"], 5000)
+        self.assertLessEqual(results["winPctCI"]["upper"] - results["winPctCI"]["lower"], 2.1)
+        self.assertLessEqual(results["winPctCI"]["lower"], results["teamAWinPct"])
+        self.assertGreaterEqual(results["winPctCI"]["upper"], results["teamAWinPct"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,225 @@
+import asyncio
+import json
+import sys
+import unittest
+import uuid
+from pathlib import Path
+from unittest.mock import patch
+
+from sqlalchemy import delete, text
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.common import database_context
+from app.database.connection import get_task_progress
+from app.database.models import GameDB, ProcessingTaskDB, TeamDB, UserDB
+from app.routers import upload
+from app.routers.upload import PROCESSING_STEPS, set_task_step, task_progress_response
+from app.services.task_events import RESYNC, TASK_EVENTS_CHANNEL, TaskEventHub
+from app.tests.database_helpers import database_available
+
+
+def notification(task_uuid: str, step: int, status: str = "processing") -> str:
+    return json.dumps({"task_uuid": task_uuid, "status": status, "step": step, "total_steps": 6, "game_uuid": None})
+
+
+class TestTaskEventHub(unittest.IsolatedAsyncioTestCase):
+    """Test class for fanning task notifications out to subscribers, without a database"""
+
+    async def asyncSetUp(self):
+        self.hub = TaskEventHub()
+        self.hub._connect = self._no_connection
+        self.task_uuid = str(uuid.uuid4())
+
+    @staticmethod
+    async def _no_connection():
+        pass
+
+    async def test_notifications_reach_every_subscriber_of_the_task(self):
+        first = await self.hub.subscribe(self.task_uuid)
+        second = await self.hub.subscribe(self.task_uuid.upper())
+        other = await self.hub.subscribe(str(uuid.uuid4()))
+
+        self.hub._on_notification(None, 1, TASK_EVENTS_CHANNEL, notification(self.task_uuid, 2))
+
+        self.assertEqual(first.get_nowait()["step"], 2)
+        self.assertEqual(second.get_nowait()["step"], 2)
+        self.assertTrue(other.empty())
+
+    async def test_child_notifications_reach_the_batch_subscribers(self):
+        child_uuid = str(uuid.uuid4())
+        batch = await self.hub.subscribe(self.task_uuid)
+        child = await self.hub.subscribe(child_uuid)
+
+        event = {**json.loads(notification(child_uuid, 3)), "parent_uuid": self.task_uuid}
+        self.hub._on_notification(None, 1, TASK_EVENTS_CHANNEL, json.dumps(event))
+
+        self.assertEqual(batch.get_nowait()["task_uuid"], child_uuid)
+        self.assertEqual(child.get_nowait()["task_uuid"], child_uuid)
+        self.assertTrue(batch.empty())
+
+    async def test_batch_stream_rereads_on_child_events(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+        child_event = {**json.loads(notification(str(uuid.uuid4()), 5, "completed")), "parent_uuid": self.task_uuid}
+        queue.put_nowait(child_event)
+        first = task_progress_response(self.task_uuid, "processing", 1, len(PROCESSING_STEPS))
+        reread = task_progress_response(self.task_uuid, "completed", 5, len(PROCESSING_STEPS))
+
+        async def read_task_progress(task_uuid):
+            return reread
+
+        with patch.object(upload, "task_event_hub", self.hub), patch.object(upload, "_read_task_progress", read_task_progress):
+            events = [event async for event in upload._task_progress_events(self.task_uuid, queue, first)]
+
+        progress = [json.loads(event.removeprefix("data: ")) for event in events]
+        self.assertEqual([(item["task_uuid"], item["status"]) for item in progress],
+                         [(self.task_uuid, "processing"), (self.task_uuid, "completed")])
+
+    async def test_malformed_notifications_are_ignored(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+
+        self.hub._on_notification(None, 1, TASK_EVENTS_CHANNEL, "not json")
+        self.hub._on_notification(None, 1, TASK_EVENTS_CHANNEL, "{}")
+
+        self.assertTrue(queue.empty())
+
+    async def test_unsubscribe_drops_the_queue(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+        self.hub.unsubscribe(self.task_uuid, queue)
+        self.hub.unsubscribe(self.task_uuid, queue)
+
+        self.assertEqual(self.hub.subscriber_count(), 0)
+
+    async def test_stream_ends_when_the_task_is_over(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+        for step in (1, 2):
+            queue.put_nowait(json.loads(notification(self.task_uuid, step)))
+        queue.put_nowait(json.loads(notification(self.task_uuid, 5, "completed")))
+        first = task_progress_response(self.task_uuid, "processing", 0, len(PROCESSING_STEPS))
+
+        with patch.object(upload, "task_event_hub", self.hub):
+            events = [event async for event in upload._task_progress_events(self.task_uuid, queue, first)]
+
+        progress = [json.loads(event.removeprefix("data: ")) for event in events]
+        self.assertEqual([item["current_step"] for item in progress], [0, 1, 2, 5])
+        self.assertEqual(progress[-1]["status"], "completed")
+        self.assertEqual(progress[-1]["step_description"], PROCESSING_STEPS[5])
+        self.assertEqual(self.hub.subscriber_count(), 0)
+
+    def test_sections_become_ready_with_their_steps(self):
+        def sections(status, step):
+            return task_progress_response(self.task_uuid, status, step, len(PROCESSING_STEPS)).ready_sections
+
+        self.assertEqual(sections("processing", 1), [])
+        self.assertEqual(sections("processing", 2), ["scouting"])
+        self.assertEqual(sections("processing", 4), ["scouting", "simulation"])
+        self.assertEqual(sections("completed", 5), ["scouting", "simulation", "report"])
+        self.assertEqual(sections("failed", 3), ["scouting"])
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestTaskNotifications(unittest.IsolatedAsyncioTestCase):
+    """Test class for the processing_tasks notify trigger, which needs committed writes"""
+
+    def setUp(self):
+        self.task_uuid = str(uuid.uuid4())
+        self.email = f"events-{uuid.uuid4()}@example.com"
+        with database_context() as db:
+            db.add(ProcessingTaskDB(task_uuid=self.task_uuid, status="processing", opponent_file_path="/tmp/opponent.pdf",
+                                    step=0, total_steps=len(PROCESSING_STEPS)))
+            db.commit()
+
+    def tearDown(self):
+        with database_context() as db:
+            game_id = db.query(ProcessingTaskDB.game_id).filter(ProcessingTaskDB.task_uuid == self.task_uuid).scalar()
+            db.execute(delete(ProcessingTaskDB).where(ProcessingTaskDB.task_uuid == self.task_uuid))
+            game = db.get(GameDB, game_id) if game_id is not None else None
+            if game is not None:
+                db.delete(game)
+                db.flush()
+                db.execute(delete(TeamDB).where(TeamDB.id.in_([game.home_team_id, game.away_team_id])))
+            db.execute(delete(UserDB).where(UserDB.email == self.email))
+            db.commit()
+
+    async def asyncSetUp(self):
+        # Its listening connection belongs to this test's event loop
+        self.hub = TaskEventHub()
+
+    async def asyncTearDown(self):
+        await self.hub.close()
+
+    def _set_step(self, step: int, **values):
+        with database_context() as db:
+            set_task_step(db, self.task_uuid, step, **values)
+            db.commit()
+
+    async def _next(self, queue: asyncio.Queue) -> dict:
+        return await asyncio.wait_for(queue.get(), 5)
+
+    async def test_committed_transitions_are_notified(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+
+        await asyncio.to_thread(self._set_step, 1)
+        event = await self._next(queue)
+
+        self.assertEqual(event, {"task_uuid": self.task_uuid, "status": "processing", "step": 1,
+                                 "total_steps": len(PROCESSING_STEPS), "game_uuid": None, "parent_uuid": None})
+
+    async def test_only_changes_are_notified(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+
+        await asyncio.to_thread(self._set_step, 0)
+        await asyncio.to_thread(self._set_step, 2)
+
+        self.assertEqual((await self._next(queue))["step"], 2)
+        self.assertTrue(queue.empty())
+
+    async def test_rolled_back_transitions_are_not_notified(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+
+        def roll_back():
+            with database_context() as db:
+                set_task_step(db, self.task_uuid, 3)
+                db.rollback()
+
+        await asyncio.to_thread(roll_back)
+        await asyncio.to_thread(self._set_step, 4)
+
+        self.assertEqual((await self._next(queue))["step"], 4)
+
+    async def test_completion_carries_the_game_uuid(self):
+        def complete():
+            with database_context() as db:
+                user = UserDB(email=self.email, name="Coach", password_hash="x")
+                team, opponent = TeamDB(name="Home"), TeamDB(name="Away")
+                db.add_all([user, team, opponent])
+                db.flush()
+                game = GameDB(user_id=user.id, home_team_id=team.id, away_team_id=opponent.id)
+                db.add(game)
+                db.flush()
+                set_task_step(db, self.task_uuid, 5, status="completed", game_id=game.id)
+                db.commit()
+                return str(game.uuid)
+
+        queue = await self.hub.subscribe(self.task_uuid)
+        game_uuid = await asyncio.to_thread(complete)
+        event = await self._next(queue)
+
+        self.assertEqual((event["status"], event["game_uuid"]), ("completed", game_uuid))
+        with database_context() as db:
+            self.assertEqual(tuple(get_task_progress(db, self.task_uuid)), ("completed", 5, len(PROCESSING_STEPS), uuid.UUID(game_uuid)))
+
+    async def test_lost_connection_resyncs_subscribers(self):
+        queue = await self.hub.subscribe(self.task_uuid)
+
+        with database_context() as db:
+            db.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": self.hub._connection.get_server_pid()})
+
+        self.assertIs(await self._next(queue), RESYNC)
+        await asyncio.to_thread(self._set_step, 1)
+        self.assertEqual((await self._next(queue))["step"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import sys
+import unittest
+from pathlib import Path
+
+from sqlalchemy import Column, Integer, String, create_engine, event
+from sqlalchemy.orm import Session, declarative_base
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.unit_of_work import UnitOfWork
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+class TestUnitOfWork(unittest.TestCase):
+    """Test class for step commits, savepoints and commit counting"""
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+
+        # Let SQLAlchemy emit BEGIN itself so SAVEPOINT works with pysqlite
+        @event.listens_for(self.engine, "connect")
+        def do_connect(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(self.engine, "begin")
+        def do_begin(connection):
+            connection.exec_driver_sql("BEGIN")
+
+        Base.metadata.create_all(self.engine)
+        self.db = Session(self.engine)
+
+    def tearDown(self):
+        self.db.close()
+        self.engine.dispose()
+
+    def names(self):
+        with Session(self.engine) as other:
+            return sorted(name for (name,) in other.query(Item.name).all())
+
+    def test_step_commits_once(self):
+        with UnitOfWork(self.db, "task-1") as uow:
+            with uow.step("insert"):
+                self.db.add_all([Item(name="a"), Item(name="b")])
+                self.db.flush()
+            self.assertEqual(uow.commit_count, 1)
+            self.assertEqual(uow.task_commit_count, 1)
+        self.assertEqual(self.names(), ["a", "b"])
+
+    def test_failed_step_is_rolled_back(self):
+        with UnitOfWork(self.db) as uow:
+            with uow.step("first"):
+                self.db.add(Item(name="kept"))
+            with self.assertRaises(ValueError):
+                with uow.step("second"):
+                    self.db.add(Item(name="lost"))
+                    self.db.flush()
+                    raise ValueError("step failed")
+            self.assertEqual(uow.commit_count, 1)
+        self.assertEqual(self.names(), ["kept"])
+
+    def test_savepoint_rolls_back_only_its_part(self):
+        with UnitOfWork(self.db) as uow:
+            with uow.step("insert"):
+                self.db.add(Item(name="a"))
+                with uow.savepoint("bad part"):
+                    self.db.add(Item(name=None))
+                    self.db.flush()
+                with uow.savepoint("good part"):
+                    self.db.add(Item(name="c"))
+            # Savepoint releases are not counted as commits
+            self.assertEqual(uow.commit_count, 1)
+        self.assertEqual(self.names(), ["a", "c"])
+
+    def test_task_count_is_shared(self):
+        with Session(self.engine) as other:
+            first, second = UnitOfWork(self.db, "task-2"), UnitOfWork(other, "task-2")
+            with first.step("one"):
+                self.db.add(Item(name="a"))
+            with second.step("two"):
+                other.add(Item(name="b"))
+            self.assertEqual(first.task_commit_count, 2)
+            second.close()
+            first.close(finished=True)
+        with UnitOfWork(self.db, "task-2") as uow:
+            self.assertEqual(uow.task_commit_count, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
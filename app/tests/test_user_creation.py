@@ -149,8 +149,8 @@ class TestUserCreation(unittest.TestCase):
             self.assertIsNotNone(user_id)
             
             # Query the database to verify the user exists
-            query = "SELECT * FROM users WHERE cognito_id = %s"
-            result = execute_query(query, ("test-user-sub-123",))
+            query = "SELECT * FROM users WHERE cognito_id = :cognito_id"
+            result = execute_query(query, {"cognito_id": "test-user-sub-123"})
             
             # Verify the user record
             if result:
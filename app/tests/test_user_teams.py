@@ -0,0 +1,87 @@
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException
+
+# Add the parent directory to sys.path to import app modules
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from app.database.connection import get_user_team_ids
+from app.database.models import GameDB, ScheduleGameDB, TeamDB, UserDB
+from app.routers.simulation import LeagueRequest, ScheduleGame, ScheduleRequest, SeasonRequest, add_schedule_games, league, season_projection
+from app.tests.database_helpers import DatabaseTestCase, database_available
+
+
+@unittest.skipUnless(database_available(), "PostgreSQL is not reachable")
+class TestUserTeams(DatabaseTestCase):
+    """Test class for limiting the simulation endpoints to the teams of the user's games"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = UserDB(email=f"teams-{uuid.uuid4()}@example.com", name="Coach", password_hash="x")
+        other_user = UserDB(email=f"teams-{uuid.uuid4()}@example.com", name="Rival", password_hash="x")
+        self.home, self.away, self.foreign = TeamDB(name="Home"), TeamDB(name="Away"), TeamDB(name="Foreign")
+        self.db.add_all([self.user, other_user, self.home, self.away, self.foreign])
+        self.db.flush()
+        self.db.add_all([
+            GameDB(user_id=self.user.id, home_team_id=self.home.id, away_team_id=self.away.id),
+            GameDB(user_id=other_user.id, home_team_id=self.foreign.id, away_team_id=self.home.id),
+        ])
+        self.db.flush()
+
+    def test_only_teams_of_the_users_games_resolve(self):
+        team_uuids = [str(self.home.uuid), str(self.away.uuid).upper(), str(self.foreign.uuid), str(uuid.uuid4()), "12"]
+
+        team_ids = get_user_team_ids(self.db, self.user.id, team_uuids)
+
+        self.assertEqual(team_ids, {team_uuids[0]: self.home.id, team_uuids[1]: self.away.id})
+
+    def test_league_rejects_teams_of_other_users(self):
+        request = LeagueRequest(team_uuids=[str(self.home.uuid), str(self.foreign.uuid)])
+
+        with self.assertRaises(HTTPException) as raised:
+            league(request, self.user.email, self.db)
+
+        self.assertEqual(raised.exception.status_code, 404)
+        self.assertIn(str(self.foreign.uuid), raised.exception.detail)
+        self.assertNotIn(str(self.home.uuid), raised.exception.detail)
+
+    def assertNotFound(self, endpoint, request):
+        with self.assertRaises(HTTPException) as raised:
+            endpoint(request, self.user.email, self.db)
+        self.assertEqual(raised.exception.status_code, 404)
+
+    def test_schedule_rejects_teams_of_other_users(self):
+        request = ScheduleRequest(games=[ScheduleGame(home_team_uuid=str(self.home.uuid), away_team_uuid=str(self.foreign.uuid))])
+
+        self.assertNotFound(add_schedule_games, request)
+        self.assertEqual(self.db.query(ScheduleGameDB).filter(ScheduleGameDB.user_id == self.user.id).count(), 0)
+
+    def test_schedule_stores_teams_of_the_users_games(self):
+        request = ScheduleRequest(games=[
+            ScheduleGame(home_team_uuid=str(self.home.uuid), away_team_uuid=str(self.away.uuid), home_score=60, away_score=52),
+        ])
+
+        response = add_schedule_games(request, self.user.email, self.db)
+
+        stored = self.db.query(ScheduleGameDB).filter(ScheduleGameDB.user_id == self.user.id).one()
+        self.assertEqual((stored.home_team_id, stored.away_team_id), (self.home.id, self.away.id))
+        self.assertEqual(response.games[0].away_team_uuid, str(self.away.uuid))
+
+    def test_schedule_rejects_ties(self):
+        request = ScheduleRequest(games=[
+            ScheduleGame(home_team_uuid=str(self.home.uuid), away_team_uuid=str(self.away.uuid), home_score=55, away_score=55),
+        ])
+
+        with self.assertRaises(HTTPException) as raised:
+            add_schedule_games(request, self.user.email, self.db)
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_season_rejects_teams_of_other_users(self):
+        self.assertNotFound(season_projection, SeasonRequest(team_uuid=str(self.foreign.uuid)))
+
+
+if __name__ == '__main__':
+    unittest.main()